@@ -0,0 +1,7 @@
+"""Генерация вспомогательных файлов Bernese GNSS Software v5.2 по заголовкам RINEX.
+
+The package is split per product (``sta``, ``crd``, ``abb``, ``clu``, ``pld``,
+``vel``) so that the command line only imports what the requested product needs.
+"""
+
+__version__ = '0.1.0'
@@ -0,0 +1,158 @@
+import os
+import string
+
+from .header import unique_stations
+
+FORMAT_VERSION = 1
+ALNUM = string.digits + string.ascii_uppercase
+MAX_REPORTED = 20  # 4-ID collisions printed one by one
+
+# 2-ID order: 01-99, 0A-0Z, AA-ZZ (the original sequence), then the rest of
+# the alphanumeric space: 1A-9Z, A0-Z9. '00' is never assigned.
+SEQUENCE_IDS = tuple(
+    [f"{i:02d}" for i in range(1, 100)]
+    + [f"0{c}" for c in string.ascii_uppercase]
+    + [f"{a}{b}" for a in string.ascii_uppercase for b in string.ascii_uppercase]
+    + [f"{a}{b}" for a in string.digits[1:] for b in string.ascii_uppercase]
+    + [f"{a}{b}" for a in string.ascii_uppercase for b in string.digits]
+)
+
+def generate_station_id(station_name, station_number):
+    """Generate station ID in format: NAME + NUMBER"""
+    return f"{station_name[:4].strip()}{station_number[:9].strip()}"
+
+def generate_sequence_id(index):
+    """Generate sequence ID in format: 01-99, then 0A-ZZ, then 1A-9Z and A0-Z9"""
+    if index < 0 or index >= len(SEQUENCE_IDS):
+        raise ValueError("Index out of range for sequence ID generation")
+    return SEQUENCE_IDS[index]
+
+def candidate_4ids(marker):
+    """4-ID candidates for a marker: the marker itself, then its prefix plus a suffix"""
+    yield marker
+    prefix = marker.upper().ljust(4, '0')
+    for c in ALNUM:
+        yield prefix[:3] + c
+    for a in ALNUM:
+        for b in ALNUM:
+            yield prefix[:2] + a + b
+
+class AbbreviationAllocator:
+    """Persistent mapping station ID -> (4-ID, 2-ID).
+
+    Existing assignments (loaded from a previous ABB file) never change; new
+    stations get the first free 4-ID/2-ID. Lookups and assignments are dict/set
+    operations, the 2-ID sequence is walked once by a single cursor.
+    """
+    def __init__(self):
+        self.ids = {}
+        self.owner_4id = {}
+        self.used_2ids = set()
+        self.collisions = []
+        self.remarks = {}  # station ID -> remark of the registry file
+        self._cursor = 0
+        self._4id_candidates = {}
+
+    def add(self, station_id, id4, id2):
+        """Register a known assignment"""
+        self.ids[station_id] = (id4, id2)
+        self.owner_4id.setdefault(id4, station_id)
+        self.used_2ids.add(id2)
+
+    def next_2id(self):
+        """First 2-ID not used yet; ValueError once all of them are taken"""
+        while self._cursor < len(SEQUENCE_IDS):
+            id2 = SEQUENCE_IDS[self._cursor]
+            self._cursor += 1
+            if id2 not in self.used_2ids:
+                return id2
+        raise ValueError(f"No free 2-ID left: all {len(SEQUENCE_IDS)} are assigned, "
+                         f"a 2-ID cannot be shared by two stations")
+
+    def allocate(self, station_id):
+        """Return (4-ID, 2-ID) of a station, assigning new ones if needed"""
+        if station_id in self.ids:
+            return self.ids[station_id]
+        marker = station_id[:4]
+        # One resumable candidate generator per marker: taken candidates are skipped once
+        candidates = self._4id_candidates.setdefault(marker, candidate_4ids(marker))
+        for id4 in candidates:
+            if id4 not in self.owner_4id:
+                break
+        else:
+            raise ValueError(f"No free 4-ID left for station {station_id}")
+        if id4 != marker:
+            self.collisions.append((station_id, self.owner_4id.get(marker), id4))
+        self.add(station_id, id4, self.next_2id())
+        return self.ids[station_id]
+
+def read_abb_file(abb_path, allocator=None):
+    """Load the assignments of an existing ABB file into an allocator"""
+    if allocator is None:
+        allocator = AbbreviationAllocator()
+    with open(abb_path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            fields = line[14:].split()
+            # Data lines: NAME NUMBER, 4-ID, 2-ID, remark
+            if len(line) < 30 or len(fields) < 2 or len(fields[0]) != 4 or len(fields[1]) != 2:
+                continue
+            station_id = f"{line[:4].strip()}{line[5:14].strip()}"
+            allocator.add(station_id, fields[0], fields[1])
+            allocator.remarks[station_id] = line[41:].rstrip('\r\n')
+    return allocator
+
+def format_abb_line(station_id, sequence_id, rinex_filename, four_id=None):
+    """Format a line for the ABB file according to the template"""
+    station_name = station_id[:4]
+    station_number = station_id[4:]
+
+    return (
+        f"{station_name} {station_number:<9}"
+        f"{' ' * 11}"
+        f"{four_id or station_name:<4}"
+        f"{' ' * 5}"
+        f"{sequence_id:<2}"
+        f"{' ' * 5}"
+        f"From {rinex_filename}"
+    )
+
+def save_abb_file(stations, output_path, registry_path=None):
+    """Save the ABB file with the formatted station information.
+
+    Abbreviations already present in ``registry_path`` (by default the
+    previous version of ``output_path``) are kept, so adding a station does
+    not renumber the others. Stations of the registry that are not in this
+    run are written too, after the others, so a run on part of the network
+    does not drop their abbreviations.
+    """
+    header = (
+        "ABBREVIATON FILE\n"
+        "--------------------------------------------------------------------------------\n\n"
+        "Station name             4-ID    2-ID    Remark\n\n\n"
+    )
+
+    if registry_path is None:
+        registry_path = output_path
+    allocator = AbbreviationAllocator()
+    if os.path.exists(registry_path):
+        read_abb_file(registry_path, allocator)
+
+    lines = []
+    for station in unique_stations(stations):
+        station_id = generate_station_id(station.marker_name, station.marker_number)
+        four_id, sequence_id = allocator.allocate(station_id)
+        lines.append(format_abb_line(station_id, sequence_id, station.filename, four_id))
+        allocator.remarks.pop(station_id, None)
+    for station_id, remark in allocator.remarks.items():
+        four_id, sequence_id = allocator.ids[station_id]
+        lines.append(format_abb_line(station_id, sequence_id, '', four_id)[:41] + remark)
+
+    for station_id, owner, four_id in allocator.collisions[:MAX_REPORTED]:
+        print(f"Внимание: 4-ID {station_id[:4]} уже занят станцией {owner}, для {station_id} назначен {four_id}")
+    if len(allocator.collisions) > MAX_REPORTED:
+        print(f"Внимание: ещё {len(allocator.collisions) - MAX_REPORTED} совпадений 4-ID")
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(header)
+        for line in lines:
+            f.write(line + '\n')
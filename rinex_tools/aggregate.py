@@ -0,0 +1,110 @@
+"""Streaming reduction of parsed headers to the records the writers need.
+
+Headers are parsed one file at a time and reduced in batches of
+``BATCH_SIZE``, so memory grows with the number of stations and equipment
+periods, not with the number of files. Of each station only the records a
+product can see are retained:
+
+* the first record of each station ID (ABB, CLU, PLD, VEL);
+* the newest file of each station ID (CRD);
+* the earliest-starting and the latest-ending file of each STA TYPE 001 and
+  TYPE 002 period.
+
+Written in stream order, the retained records give the same products as the
+full list of files.
+"""
+import sys
+
+from .crd import get_file_time
+from .header import get_station_id
+from .sta import parse_ant_fields, parse_rec_fields
+
+BATCH_SIZE = 4096
+# Header lines the writers still read after reduction
+KEPT_HEADER_LINES = ('TIME OF FIRST OBS', 'TIME OF LAST OBS')
+# Rough cost of one aggregate entry (dict slot, key tuple, indices) [bytes]
+ENTRY_SIZE = 200
+
+def record_size(station):
+    """Approximate memory of a retained StationInfo [bytes]"""
+    values = list(vars(station).values()) + list(station.header.values())
+    return sys.getsizeof(station) + sum(sys.getsizeof(v) for v in values)
+
+class StationAggregator:
+    """Per-station aggregates of a stream of StationInfo records"""
+    def __init__(self, max_bytes=None):
+        self.max_bytes = max_bytes
+        self.records = {}   # stream index -> retained StationInfo
+        self.sizes = {}     # stream index -> record_size
+        self.first = {}     # station ID -> index
+        self.newest = {}    # station ID -> (file time, index)
+        self.periods = {}   # STA period key -> [start, index, end, index]
+        self.count = 0
+        self._batch = []
+
+    def add(self, station):
+        station.header = {k: station.header[k] for k in KEPT_HEADER_LINES if k in station.header}
+        self._batch.append((self.count, station))
+        self.count += 1
+        if len(self._batch) >= BATCH_SIZE:
+            self.flush()
+
+    def _add_period(self, key, index, start, end):
+        period = self.periods.get(key)
+        if period is None:
+            self.periods[key] = [start, index, end, index]
+            return
+        if start < period[0]:
+            period[0], period[1] = start, index
+        if end > period[2]:
+            period[2], period[3] = end, index
+
+    def flush(self):
+        """Reduce the pending batch into the aggregates"""
+        batch, self._batch = self._batch, []
+        if not batch:
+            return
+        from .sta import station_epochs
+        start, end = station_epochs([st for _, st in batch])
+
+        for (index, st), s, e in zip(batch, start.tolist(), end.tolist()):
+            station_id = get_station_id(st)
+            self.first.setdefault(station_id, index)
+            file_time = get_file_time(st)
+            if station_id not in self.newest or file_time > self.newest[station_id][0]:
+                self.newest[station_id] = (file_time, index)
+            name = st.marker_name[:4].strip()
+            self._add_period(('001', name, st.marker_number[:9].strip()), index, s, e)
+            self._add_period(('002', name, parse_rec_fields(st.receiver)[1],
+                              parse_ant_fields(st.antenna)[1]), index, s, e)
+            self.records[index] = st
+        self._prune()
+
+    def _prune(self):
+        keep = set(self.first.values())
+        keep.update(index for _, index in self.newest.values())
+        for period in self.periods.values():
+            keep.update((period[1], period[3]))
+        self.records = {i: st for i, st in self.records.items() if i in keep}
+        self.sizes = {i: self.sizes.get(i) or record_size(st) for i, st in self.records.items()}
+        used = self.memory()
+        if self.max_bytes and used > self.max_bytes:
+            raise MemoryError(f'агрегаты станций занимают ~{used / 2**20:.2f} МБ, '
+                              f'больше ограничения {self.max_bytes / 2**20:.2f} МБ')
+
+    def memory(self):
+        """Approximate memory of the aggregates [bytes]"""
+        entries = len(self.first) + len(self.newest) + len(self.periods) + len(self.records)
+        return sum(self.sizes.values()) + ENTRY_SIZE * entries
+
+    def stations(self):
+        """Retained records in stream order"""
+        self.flush()
+        return [self.records[i] for i in sorted(self.records)]
+
+def aggregate_stations(stations, max_bytes=None):
+    """Reduce a stream of StationInfo records to the ones the products need"""
+    aggregator = StationAggregator(max_bytes)
+    for station in stations:
+        aggregator.add(station)
+    return aggregator.stations()
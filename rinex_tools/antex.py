@@ -0,0 +1,187 @@
+"""Receiver and antenna names checked against ANTEX and IGS rcvr_ant.tab.
+
+Bernese rejects station information whose antenna and radome have no
+calibration in its PCV file (made from ANTEX), and IGS names receivers and
+antennas after ``rcvr_ant.tab``. Both tables are parsed once into sets of
+names; the sets are cached as JSON next to the table (``.<name>.index.json``)
+and used while its size and modification time are unchanged, so a large
+ANTEX file is not read again on every run.
+
+Names not found are looked up in an index of names reduced to letters and
+digits (catches spacing and punctuation errors), then among close names of
+the same first letter with ``difflib``; only the distinct names of the
+registry are checked.
+"""
+import difflib
+import json
+import os
+import re
+from collections import defaultdict
+
+from .catalog import split_antenna
+
+INDEX_VERSION = 1
+SATELLITE_RE = re.compile(r'^[A-Z]\d\d\s*$')
+
+def read_antex(path):
+    """Receiver antennas of an ANTEX file: {antenna type: [radomes]}"""
+    antennas = defaultdict(set)
+    with open(path, 'r', encoding='ascii', errors='replace') as f:
+        for line in f:
+            if line[60:80].strip() != 'TYPE / SERIAL NO':
+                continue
+            if SATELLITE_RE.match(line[20:40]):  # satellite antennas ('BLOCK IIF', 'G01')
+                continue
+            ant_type, radome = line[:16].strip(), line[16:20].strip() or 'NONE'
+            antennas[ant_type].add(radome)
+    return {name: sorted(radomes) for name, radomes in antennas.items()}
+
+def read_rcvr_ant(path):
+    """Names of rcvr_ant.tab: {'receivers': [...], 'antennas': [...], 'radomes': [...]}.
+
+    Sections start with a title line between '|' naming receivers, antennas or
+    radomes (the first of these words counts); entries are the lines starting
+    with one blank, name first.
+    """
+    tables = {'receivers': set(), 'antennas': set(), 'radomes': set()}
+    width = {'receivers': 20, 'antennas': 16, 'radomes': 4}
+    section = None
+    with open(path, 'r', encoding='latin-1') as f:
+        for line in f:
+            line = line.rstrip('\r\n')
+            if line.startswith('|'):
+                title = line.upper()
+                found = [(title.find(word), key) for key, word in
+                         (('receivers', 'RECEIVER'), ('antennas', 'ANTENNA'), ('radomes', 'RADOME'))
+                         if word in title]
+                if found:
+                    section = min(found)[1]  # 'Antennas and radomes' is the antenna section
+                continue
+            if section is None or not line.startswith(' ') or line.startswith('  '):
+                continue
+            name = line[1:1 + width[section]].strip()
+            if name and not name.startswith(('-', '+', '=')):
+                tables[section].add(name)
+    return {key: sorted(names) for key, names in tables.items()}
+
+def _state(path):
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+def load_table(path, reader):
+    """Parsed table through its JSON cache next to the file"""
+    cache_path = os.path.join(os.path.dirname(os.path.abspath(path)), f'.{os.path.basename(path)}.index.json')
+    state = _state(path)
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get('version') == INDEX_VERSION and cached.get('source') == state:
+            return cached['table']
+    except (OSError, ValueError):
+        pass
+    table = reader(path)
+    try:
+        tmp_path = cache_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'source': state, 'table': table}, f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass  # read-only directory: parse again next time
+    return table
+
+def squeeze(name):
+    return re.sub(r'[^0-9A-Z]', '', name.upper())
+
+class NameIndex:
+    """Valid names with lookup of the closest one"""
+    def __init__(self, names):
+        self.names = set(names)
+        self.squeezed = {}
+        self.by_letter = defaultdict(list)
+        for name in sorted(self.names):
+            self.squeezed.setdefault(squeeze(name), name)
+            self.by_letter[name[:1]].append(name)
+
+    def __contains__(self, name):
+        return name in self.names
+
+    def suggest(self, name):
+        """Closest valid name, None if nothing is close"""
+        if squeeze(name) in self.squeezed:
+            return self.squeezed[squeeze(name)]
+        candidates = self.by_letter.get(name[:1].upper(), [])
+        close = difflib.get_close_matches(name.upper(), candidates, n=1, cutoff=0.7)
+        return close[0] if close else None
+
+class TypeTables:
+    """Valid receiver, antenna and radome names from ANTEX and/or rcvr_ant.tab"""
+    def __init__(self, antex=None, rcvr_ant=None):
+        self.radomes_of = {}  # ANTEX: {antenna: [calibrated radomes]}
+        receivers, antennas, radomes = set(), set(), set()
+        if antex:
+            self.radomes_of = load_table(antex, read_antex)
+            antennas.update(self.radomes_of)
+            for values in self.radomes_of.values():
+                radomes.update(values)
+        if rcvr_ant:
+            table = load_table(rcvr_ant, read_rcvr_ant)
+            receivers.update(table['receivers'])
+            antennas.update(table['antennas'])
+            radomes.update(table['radomes'])
+        self.receivers = NameIndex(receivers) if rcvr_ant else None
+        self.antennas = NameIndex(antennas)
+        self.radomes = NameIndex(radomes)
+
+    def check_receiver(self, rec_type):
+        """(problem, suggestion) of a receiver type, None if it is valid or cannot be checked"""
+        if self.receivers is None or not rec_type or rec_type in self.receivers:
+            return None
+        return 'receiver', self.receivers.suggest(rec_type)
+
+    def check_antenna(self, ant_type, radome):
+        """(problem, suggestion) of an antenna and radome, None if valid"""
+        if not ant_type:
+            return None
+        if ant_type not in self.antennas:
+            suggestion = self.antennas.suggest(ant_type)
+            return 'antenna', suggestion and f'{suggestion:<16}{radome}'
+        if radome not in self.radomes:
+            suggestion = self.radomes.suggest(radome)
+            return 'radome', suggestion and f'{ant_type:<16}{suggestion}'
+        calibrated = self.radomes_of.get(ant_type)
+        if calibrated is not None and radome not in calibrated:
+            return 'calibration', f'{ant_type:<16}NONE' if 'NONE' in calibrated else None
+        return None
+
+def check_types(stations, tables):
+    """Problems of the distinct names: {(kind, value, suggestion): [filenames]}"""
+    values = defaultdict(list)
+    for st in stations:
+        rec = st.receiver if st.receiver != '-' else ''
+        ant = st.antenna if st.antenna != '-' else ''
+        values[('rec', rec[20:40].strip())].append(st.filename)
+        values[('ant', split_antenna(ant[20:40]))].append(st.filename)
+    report = {}
+    for (kind, value), files in values.items():
+        if kind == 'rec':
+            problem = tables.check_receiver(value)
+            text = value
+        else:
+            problem = tables.check_antenna(*value)
+            text = f'{value[0]:<16}{value[1]}'
+        if problem is not None:
+            report[(problem[0], text, problem[1])] = files
+    return report
+
+PROBLEMS = {
+    'receiver': 'приёмник не найден',
+    'antenna': 'антенна не найдена',
+    'radome': 'обтекатель не найден',
+    'calibration': 'нет калибровки антенны с этим обтекателем',
+}
+
+def print_types_report(report):
+    for (problem, value, suggestion), files in sorted(report.items(), key=lambda x: (x[0][1], x[0][0])):
+        hint = f', возможно "{suggestion}"' if suggestion else ''
+        print(f'"{value}": {PROBLEMS[problem]}{hint} ({len(files)} файлов, {files[0]} ...)')
+    print(f'Найдено неизвестных названий: {len(report)}')
@@ -0,0 +1,177 @@
+"""Which stations observed at which epochs: station x epoch bitmaps per session.
+
+A session is a GPS day divided into ``INTERVAL`` second slots (2880 at 30 s).
+Each station ID has one row of bits per session, packed with ``np.packbits``:
+1000 stations take 360 kB a day. Epoch times of a file come from its
+observation cache entry when there is a fresh one, otherwise from a scan of the
+epoch lines done on the bytes of the whole file with NumPy (fixed columns of
+RINEX 2 epoch lines, '>' lines of RINEX 3), without parsing observations or
+creating objects per epoch.
+
+Overlaps of all pairs are one matrix product of the unpacked bits; overlaps of
+chosen pairs and common-view counts work on the packed rows. Sessions are
+saved as ``<name>_YYYYDDD.AVL`` (NumPy ``.npz``: station IDs, day, interval
+and the packed bits) next to the Bernese products.
+"""
+import numpy as np
+
+from .gpstime import SECONDS_PER_DAY, to_datetime, to_gps_seconds
+
+INTERVAL = 30
+FORMAT_VERSION = 1
+POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+def _columns(rows, start, stop, dtype):
+    """Fixed-width fields of (N, width) byte rows converted to numbers"""
+    return np.ascontiguousarray(rows[:, start:stop]).view(f'S{stop - start}')[:, 0].astype(dtype)
+
+def scan_epochs(path):
+    """GPS seconds of the observation epochs (flags 0 and 1) of a RINEX 2 or 3 file"""
+    data = np.fromfile(path, dtype=np.uint8)
+    end = bytes(data[:200000]).find(b'END OF HEADER')
+    if end < 0:
+        return np.zeros(0, dtype=np.int64)
+    version = bytes(data[:9]).strip()
+    body_start = bytes(data[end:end + 100]).find(b'\n') + end + 1
+    body = np.concatenate([np.frombuffer(b'\n', dtype=np.uint8), data[body_start:],
+                           np.full(40, 32, dtype=np.uint8)])
+    starts = np.flatnonzero(body[:-40] == 10) + 1
+    rows = body[starts[:, None] + np.arange(36)]
+    digit = (rows >= 48) & (rows <= 57)
+    try:
+        rinex3 = float(version) >= 3
+    except ValueError:
+        rinex3 = False
+    if rinex3:
+        # '> 2021 03 04 05 06  7.0000000  0 12'
+        keep = ((rows[:, 0] == 62) & digit[:, 2:6].all(axis=1) & (rows[:, 21] == 46)
+                & np.isin(rows[:, 31], (48, 49)))
+        rows = rows[keep]
+        year = _columns(rows, 2, 6, np.int64)
+        fields = [(7, 9), (10, 12), (13, 15), (16, 18)]
+        second = (18, 29)
+    else:
+        # ' 05  5 16  0  0  0.0000000  0 12G05G10...'
+        keep = ((rows[:, [0, 3, 6, 9, 12]] == 32).all(axis=1) & digit[:, [2, 5, 8, 11, 14, 17]].all(axis=1)
+                & (rows[:, 18] == 46) & np.isin(rows[:, 28], (48, 49)))
+        rows = rows[keep]
+        year = _columns(rows, 1, 3, np.int64)
+        year = np.where(year < 80, year + 2000, year + 1900)
+        fields = [(3, 6), (6, 9), (9, 12), (12, 15)]
+        second = (15, 26)
+    if not len(rows):
+        return np.zeros(0, dtype=np.int64)
+    month, day, hour, minute = (_columns(rows, a, b, np.int64) for a, b in fields)
+    seconds = np.round(_columns(rows, *second, np.float64)).astype(np.int64)
+    return to_gps_seconds(year, month, day, hour, minute, seconds)
+
+def file_epochs(path, cache_dir=None):
+    """Observation epochs of a file, from the observation cache when it is up to date"""
+    if cache_dir:
+        import os
+        from .obscache import entry_dir, is_fresh, read_meta, source_state
+        directory = entry_dir(cache_dir, path)
+        if is_fresh(read_meta(directory), source_state(path)):
+            return np.load(os.path.join(directory, 'epochs.npy'))
+    return scan_epochs(path)
+
+def files_epochs(paths, cache_dir=None, jobs=1):
+    """Yield the epochs of each file, in order (None if it cannot be read); ``jobs`` > 1 uses processes"""
+    if jobs > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        from functools import partial
+        with ProcessPoolExecutor(jobs) as pool:
+            yield from pool.map(partial(_read_epochs, cache_dir=cache_dir), paths, chunksize=4)
+    else:
+        for path in paths:
+            yield _read_epochs(path, cache_dir)
+
+def _read_epochs(path, cache_dir=None):
+    try:
+        return file_epochs(path, cache_dir)
+    except (OSError, ValueError):
+        return None
+
+def session_name(day):
+    """'YYYYDDD' of a GPS day"""
+    return to_datetime(day * SECONDS_PER_DAY).strftime('%Y%j')
+
+class Availability:
+    """Packed station x slot bits of one session (GPS day)"""
+    def __init__(self, day, station_ids, bits, interval=INTERVAL):
+        self.day = day
+        self.station_ids = list(station_ids)
+        self.bits = bits            # (stations, ceil(slots / 8)) uint8
+        self.interval = interval
+        self.slots = SECONDS_PER_DAY // interval
+
+    def unpacked(self, rows=None):
+        bits = self.bits if rows is None else self.bits[rows]
+        return np.unpackbits(bits, axis=1, count=self.slots)
+
+    def epochs(self, station_id):
+        """GPS seconds of the slots observed by a station"""
+        row = self.station_ids.index(station_id)
+        slots = np.flatnonzero(self.unpacked([row])[0])
+        return self.day * SECONDS_PER_DAY + slots * self.interval
+
+    def counts(self):
+        """Observed slots of each station"""
+        return POPCOUNT[self.bits].sum(axis=1, dtype=np.int64)
+
+    def overlap(self, a, b):
+        """Common slots of station index pairs (arrays ``a`` and ``b``)"""
+        return POPCOUNT[self.bits[a] & self.bits[b]].sum(axis=-1, dtype=np.int64)
+
+    def overlap_matrix(self):
+        """(N, N) common slots of all pairs (the diagonal is the observed slots)"""
+        bits = self.unpacked().astype(np.float32)
+        return np.rint(bits @ bits.T).astype(np.int64)
+
+    def common_view(self, rows=None):
+        """Number of stations observing in each slot (of the given station indices)"""
+        return self.unpacked(rows).sum(axis=0, dtype=np.int64)
+
+def build_sessions(records, interval=INTERVAL):
+    """Sessions from (station ID, epochs) pairs: {GPS day: Availability}, stations sorted"""
+    slots = SECONDS_PER_DAY // interval
+    records = list(records)
+    station_ids = sorted({station_id for station_id, _ in records})
+    row = {station_id: i for i, station_id in enumerate(station_ids)}
+    bits = {}  # day -> (stations, ceil(slots / 8)) packed rows
+    for station_id, epochs in records:
+        epochs = np.asarray(epochs, dtype=np.int64)
+        days = epochs // SECONDS_PER_DAY
+        for day in np.unique(days).tolist():
+            if day not in bits:
+                bits[day] = np.zeros((len(station_ids), -(-slots // 8)), dtype=np.uint8)
+            observed = np.zeros(slots, dtype=bool)
+            observed[(epochs[days == day] % SECONDS_PER_DAY) // interval] = True
+            bits[day][row[station_id]] |= np.packbits(observed)
+    sessions = {}
+    for day, table in sorted(bits.items()):
+        present = np.flatnonzero(table.any(axis=1))
+        sessions[day] = Availability(day, [station_ids[i] for i in present], table[present], interval)
+    return sessions
+
+def session_summary(session):
+    """Stations, observed slots, slots seen by two or more stations and the best reference station"""
+    overlaps = session.overlap_matrix()
+    common = session.common_view()
+    shared = overlaps.sum(axis=1) - np.diag(overlaps)
+    return {
+        'stations': len(session.station_ids),
+        'observed': int(np.count_nonzero(common)),
+        'common': int(np.count_nonzero(common >= 2)),
+        'reference': session.station_ids[int(np.argmax(shared))] if len(shared) else '',
+    }
+
+def save_session(session, path):
+    with open(path, 'wb') as f:
+        np.savez_compressed(f, version=FORMAT_VERSION, day=session.day, interval=session.interval,
+                            station_ids=np.array(session.station_ids), bits=session.bits)
+
+def load_session(path):
+    """Availability of a saved ``.AVL`` file"""
+    with np.load(path) as data:
+        return Availability(int(data['day']), data['station_ids'].tolist(), data['bits'], int(data['interval']))
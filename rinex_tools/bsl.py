@@ -0,0 +1,162 @@
+"""Baseline lists (BSL) for double-difference processing.
+
+The network of a session (GPS day) is a minimum spanning tree over the
+stations with data in it. The cost of a baseline is its length divided by the
+common observation time of its stations, counted from the availability
+bitmaps of their epochs (``availability``), so short baselines with much
+common data are preferred.
+
+Candidate baselines are the ``NEIGHBOURS`` nearest stations of every station
+from a k-d tree, not all N * N pairs. Kruskal's algorithm builds the tree from
+them; if that leaves several parts (separate regional networks), the smallest
+part is joined to the rest by its cheapest baseline, one part at a time.
+Stations without common data with any other station stay alone.
+
+A ``<name>_YYYYDDD.BSL`` file is written for every session with at least one
+baseline; with ``--span`` ``<name>.BSL`` also gets one network over all of them.
+"""
+import hashlib
+import os
+
+import numpy as np
+
+from .availability import build_sessions, files_epochs, session_name
+from .geodesy import chord_distances, on_surface, parse_xyz
+from .header import get_station_id, unique_stations
+
+FORMAT_VERSION = 2
+NEIGHBOURS = 8
+PAIR_BLOCK = 1 << 22  # bytes of packed rows compared at once
+
+def station_availability(files, cache_dir=None, jobs=1):
+    """Sessions {GPS day: Availability} of ((name, number), path, ...) file entries"""
+    station_ids = [name + number.strip() for (name, number), *_ in files]
+    epochs = files_epochs([path for _, path, *_ in files], cache_dir, jobs)
+    return build_sessions((s, e) for s, e in zip(station_ids, epochs) if e is not None)
+
+def availability_digest(sessions):
+    """Hash of the station IDs and bits of all sessions"""
+    h = hashlib.blake2b(digest_size=16)
+    for day, session in sorted(sessions.items()):
+        h.update(f'{day} {session.interval} {" ".join(session.station_ids)}\n'.encode())
+        h.update(session.bits.tobytes())
+    return h.hexdigest()
+
+def session_rows(station_ids, session):
+    """Row of each station in the session, -1 where it did not observe"""
+    row_of = {s: r for r, s in enumerate(session.station_ids)}
+    return np.array([row_of.get(s, -1) for s in station_ids], dtype=np.int64)
+
+def common_seconds(session, a, b):
+    """Common observation seconds of session row pairs, in blocks of ``PAIR_BLOCK`` bytes"""
+    step = max(1, PAIR_BLOCK // max(session.bits.shape[1], 1))
+    return np.concatenate([session.overlap(a[k:k + step], b[k:k + step]) * session.interval
+                           for k in range(0, len(a), step)] or [np.zeros(0, dtype=np.int64)])
+
+def find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+def minimum_network(xyz, common):
+    """Baselines (i, j) of a minimum spanning forest of (N, 3) positions.
+
+    ``common(i, j)`` gives the common observation seconds of index arrays.
+    """
+    from .kdtree import KDTree
+    n = len(xyz)
+    if n < 2:
+        return []
+    distances, neighbours = KDTree(xyz).query(NEIGHBOURS)
+    i = np.repeat(np.arange(n), neighbours.shape[1])
+    j = neighbours.ravel()
+    pairs = np.unique(np.stack([np.minimum(i, j), np.maximum(i, j)], axis=1), axis=0)
+    i, j = pairs[:, 0], pairs[:, 1]
+    shared = common(i, j)
+    with np.errstate(divide='ignore'):
+        cost = np.where(shared > 0, np.linalg.norm(xyz[i] - xyz[j], axis=1) / shared, np.inf)
+    parent = list(range(n))
+    edges = []
+    for k in np.argsort(cost, kind='stable').tolist():
+        if not np.isfinite(cost[k]):
+            break
+        a, b = find(parent, int(i[k])), find(parent, int(j[k]))
+        if a != b:
+            parent[a] = b
+            edges.append((int(i[k]), int(j[k])))
+
+    alone = set()  # parts without common data with the rest
+    while True:
+        roots = np.array([find(parent, v) for v in range(n)])
+        parts = [r for r in np.unique(roots).tolist() if r not in alone]
+        if len(parts) < 2:
+            break
+        smallest = min(parts, key=lambda r: (np.count_nonzero(roots == r), r))
+        inside = np.flatnonzero(roots == smallest)
+        outside = np.flatnonzero((roots != smallest) & ~np.isin(roots, list(alone)))
+        a = np.repeat(inside, len(outside))
+        b = np.tile(outside, len(inside))
+        shared = common(a, b).reshape(len(inside), len(outside))
+        with np.errstate(divide='ignore'):
+            cost = np.where(shared > 0, chord_distances(xyz[inside], xyz[outside]) / shared, np.inf)
+        best = np.unravel_index(np.argmin(cost), cost.shape)
+        if not np.isfinite(cost[best]):
+            alone.add(smallest)
+            continue
+        u, v = int(inside[best[0]]), int(outside[best[1]])
+        parent[find(parent, u)] = find(parent, v)
+        edges.append((min(u, v), max(u, v)))
+    return sorted(edges)
+
+def bernese_name(station_id):
+    """Station name as in the other products: 4-char name, space, number"""
+    return f"{station_id[:4]} {station_id[4:]}".strip()
+
+def format_bsl(station_ids, edges):
+    return ''.join(f'{bernese_name(station_ids[a]):<16} {bernese_name(station_ids[b])}\n' for a, b in edges)
+
+def session_network(station_ids, xyz, session):
+    """Baselines of the stations observing in one session"""
+    rows = session_rows(station_ids, session)
+    present = np.flatnonzero(rows >= 0)
+    edges = minimum_network(xyz[present], lambda i, j: common_seconds(session, rows[present][i], rows[present][j]))
+    return [(int(present[a]), int(present[b])) for a, b in edges]
+
+def span_network(station_ids, xyz, sessions):
+    """Baselines over all sessions: common time summed over them"""
+    rows = [(session, session_rows(station_ids, session)) for session in sessions.values()]
+
+    def common(i, j):
+        total = np.zeros(len(i), dtype=np.int64)
+        for session, row in rows:
+            a, b = row[i], row[j]
+            both = np.flatnonzero((a >= 0) & (b >= 0))
+            total[both] += common_seconds(session, a[both], b[both])
+        return total
+    return minimum_network(xyz, common)
+
+def save_bsl_file(stations, output_path, sessions, span=False):
+    """Save the baseline list of every session next to ``output_path``, and of all of them to it with ``span``.
+
+    ``sessions`` are the availability sessions {GPS day: Availability}.
+    Returns the paths of the session files.
+    """
+    stations = unique_stations(stations)
+    xyz = parse_xyz([st.xyz for st in stations])
+    valid = on_surface(xyz)
+    station_ids = [get_station_id(st) for st, ok in zip(stations, valid) if ok]
+    xyz = xyz[valid]
+    if span:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(format_bsl(station_ids, span_network(station_ids, xyz, sessions)))
+    base = os.path.splitext(output_path)[0]
+    written = []
+    for day, session in sorted(sessions.items()):
+        edges = session_network(station_ids, xyz, session)
+        if edges:
+            path = f'{base}_{session_name(day)}.BSL'
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(format_bsl(station_ids, edges))
+            written.append(path)
+    return written
@@ -0,0 +1,113 @@
+"""Product build cache: skip products whose inputs did not change.
+
+The key of a product is a hash of the station fields that product reads, its
+settings (epoch, plates, ABB registry, number of clusters, STA problems, BSL
+epochs) and the writer's ``FORMAT_VERSION``. A product is skipped when its key
+and the digests of its existing output files match the cache, so unchanged files keep
+their timestamps and downstream Bernese jobs do not restart.
+
+The cache lives next to the outputs as ``.<name>.cache.json``.
+"""
+import hashlib
+import importlib
+import json
+import os
+
+from . import __version__
+
+CACHE_VERSION = 1
+
+def _sta_fields(st):
+    return (st.marker_name, st.marker_number, st.receiver, st.antenna, st.delta_hen, st.filename,
+            st.header.get('TIME OF FIRST OBS', ''), st.header.get('TIME OF LAST OBS', ''))
+
+def _crd_fields(st):
+    return (st.marker_name, st.marker_number, st.xyz, st.filename, st.mtime,
+            st.header.get('TIME OF FIRST OBS', ''))
+
+# Station fields read by each product
+STATION_FIELDS = {
+    'sta': _sta_fields,
+    'crd': _crd_fields,
+    'abb': lambda st: (st.marker_name, st.marker_number, st.filename),
+    'clu': lambda st: (st.marker_name, st.marker_number, st.xyz),
+    'pld': lambda st: (st.marker_name, st.marker_number, st.xyz),
+    'vel': lambda st: (st.marker_name, st.marker_number, st.xyz),
+    'bsl': lambda st: (st.marker_name, st.marker_number, st.xyz),
+}
+
+def file_digest(path):
+    """blake2b digest of a file's content, None if it does not exist"""
+    if not path or not os.path.exists(path):
+        return None
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+def plate_settings(args):
+    """Plate options of a run: the single plate and the digest of the plate model"""
+    if not args.plates:
+        return [args.plate]
+    return [args.plate, file_digest(args.plates)]
+
+def product_settings(product, args):
+    """Options other than the stations that change a product's content"""
+    if product == 'crd':
+        return [str(args.epoch)] + plate_settings(args)
+    if product in ('pld', 'vel'):
+        return plate_settings(args)
+    if product == 'clu':
+        return [args.clusters]
+    if product == 'bsl':
+        from .bsl import availability_digest
+        return [args.span, availability_digest(args.availability)]
+    if product == 'sta' and getattr(args, 'station_problems', None) is not None:
+        return [args.station_problems]
+    if product == 'abb':
+        # The default registry is the output itself, covered by the output digest
+        return [file_digest(args.abb_registry)]
+    return []
+
+def product_key(product, stations, args):
+    """Hash of everything a product file is made from"""
+    module = importlib.import_module(f'.{product}', __package__)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(json.dumps([product, __version__, module.FORMAT_VERSION,
+                         product_settings(product, args)]).encode())
+    fields = STATION_FIELDS[product]
+    for st in stations:
+        h.update('\x1f'.join(map(str, fields(st))).encode('utf-8', 'surrogateescape'))
+        h.update(b'\x1e')
+    return h.hexdigest()
+
+class BuildCache:
+    """Keys and output digests of the products last written to a directory"""
+    def __init__(self, output_dir, name):
+        self.path = os.path.join(output_dir, f'.{name}.cache.json')
+        self.products = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == CACHE_VERSION:
+                self.products = data['products']
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def is_fresh(self, product, key, output_path):
+        """True if ``output_path`` and the other files of the product were built from ``key`` and not modified since"""
+        entry = self.products.get(product)
+        return (entry is not None and entry['key'] == key
+                and entry['output'] == file_digest(output_path)
+                and all(file_digest(path) == digest for path, digest in entry.get('files', {}).items()))
+
+    def record(self, product, key, output_path, files=()):
+        self.products[product] = {'key': key, 'output': file_digest(output_path),
+                                  'files': {path: file_digest(path) for path in files}}
+
+    def save(self):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'products': self.products}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
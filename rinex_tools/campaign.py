@@ -0,0 +1,100 @@
+"""Bernese campaign directory with the products in STA and the RINEX files in RAW.
+
+The products are written straight into ``<campaign>/STA`` (through the build
+cache, so unchanged products are not rewritten). Every input file is placed in
+``RAW`` under its Bernese name ``<4-ID><day of year><session>.<YY>O``, with
+the 4-ID of the station from the campaign ABB file, by a hard link (default),
+a symbolic link or a copy. A hard link that fails (another file system, or
+links not supported) falls back to a copy.
+
+Reruns only touch what changed: a RAW entry that already is the input file
+(same inode, or a symlink to it), or a copy of the same size and modification
+time, is left alone; anything else is replaced through a temporary name.
+Files in RAW that no input maps to are kept.
+"""
+import os
+import shutil
+
+from .dedup import station_day
+
+CAMPAIGN_DIRS = ('ATM', 'BPE', 'GRD', 'OBS', 'ORB', 'ORX', 'OUT', 'RAW', 'SOL', 'STA')
+LINK_MODES = ('hard', 'symlink', 'copy')
+
+def create_campaign(campaign_dir):
+    """Create the campaign directories that are missing"""
+    for name in CAMPAIGN_DIRS:
+        os.makedirs(os.path.join(campaign_dir, name), exist_ok=True)
+
+def raw_name(id4, year, doy, session='0'):
+    """Bernese RAW name: 'AAC41360.05O'"""
+    return f'{id4.upper()}{doy:03d}{session.upper()}.{year % 100:02d}O'
+
+def file_day(path, first_obs):
+    """(year, day of year, session) from the file name, else from TIME OF FIRST OBS; None if unknown"""
+    day = station_day(path)
+    if day is not None:
+        return day[1:]
+    from .gpstime import NO_TIME, parse_obs_times, to_datetime
+    seconds = parse_obs_times([first_obs])[0]
+    if seconds == NO_TIME:
+        return None
+    t = to_datetime(seconds).timetuple()
+    return t.tm_year, t.tm_yday, '0'
+
+def is_current(source, target, mode):
+    """True if ``target`` already holds ``source`` the way ``mode`` would place it"""
+    if not os.path.lexists(target):
+        return False
+    if mode == 'symlink':
+        return os.path.islink(target) and os.readlink(target) == os.path.abspath(source)
+    if os.path.islink(target):
+        return False
+    if os.path.samefile(source, target):
+        return True
+    # A copy (also one made by the hard-link fallback) of the same size and time
+    a, b = os.stat(source), os.stat(target)
+    return a.st_size == b.st_size and int(a.st_mtime) == int(b.st_mtime)
+
+def place_file(source, target, mode='hard'):
+    """Link or copy ``source`` to ``target``: 'unchanged', 'linked' or 'copied'"""
+    if is_current(source, target, mode):
+        return 'unchanged'
+    tmp_path = target + '.tmp'
+    if os.path.lexists(tmp_path):
+        os.remove(tmp_path)
+    result = 'linked'
+    if mode == 'symlink':
+        os.symlink(os.path.abspath(source), tmp_path)
+    elif mode == 'hard':
+        try:
+            os.link(source, tmp_path)
+        except OSError:  # other file system, or no hard links there
+            shutil.copy2(source, tmp_path)
+            result = 'copied'
+    else:
+        shutil.copy2(source, tmp_path)
+        result = 'copied'
+    os.replace(tmp_path, target)
+    return result
+
+def fill_raw(campaign_dir, files, abb_path, mode='hard'):
+    """Place the input files in RAW: {'linked': n, 'copied': n, 'unchanged': n, 'skipped': [paths]}.
+
+    ``files`` are ((name, number), path, TIME OF FIRST OBS line) records; the
+    first file of a Bernese name wins, later ones are skipped.
+    """
+    from .abb import AbbreviationAllocator, read_abb_file
+    allocator = read_abb_file(abb_path) if os.path.exists(abb_path) else AbbreviationAllocator()
+    raw_dir = os.path.join(campaign_dir, 'RAW')
+    counts = {'linked': 0, 'copied': 0, 'unchanged': 0, 'skipped': []}
+    placed = set()
+    for (marker, number), path, first_obs in files:
+        day = file_day(path, first_obs)
+        station_id = f'{marker}{number.strip()}'
+        name = raw_name(allocator.allocate(station_id)[0], *day) if day is not None else None
+        if name is None or name in placed:
+            counts['skipped'].append(path)
+            continue
+        placed.add(name)
+        counts[place_file(path, os.path.join(raw_dir, name), mode)] += 1
+    return counts
@@ -0,0 +1,240 @@
+"""Cross-check of RINEX headers against a local site-log catalog.
+
+The catalog is either a directory of IGS site logs (``*.log``) or a CSV
+export with the columns::
+
+    station,start,end,receiver_type,receiver_serial,antenna_type,radome,antenna_serial,up,north,east
+
+Receiver and antenna histories are kept per station as interval lists sorted
+by start time, so every file is matched with a binary search instead of a scan
+over the catalog.
+"""
+import csv
+import datetime
+import os
+import re
+from bisect import bisect_right
+from collections import defaultdict
+
+from .sta import file_epoch, parse_delta_hen
+
+# Eccentricity differences below this are not reported [m]
+ECC_TOLERANCE = 0.0005
+OPEN_END = datetime.datetime.max
+
+SECTION_RE = re.compile(r'^\s*(\d+)\.(\d+|x)\s+(Receiver Type|Antenna Type)\s*:\s*(.*)$')
+FIELD_RE = re.compile(r'^\s+([^:]+?)\s*:\s*(.*)$')
+SITE_ID_RE = re.compile(r'^\s*Four Character ID\s*:\s*(\w{4})')
+
+def parse_catalog_date(value):
+    """Parse a site-log/CSV date, None for an empty or placeholder value"""
+    value = value.strip()
+    for fmt in ('%Y-%m-%dT%H:%MZ', '%Y-%m-%dT%H:%M', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d'):
+        try:
+            return datetime.datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+def split_antenna(value, radome='', default='NONE'):
+    """Split 'AOAD/M_T        NONE' into antenna type and radome.
+
+    A radome shifted out of columns 17-20 ('TRM59800.00 SCIS') is recognized
+    as a second word of four characters; without any radome ``default``.
+    """
+    words = value.split()
+    if len(words) == 2 and len(words[1]) == 4 and len(words[0]) <= 16:
+        return words[0], words[1]
+    ant_type = value[:16].strip()
+    radome = value[16:20].strip() or radome.strip() or default
+    return ant_type, radome
+
+def _float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+class SiteCatalog:
+    """Receiver and antenna history of each station"""
+    def __init__(self):
+        self.receivers = defaultdict(list)
+        self.antennas = defaultdict(list)
+        self._starts = {}
+
+    def add(self, kind, station, start, end, **fields):
+        """Add a receiver or antenna interval"""
+        table = self.receivers if kind == 'receiver' else self.antennas
+        table[station.upper()].append(dict(fields, start=start or datetime.datetime.min,
+                                           end=end or OPEN_END))
+        self._starts.clear()
+
+    def lookup(self, kind, station, epoch):
+        """Interval of the station valid at ``epoch``, or None"""
+        table = self.receivers if kind == 'receiver' else self.antennas
+        key = (kind, station.upper())
+        if key not in self._starts:
+            entries = table.get(station.upper(), [])
+            entries.sort(key=lambda e: e['start'])
+            self._starts[key] = [e['start'] for e in entries]
+        entries = table.get(station.upper(), [])
+        i = bisect_right(self._starts[key], epoch) - 1
+        if i >= 0 and epoch < entries[i]['end']:
+            return entries[i]
+        return None
+
+    def __len__(self):
+        return sum(map(len, self.receivers.values())) + sum(map(len, self.antennas.values()))
+
+def read_site_log(path, catalog):
+    """Add the receiver and antenna sections of an IGS site log"""
+    station = os.path.basename(path)[:4].upper()
+    blocks = []
+    block = None
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            m = SITE_ID_RE.match(line)
+            if m:
+                station = m.group(1).upper()
+                continue
+            m = SECTION_RE.match(line)
+            if m:
+                # 'x' sections are the empty templates at the end of each part
+                block = None if m.group(2) == 'x' else {'kind': m.group(3), 'type': m.group(4)}
+                if block is not None:
+                    blocks.append(block)
+                continue
+            if not line.strip():
+                block = None
+                continue
+            m = FIELD_RE.match(line)
+            if block is not None and m:
+                block[m.group(1)] = m.group(2)
+
+    for b in blocks:
+        start = parse_catalog_date(b.get('Date Installed', ''))
+        end = parse_catalog_date(b.get('Date Removed', ''))
+        if b['kind'] == 'Receiver Type':
+            catalog.add('receiver', station, start, end,
+                        type=b['type'].strip(), serial=b.get('Serial Number', '').strip())
+        else:
+            ant_type, radome = split_antenna(b['type'], b.get('Antenna Radome Type', ''), default='')
+            catalog.add('antenna', station, start, end,
+                        type=ant_type, radome=radome, serial=b.get('Serial Number', '').strip(),
+                        up=_float(b.get('Marker->ARP Up Ecc. (m)')),
+                        north=_float(b.get('Marker->ARP North Ecc(m)')),
+                        east=_float(b.get('Marker->ARP East Ecc(m)')))
+
+def read_catalog_csv(path, catalog):
+    """Add the rows of a CSV export"""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            station = row['station'].strip()[:4]
+            start = parse_catalog_date(row.get('start', ''))
+            end = parse_catalog_date(row.get('end', ''))
+            if row.get('receiver_type'):
+                catalog.add('receiver', station, start, end,
+                            type=row['receiver_type'].strip(),
+                            serial=row.get('receiver_serial', '').strip())
+            if row.get('antenna_type'):
+                ant_type, radome = split_antenna(row['antenna_type'], row.get('radome', ''), default='')
+                catalog.add('antenna', station, start, end,
+                            type=ant_type, radome=radome,
+                            serial=row.get('antenna_serial', '').strip(),
+                            up=_float(row.get('up')), north=_float(row.get('north')),
+                            east=_float(row.get('east')))
+
+def load_catalog(path):
+    """Load a catalog from a CSV file or a directory of site logs"""
+    catalog = SiteCatalog()
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            for f in sorted(files):
+                if f.lower().endswith('.log'):
+                    read_site_log(os.path.join(root, f), catalog)
+    else:
+        read_catalog_csv(path, catalog)
+    return catalog
+
+def header_values(station):
+    """Receiver/antenna values of a file, in the catalog's terms"""
+    rec = station.receiver if station.receiver != '-' else ''
+    ant = station.antenna if station.antenna != '-' else ''
+    up, east, north = parse_delta_hen(station.delta_hen) if station.delta_hen != '-' else ('', '', '')
+    ant_type, radome = split_antenna(ant[20:40])
+    return {
+        'receiver': {'type': rec[20:40].strip(), 'serial': rec[0:20].strip()},
+        'antenna': {'type': ant_type, 'radome': radome, 'serial': ant[0:20].strip(),
+                    'up': _float(up), 'north': _float(north), 'east': _float(east)},
+    }
+
+def compare_station(station, catalog):
+    """Mismatches of one file: list of (field, header value, catalog value)"""
+    name = station.marker_name[:4].strip()
+    epoch = file_epoch(station)
+    values = header_values(station)
+    mismatches = []
+    for kind in ('receiver', 'antenna'):
+        entry = catalog.lookup(kind, name, epoch)
+        if entry is None:
+            mismatches.append((kind, '', 'missing'))
+            continue
+        for field, value in values[kind].items():
+            expected = entry.get(field)
+            if expected is None or expected == '':
+                continue
+            if isinstance(expected, float):
+                if value is None or abs(value - expected) > ECC_TOLERANCE:
+                    mismatches.append((f'{kind} {field}', value, expected))
+            elif value.upper() != expected.upper():
+                mismatches.append((f'{kind} {field}', value, expected))
+    return mismatches
+
+def check_stations(stations, catalog):
+    """Mismatches of all files, grouped: {(station, field, header, catalog): [filenames]}"""
+    report = defaultdict(list)
+    for station in stations:
+        name = station.marker_name[:4].strip()
+        for field, value, expected in compare_station(station, catalog):
+            report[(name, field, value, expected)].append(station.filename)
+    return report
+
+def print_report(report):
+    """Print grouped mismatches"""
+    for (name, field, value, expected), files in sorted(report.items(), key=lambda x: (x[0][0], x[0][1])):
+        if expected == 'missing':
+            print(f'{name}: нет записи {field} в каталоге ({len(files)} файлов, {files[0]} ...)')
+        else:
+            print(f'{name}: {field} в заголовке "{value}", в каталоге "{expected}" '
+                  f'({len(files)} файлов, {files[0]} ...)')
+    print(f'Найдено расхождений: {len(report)}')
+
+def apply_catalog(stations, catalog):
+    """Replace receiver/antenna/eccentricity header lines by the catalog values.
+
+    Fields the catalog leaves empty (e.g. no serial number or radome) keep the
+    header value, as ``compare_station`` does not report them either.
+    """
+    corrected = 0
+    for station in stations:
+        name = station.marker_name[:4].strip()
+        epoch = file_epoch(station)
+        values = header_values(station)
+        rec = catalog.lookup('receiver', name, epoch)
+        ant = catalog.lookup('antenna', name, epoch)
+        if rec is not None:
+            rec = {field: rec.get(field) or value for field, value in values['receiver'].items()}
+            vers = station.receiver[40:60] if station.receiver != '-' else ''
+            station.receiver = f"{rec['serial']:<20}{rec['type']:<20}{vers:<20}REC # / TYPE / VERS"
+            station.header['REC # / TYPE / VERS'] = station.receiver
+        if ant is not None:
+            ant = {field: value if ant.get(field) in (None, '') else ant[field]
+                   for field, value in values['antenna'].items()}
+            station.antenna = f"{ant['serial']:<20}{ant['type']:<16}{ant['radome']:<4}{'':<20}ANT # / TYPE"
+            station.header['ANT # / TYPE'] = station.antenna
+            if None not in (ant['up'], ant['east'], ant['north']):
+                station.delta_hen = (f"{ant['up']:14.4f}{ant['east']:14.4f}{ant['north']:14.4f}"
+                                     f"{'':<18}ANTENNA: DELTA H/E/N")
+                station.header['ANTENNA: DELTA H/E/N'] = station.delta_hen
+        corrected += rec is not None or ant is not None
+    return corrected
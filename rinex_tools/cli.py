@@ -0,0 +1,524 @@
+"""Command line: ``rinex-tools {sta,crd,abb,clu,pld,vel,bsl,all}``.
+
+Product modules are imported inside the writers below, so a single-product
+call only pays for the imports that product needs.
+"""
+import argparse
+import os
+import sys
+
+from . import __version__
+from .header import INPUT_DIR, OUTPUT_DIR, find_rinex_files, iter_rinex_files, iter_stations
+
+PRODUCTS = ('sta', 'crd', 'abb', 'clu', 'pld', 'vel', 'bsl')
+
+def write_sta(stations, output_path, args):
+    from .sta import get_combined_periods, save_sta_file
+    save_sta_file(get_combined_periods(stations), output_path, stations, getattr(args, 'station_problems', None))
+
+def write_crd(stations, output_path, args):
+    from .crd import DEFAULT_EPOCH, save_crd_file
+    epoch = args.epoch or (DEFAULT_EPOCH if args.plate or args.plates else None)
+    save_crd_file(stations, output_path, epoch, args.plate or '', get_plates(stations, args))
+
+def write_abb(stations, output_path, args):
+    from .abb import save_abb_file
+    save_abb_file(stations, output_path, args.abb_registry)
+
+def write_clu(stations, output_path, args):
+    from .clu import save_clu_file
+    save_clu_file(stations, output_path, args.clusters)
+
+def get_plates(stations, args):
+    """Plates assigned from the --plates model, None without it (--plate for all stations)"""
+    if not args.plates:
+        return None
+    if getattr(args, 'station_plates', None) is None:
+        from .plates import load_plate_model, station_plates
+        args.station_plates = station_plates(stations, load_plate_model(args.plates))
+    return args.station_plates
+
+def parse_epoch(value):
+    """Reference epoch: 'YYYY-MM-DD' or 'YYYY-MM-DD HH:MM:SS'"""
+    import datetime
+    for fmt in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d'):
+        try:
+            return datetime.datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    raise argparse.ArgumentTypeError(f'неверная эпоха: {value}')
+
+def write_pld(stations, output_path, args):
+    from .pld import save_pld_file
+    save_pld_file(stations, output_path, args.plate or '', get_plates(stations, args))
+
+def write_vel(stations, output_path, args):
+    from .vel import save_vel_file
+    save_vel_file(stations, output_path, args.plate or '', get_plates(stations, args))
+
+def write_bsl(stations, output_path, args):
+    from .bsl import save_bsl_file
+    return save_bsl_file(stations, output_path, args.availability, args.span)
+
+WRITERS = {
+    'sta': write_sta,
+    'crd': write_crd,
+    'abb': write_abb,
+    'clu': write_clu,
+    'pld': write_pld,
+    'vel': write_vel,
+    'bsl': write_bsl,
+}
+
+# Order of the combined run, same as the original rinex_parser.main
+ALL_ORDER = ('clu', 'crd', 'pld', 'abb', 'sta', 'vel', 'bsl')
+
+def build_parser():
+    """Build the argument parser with one subcommand per product"""
+    parser = argparse.ArgumentParser(
+        prog='rinex-tools',
+        description='Вспомогательные файлы Bernese (STA, CRD, ABB, CLU, PLD, VEL) по заголовкам RINEX',
+    )
+    parser.add_argument('--version', action='version', version=f'%(prog)s {__version__}')
+
+    source = argparse.ArgumentParser(add_help=False)
+    source.add_argument('-i', '--input-dir', default=INPUT_DIR, help='каталог с файлами RINEX')
+    source.add_argument('--dedup', action='store_true',
+                        help='пропускать дубликаты (то же содержимое или та же станция и день)')
+
+    inputs = argparse.ArgumentParser(add_help=False, parents=[source])
+    inputs.add_argument('--registry', help='брать станции из объединённого реестра (rinex-tools merge), '
+                                           'а не из каталога')
+
+    catalog = argparse.ArgumentParser(add_help=False)
+    catalog.add_argument('--catalog', help='каталог site log (*.log) или CSV для сверки заголовков')
+    catalog.add_argument('--fix-metadata', action='store_true',
+                         help='заменять приёмник, антенну и эксцентриситеты значениями из --catalog')
+
+    common = argparse.ArgumentParser(add_help=False, parents=[inputs, catalog])
+    common.add_argument('-o', '--output-dir', default=OUTPUT_DIR, help='каталог для выходных файлов')
+    common.add_argument('-n', '--name', default='2025', help='имя выходных файлов без расширения')
+    common.add_argument('--max-memory', type=float,
+                        help='ограничение памяти на агрегаты станций, МБ (по умолчанию без ограничения)')
+    common.add_argument('--rebuild', action='store_true',
+                        help='перезаписать все файлы, даже если их исходные данные не изменились')
+    common.add_argument('--obs-cache', help='каталог двоичного кэша наблюдений (rinex-tools cache) '
+                                            'для --spp и --problems')
+    common.add_argument('--campaign', help='каталог кампании Bernese: создать структуру, записать файлы в STA '
+                                           '(вместо -o) и разместить файлы RINEX в RAW под именами Bernese')
+    common.add_argument('--link', choices=('hard', 'symlink', 'copy'), default='hard',
+                        help='как размещать файлы в RAW: жёсткие ссылки (по умолчанию, при ошибке - копия), '
+                             'символические ссылки или копии')
+
+    sta = argparse.ArgumentParser(add_help=False)
+    sta.add_argument('--problems', action='store_true',
+                     help='заполнить TYPE 003 интервалами перерывов, скачков часов и плохого слежения '
+                          'по файлам наблюдений')
+    sta.add_argument('-j', '--jobs', type=int, default=1, help='число процессов для --problems')
+
+    plate = argparse.ArgumentParser(add_help=False)
+    plate.add_argument('-p', '--plate', help='одна плита для всех станций в PLD/VEL; с --plates - '
+                                             'плита станций вне модели')
+    plate.add_argument('--plates', help='модель плит PB2002_plates.dig для автоматического назначения '
+                                        '(без неё нужен --plate для PLD/VEL)')
+
+    crd = argparse.ArgumentParser(add_help=False)
+    crd.add_argument('--epoch', type=parse_epoch,
+                     help='эпоха координат CRD, к ней приводятся координаты по плитам -p/--plates '
+                          '(по умолчанию 2025-03-01, без плит координаты не приводятся)')
+    crd.add_argument('--spp', action='store_true',
+                     help='вычислять координаты по кодовым измерениям (SPP) для станций без '
+                          'правдоподобной APPROX POSITION XYZ; навигационный файл .YYN рядом с файлом '
+                          'наблюдений или из --nav')
+    crd.add_argument('--nav', help='навигационный файл GPS или каталог суточных навигационных файлов для --spp')
+
+    abb = argparse.ArgumentParser(add_help=False)
+    abb.add_argument('--abb-registry', help='прежний файл ABB, чьи 4-ID/2-ID сохраняются '
+                                            '(по умолчанию перезаписываемый файл)')
+
+    clu = argparse.ArgumentParser(add_help=False)
+    clu.add_argument('--clusters', type=int, default=1,
+                     help='число кластеров CLU: компактные по географии, равные по числу станций '
+                          '(по умолчанию 1 - все станции в кластере 1)')
+
+    bsl = argparse.ArgumentParser(add_help=False)
+    bsl.add_argument('--span', action='store_true',
+                     help='также общий список базовых линий за все сутки <имя>.BSL')
+
+    subparsers = parser.add_subparsers(dest='product', required=True)
+    options = {'pld': [plate], 'vel': [plate], 'abb': [abb], 'crd': [crd, plate], 'clu': [clu], 'bsl': [bsl],
+               'sta': [sta]}
+    for product in PRODUCTS:
+        sub = subparsers.add_parser(product, parents=[common] + options.get(product, []),
+                                    help=f'создать файл *.{product.upper()}')
+        sub.set_defaults(func=run_products, products=(product,))
+    sub = subparsers.add_parser('all', parents=[common, plate, abb, crd, clu, bsl, sta], help='создать все файлы')
+    sub.set_defaults(func=run_products, products=ALL_ORDER)
+
+    sub = subparsers.add_parser('dedup', help='только найти дубликаты файлов RINEX')
+    sub.add_argument('-i', '--input-dir', default=INPUT_DIR, help='каталог с файлами RINEX')
+    sub.set_defaults(func=run_dedup)
+
+    sub = subparsers.add_parser('check', parents=[inputs],
+                                help='сверить заголовки с каталогом site log / CSV')
+    sub.add_argument('--catalog', required=True, help='каталог site log (*.log) или CSV')
+    sub.set_defaults(func=run_check)
+
+    sub = subparsers.add_parser('types', parents=[inputs],
+                                help='проверить названия приёмников, антенн и обтекателей по ANTEX и rcvr_ant.tab')
+    sub.add_argument('--antex', help='файл ANTEX (калибровки антенн, как в PCV-файле Bernese)')
+    sub.add_argument('--rcvr-ant', help='таблица IGS rcvr_ant.tab')
+    sub.set_defaults(func=run_types)
+
+    sub = subparsers.add_parser('qc', parents=[source],
+                                help='качество наблюдений: многолучёвость, срывы циклов, SNR')
+    sub.add_argument('files', nargs='*', help='файлы RINEX (по умолчанию все файлы из --input-dir)')
+    sub.add_argument('-j', '--jobs', type=int, default=1, help='число процессов')
+    sub.add_argument('--satellites', action='store_true', help='выводить значения по спутникам')
+    sub.add_argument('--csv', help='записать итоги по файлам в CSV')
+    sub.add_argument('--obs-cache', help='каталог двоичного кэша наблюдений (rinex-tools cache)')
+    sub.set_defaults(func=run_qc)
+
+    sub = subparsers.add_parser('avail', parents=[source],
+                                help='карта совместных наблюдений станций по эпохам, по сессиям')
+    sub.add_argument('files', nargs='*', help='файлы RINEX (по умолчанию все файлы из --input-dir)')
+    sub.add_argument('-o', '--output-dir', default=OUTPUT_DIR, help='каталог для файлов <имя>_YYYYDDD.AVL')
+    sub.add_argument('-n', '--name', default='2025', help='имя выходных файлов без расширения')
+    sub.add_argument('--interval', type=int, default=30, help='длина эпохи карты, с (по умолчанию 30)')
+    sub.add_argument('--obs-cache', help='брать эпохи из кэша наблюдений (rinex-tools cache)')
+    sub.add_argument('-j', '--jobs', type=int, default=1, help='число процессов')
+    sub.set_defaults(func=run_avail)
+
+    sub = subparsers.add_parser('cache', parents=[source],
+                                help='двоичный кэш наблюдений для повторных qc и --spp')
+    sub.add_argument('files', nargs='*', help='файлы RINEX (по умолчанию все файлы из --input-dir)')
+    sub.add_argument('--obs-cache', required=True, help='каталог кэша')
+    sub.set_defaults(func=run_cache)
+
+    sub = subparsers.add_parser('decimate', parents=[source],
+                                help='прореженные копии файлов RINEX с выбранными наблюдениями')
+    sub.add_argument('files', nargs='*', help='файлы RINEX (по умолчанию все файлы из --input-dir)')
+    sub.add_argument('-o', '--output-dir', required=True, help='каталог для копий')
+    sub.add_argument('--interval', type=float, help='интервал, с (например 30)')
+    sub.add_argument('--types', type=lambda v: v.upper().split(','),
+                     help='оставить типы наблюдений, например L1,L2,C1,P1,P2')
+    sub.add_argument('--systems', help='оставить спутниковые системы, например G или GR')
+    sub.set_defaults(func=run_decimate)
+
+    sub = subparsers.add_parser('splice', parents=[source],
+                                help='склеить и разрезать файлы RINEX в суточные SSSSDDD0.YYO')
+    sub.add_argument('files', nargs='*', help='файлы RINEX (по умолчанию все файлы из --input-dir)')
+    sub.add_argument('-o', '--output-dir', required=True, help='каталог для суточных файлов')
+    sub.set_defaults(func=run_splice)
+
+    sub = subparsers.add_parser('normalize', parents=[source],
+                                help='исправить станцию, приёмник и антенну в заголовках файлов RINEX')
+    sub.add_argument('files', nargs='*', help='файлы RINEX (по умолчанию все файлы из --input-dir)')
+    sub.add_argument('--rules', help='таблица исправлений CSV (без неё - только встроенные правила)')
+    sub.add_argument('--dry-run', action='store_true', help='только показать, какие файлы изменятся')
+    sub.set_defaults(func=run_normalize)
+
+    sub = subparsers.add_parser('serve', help='локальный сервис запросов к реестру станций')
+    sub.add_argument('-i', '--input-dir', default=INPUT_DIR, help='каталог с файлами RINEX')
+    sub.add_argument('--registry', help='начальный реестр (rinex-tools merge); затем читаются только '
+                                        'изменившиеся файлы каталога')
+    sub.add_argument('--port', type=int, default=8765, help='порт HTTP на 127.0.0.1 (по умолчанию 8765)')
+    sub.add_argument('--socket', help='Unix-сокет вместо порта')
+    sub.add_argument('--refresh', type=float, help='перечитывать изменения каталога каждые N секунд')
+    sub.set_defaults(func=run_serve)
+
+    sub = subparsers.add_parser('shard', parents=[source],
+                                help='разобрать заголовки одной части архива в частичный реестр')
+    sub.add_argument('--by', choices=('station', 'year'), default='station', help='ключ разбиения')
+    sub.add_argument('--count', type=int, required=True, help='число частей')
+    sub.add_argument('--index', type=int, required=True, help='номер части, от 0')
+    sub.add_argument('-o', '--output', required=True, help='файл частичного реестра (.json или .json.gz)')
+    sub.set_defaults(func=run_shard)
+
+    sub = subparsers.add_parser('merge', help='объединить частичные реестры')
+    sub.add_argument('partials', nargs='+', help='частичные реестры')
+    sub.add_argument('-o', '--output', required=True, help='объединённый реестр')
+    sub.set_defaults(func=run_merge)
+    return parser
+
+def find_files(args):
+    """RINEX files of the input directory, without duplicates if requested"""
+    files = iter_rinex_files(args.input_dir)
+    if args.dedup:
+        from .dedup import deduplicate
+        files, duplicates = deduplicate(list(files))
+        if duplicates:
+            print(f'Пропущено дубликатов: {len(duplicates)}', file=sys.stderr)
+    return files
+
+def load(args):
+    """Stations from the merged registry or from the input directory, one at a time"""
+    if args.registry:
+        from .registry import read_registry, registry_stations
+        return registry_stations(read_registry(args.registry), args.input_dir)
+    return iter_stations(find_files(args))
+
+def collect_files(stations, files):
+    """Record (station name, number), path and TIME OF FIRST OBS of each file, passing the stations on"""
+    for station in stations:
+        files.append(((station.marker_name[:4].strip(), station.marker_number[:9]), station.path,
+                      station.header.get('TIME OF FIRST OBS', '')))
+        yield station
+
+def check_metadata(stations, args):
+    """Report or fix header metadata that disagrees with the catalog, passing the stations on"""
+    from collections import defaultdict
+    from .catalog import apply_catalog, check_stations, load_catalog, print_report
+    catalog = load_catalog(args.catalog)
+    report = defaultdict(list)
+    corrected = 0
+    for station in stations:
+        if args.fix_metadata:
+            corrected += apply_catalog([station], catalog)
+        else:
+            for key, files in check_stations([station], catalog).items():
+                report[key].extend(files)
+        yield station
+    if args.fix_metadata:
+        print(f'Исправлено по каталогу записей: {corrected}', file=sys.stderr)
+    else:
+        print_report(report)
+
+def run_products(args):
+    from .aggregate import aggregate_stations
+    stations = load(args)
+    if args.catalog:
+        stations = check_metadata(stations, args)
+    files = []
+    if getattr(args, 'problems', False) or args.campaign or 'bsl' in args.products:
+        stations = collect_files(stations, files)
+    if args.campaign:
+        from .campaign import create_campaign
+        create_campaign(args.campaign)
+        args.output_dir = os.path.join(args.campaign, 'STA')
+    max_bytes = args.max_memory * 2**20 if args.max_memory else None
+    try:
+        stations = aggregate_stations(stations, max_bytes)
+    except MemoryError as e:
+        print(f'Ошибка: {e}', file=sys.stderr)
+        return 1
+
+    if getattr(args, 'spp', False):
+        fill_spp_positions(stations, args)
+    if getattr(args, 'problems', False):
+        from .problems import station_problems
+        problem_files = [(key, path) for key, path, _ in files]
+        args.station_problems = station_problems(problem_files, args.obs_cache, args.jobs)
+        print(f'Интервалов проблем станций (TYPE 003): {len(args.station_problems)}', file=sys.stderr)
+    if 'bsl' in args.products:
+        from .bsl import station_availability
+        args.availability = station_availability(files, args.obs_cache, getattr(args, 'jobs', 1))
+
+    from .buildcache import BuildCache, product_key
+    rebuilt, unchanged = [], []
+    try:
+        os.makedirs(args.output_dir, exist_ok=True)
+        cache = BuildCache(args.output_dir, args.name)
+        for product in args.products:
+            output_path = os.path.join(args.output_dir, f'{args.name}.{product.upper()}')
+            key = product_key(product, stations, args)
+            if not args.rebuild and cache.is_fresh(product, key, output_path):
+                unchanged.append(product.upper())
+                continue
+            written = WRITERS[product](stations, output_path, args)
+            cache.record(product, key, output_path, written or ())
+            rebuilt.append(product.upper())
+        cache.save()
+    except Exception as e:
+        print(f'Ошибка при сохранении файлов: {str(e)}', file=sys.stderr)
+        return 1
+    print(f"Пересобрано: {', '.join(rebuilt) or 'нет'}; без изменений: {', '.join(unchanged) or 'нет'}",
+          file=sys.stderr)
+    if args.campaign:
+        return fill_campaign_raw(files, args)
+    return 0
+
+def fill_campaign_raw(files, args):
+    from .campaign import fill_raw
+    try:
+        counts = fill_raw(args.campaign, files, os.path.join(args.output_dir, f'{args.name}.ABB'), args.link)
+    except (OSError, ValueError) as e:
+        print(f'Ошибка при размещении файлов в RAW: {e}', file=sys.stderr)
+        return 1
+    for path in counts['skipped']:
+        print(f'Пропущен {path}: нет даты или имя в RAW уже занято', file=sys.stderr)
+    print(f"RAW: связано {counts['linked']}, скопировано {counts['copied']}, без изменений {counts['unchanged']}",
+          file=sys.stderr)
+    return 0
+
+def fill_spp_positions(stations, args):
+    from .spp import fill_positions
+    for station_id, result in fill_positions(stations, args.nav, args.obs_cache).items():
+        if result is None:
+            print(f'Нет координат для {station_id}: нет навигационного файла или решения SPP', file=sys.stderr)
+        else:
+            print(f'Координаты {station_id} по SPP: эпох {result[1]}, разброс {result[2]:.1f} м', file=sys.stderr)
+
+def run_check(args):
+    from .catalog import check_stations, load_catalog, print_report
+    print_report(check_stations(load(args), load_catalog(args.catalog)))
+    return 0
+
+def run_types(args):
+    if not args.antex and not args.rcvr_ant:
+        print('Укажите --antex и/или --rcvr-ant', file=sys.stderr)
+        return 2
+    from .antex import TypeTables, check_types, print_types_report
+    try:
+        tables = TypeTables(args.antex, args.rcvr_ant)
+    except OSError as e:
+        print(f'Ошибка чтения таблиц: {e}', file=sys.stderr)
+        return 1
+    print_types_report(check_types(load(args), tables))
+    return 0
+
+def run_dedup(args):
+    from .dedup import deduplicate, print_duplicates
+    files, duplicates = deduplicate(find_rinex_files(args.input_dir))
+    print_duplicates(duplicates)
+    return 0
+
+def run_qc(args):
+    from .qc import QC_HEADER, format_summary, print_satellites, qc_files, write_csv
+    summaries = []
+    print(QC_HEADER)
+    for summary in qc_files(args.files or find_files(args), args.jobs, args.obs_cache):
+        if summary is None:
+            continue
+        print(format_summary(summary))
+        if args.satellites:
+            print_satellites(summary)
+        summaries.append(summary)
+    if args.csv:
+        write_csv(summaries, args.csv)
+    return 0
+
+def run_avail(args):
+    from .availability import build_sessions, files_epochs, save_session, session_name, session_summary
+    from .header import get_station_id
+    stations = list(iter_stations(args.files or find_files(args)))
+    records = [(get_station_id(st), epochs) for st, epochs in
+               zip(stations, files_epochs([st.path for st in stations], args.obs_cache, args.jobs))
+               if epochs is not None]
+    os.makedirs(args.output_dir, exist_ok=True)
+    for day, session in build_sessions(records, args.interval).items():
+        path = os.path.join(args.output_dir, f'{args.name}_{session_name(day)}.AVL')
+        save_session(session, path)
+        summary = session_summary(session)
+        print(f"{session_name(day)}: станций {summary['stations']}, эпох с наблюдениями {summary['observed']}, "
+              f"из них общих {summary['common']}, опорная станция {summary['reference']}")
+    return 0
+
+def run_cache(args):
+    from .obscache import convert_file
+    converted = fresh = 0
+    for path in args.files or find_files(args):
+        try:
+            if convert_file(path, args.obs_cache):
+                converted += 1
+            else:
+                fresh += 1
+        except (OSError, ValueError) as e:
+            print(f'Ошибка при обработке файла {path}: {e}', file=sys.stderr)
+    print(f'Записано в кэш: {converted}; без изменений: {fresh}')
+    return 0
+
+def run_decimate(args):
+    from .decimate import decimate_file
+    for path in args.files or find_files(args):
+        output_path = os.path.join(args.output_dir, os.path.basename(path))
+        if os.path.abspath(output_path) == os.path.abspath(path):
+            print(f'Пропущен {path}: копия совпадает с исходным файлом', file=sys.stderr)
+            continue
+        try:
+            read, written = decimate_file(path, output_path, args.interval, args.types, args.systems)
+        except (OSError, ValueError) as e:
+            print(f'Ошибка при обработке файла {path}: {e}', file=sys.stderr)
+            continue
+        print(f'{os.path.basename(path)}: эпох {read} -> {written}')
+    return 0
+
+def run_splice(args):
+    from .splice import splice_files
+    try:
+        result = splice_files(list(args.files or find_files(args)), args.output_dir)
+    except (OSError, ValueError) as e:
+        print(f'Ошибка: {e}', file=sys.stderr)
+        return 1
+    for station, (written, dropped) in result.items():
+        for path, epochs in written:
+            print(f'{station}: {os.path.basename(path)} эпох {epochs}')
+        if dropped:
+            print(f'{station}: пропущено повторяющихся эпох {dropped}', file=sys.stderr)
+    return 0
+
+def run_normalize(args):
+    from .normalize import load_rules, normalize_file
+    rules = load_rules(args.rules)
+    counts = {'in place': 0, 'copied': 0}
+    for path in args.files or find_files(args):
+        try:
+            result = normalize_file(path, rules, args.dry_run)
+        except (OSError, ValueError) as e:
+            print(f'Ошибка при обработке файла {path}: {e}', file=sys.stderr)
+            continue
+        if result is not None:
+            counts[result] += 1
+            print(f"{path}: {'заголовок на месте' if result == 'in place' else 'файл переписан'}")
+    print(f"Исправлено на месте: {counts['in place']}; переписано: {counts['copied']}"
+          f"{' (пробный запуск)' if args.dry_run else ''}", file=sys.stderr)
+    return 0
+
+def run_serve(args):
+    import threading
+    from .service import RegistryIndex, make_server, refresh_loop
+    index = RegistryIndex()
+    if args.registry:
+        from .registry import read_registry
+        index.update(read_registry(args.registry))
+    changed, _ = index.refresh(args.input_dir)
+    print(f'Станций: {len(index.histories)}; файлов: {len(index.records)} (прочитано заголовков: {changed})',
+          file=sys.stderr)
+    try:
+        server = make_server(index, args.input_dir, args.port, args.socket)
+    except OSError as e:
+        print(f'Ошибка: {e}', file=sys.stderr)
+        return 1
+    stop = threading.Event()
+    if args.refresh:
+        threading.Thread(target=refresh_loop, args=(index, args.input_dir, args.refresh, stop),
+                         daemon=True).start()
+    print(f"Сервис запущен: {args.socket or f'http://127.0.0.1:{args.port}'}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+    return 0
+
+def run_shard(args):
+    from .registry import build_registry, select_shard, write_registry
+    files = select_shard(find_files(args), args.by, args.count, args.index)
+    write_registry(build_registry(files, args.input_dir), args.output)
+    return 0
+
+def run_merge(args):
+    from .registry import merge_registries, read_registry, write_registry
+    write_registry(merge_registries(read_registry(p) for p in args.partials), args.output)
+    return 0
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if {'pld', 'vel'} & set(getattr(args, 'products', ())) and not args.plate and not args.plates:
+        parser.error('для PLD/VEL нужна плита -p/--plate или модель плит --plates')
+    if getattr(args, 'epoch', None) and not args.plate and not args.plates:
+        parser.error('для --epoch нужна плита -p/--plate или модель плит --plates')
+    return args.func(args)
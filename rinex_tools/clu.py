@@ -0,0 +1,31 @@
+from .header import get_station_id, unique_stations
+
+FORMAT_VERSION = 1
+
+def format_clu_line(station_id, cluster=1):
+    """Format a line for the CLU file according to the template"""
+    station_name = station_id[:4]
+    station_number = station_id[4:]
+    return f"{station_name} {station_number:<9}{' ' * 3}{cluster:>3}"
+
+def save_clu_file(stations, output_path, clusters=1):
+    """Save the CLU file; with ``clusters`` > 1 stations are split into balanced geographic clusters"""
+    header = (
+        "BSW 5.2: PROCESSING EXAMPLE                                      10-JAN-12 06:07\n"
+        "--------------------------------------------------------------------------------\n\n"
+        "STATION NAME      CLU\n"
+        "****************  ***\n"
+    )
+    
+    stations = unique_stations(stations)
+    numbers = [1] * len(stations)
+    if clusters > 1 and stations:
+        from .cluster import balanced_clusters
+        from .geodesy import parse_xyz
+        numbers = balanced_clusters(parse_xyz([st.xyz for st in stations]), clusters).tolist()
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(header)
+        for station, cluster in zip(stations, numbers):
+            station_id = get_station_id(station)
+            line = format_clu_line(station_id, cluster)
+            f.write(line + '\n')
@@ -0,0 +1,102 @@
+"""Geographically compact, size-balanced station clusters for the CLU file.
+
+Bernese processes the clusters of a CLU file in parallel, so clusters should be
+of equal size (the largest one sets the wall-clock time) and compact (short
+baselines inside a cluster). Balanced k-means on the ellipsoid normals of the
+stations:
+
+* centers start from k-means++ seeding (fixed seed, so runs are repeatable);
+* each round, every center takes the stations nearest to it, up to ceil(N / k),
+  in order of how much they lose by not getting it; the rest go to the nearest
+  center that still has room, and the centers move to the mean of their
+  stations;
+* rounds stop when no station changes cluster.
+
+Only the (N, k) station-center distances are computed, never the (N, N)
+station matrix. Stations without a plausible position fill the smallest
+clusters last. Clusters are numbered from west to east.
+"""
+import numpy as np
+
+from .geodesy import chord_distances, ecef_to_geodetic, on_surface, unit_vectors
+
+MAX_ROUNDS = 50
+
+def seed_centers(points, count, rng):
+    """k-means++ seeding: each next center is drawn with probability ~ squared distance"""
+    centers = [points[rng.integers(len(points))]]
+    nearest = chord_distances(points, centers[0])[:, 0] ** 2
+    for _ in range(1, count):
+        total = nearest.sum()
+        i = rng.choice(len(points), p=nearest / total) if total > 0 else rng.integers(len(points))
+        centers.append(points[i])
+        np.minimum(nearest, chord_distances(points, points[i])[:, 0] ** 2, out=nearest)
+    return np.array(centers)
+
+def balanced_assign(distances, capacity):
+    """Cluster of each row of an (N, k) distance matrix with at most ``capacity`` rows per cluster"""
+    n, k = distances.shape
+    order = np.argsort(distances, axis=1)
+    ranked = np.take_along_axis(distances, order, axis=1)
+    regret = ranked[:, -1] - ranked[:, 0] if k > 1 else np.zeros(n)
+    priority = np.argsort(-regret, kind='stable')
+    # Nearest centers first, all at once: the first ``capacity`` stations by priority get in
+    first = order[priority, 0]
+    by_center = np.argsort(first, kind='stable')
+    starts = np.searchsorted(first[by_center], np.arange(k))
+    position = np.empty(n, dtype=np.int64)
+    position[by_center] = np.arange(n) - starts[first[by_center]]
+    labels = np.full(n, -1, dtype=np.int64)
+    accepted = position < capacity
+    labels[priority[accepted]] = first[accepted]
+    room = capacity - np.bincount(first[accepted], minlength=k)
+    for i in priority[~accepted].tolist():
+        for c in order[i].tolist():
+            if room[c]:
+                room[c] -= 1
+                labels[i] = c
+                break
+    return labels
+
+def balanced_clusters(xyz, count, seed=0):
+    """Cluster number (1..count) of each (N, 3) ECEF position"""
+    xyz = np.asarray(xyz, dtype=float).reshape(-1, 3)
+    n = len(xyz)
+    count = max(1, min(count, n))
+    if count == 1:
+        return np.ones(n, dtype=np.int64)
+    capacity = -(-n // count)
+    valid = on_surface(xyz)
+    labels = np.zeros(n, dtype=np.int64)
+    sizes = np.zeros(count, dtype=np.int64)
+    if valid.any():
+        points = unit_vectors(xyz[valid])
+        k = min(count, len(points))
+        centers = seed_centers(points, k, np.random.default_rng(seed))
+        assigned = None
+        for _ in range(MAX_ROUNDS):
+            new = balanced_assign(chord_distances(points, centers), capacity)
+            if assigned is not None and np.array_equal(new, assigned):
+                break
+            assigned = new
+            sums = np.stack([np.bincount(assigned, points[:, i], minlength=k) for i in range(3)], axis=1)
+            norms = np.linalg.norm(sums, axis=1)
+            moved = norms > 0
+            centers[moved] = sums[moved] / norms[moved, None]
+        labels[valid] = assigned
+        sizes[:k] = np.bincount(assigned, minlength=k)
+    for i in np.flatnonzero(~valid).tolist():
+        labels[i] = int(np.argmin(sizes))
+        sizes[labels[i]] += 1
+
+    # Number the clusters from west to east by the mean longitude of their stations
+    east = np.zeros(count)
+    if valid.any():
+        _, lon, _ = ecef_to_geodetic(xyz[valid])
+        angle = np.radians(lon)
+        sums = np.stack([np.bincount(labels[valid], np.cos(angle), minlength=count),
+                         np.bincount(labels[valid], np.sin(angle), minlength=count)])
+        east = np.arctan2(sums[1], sums[0])
+    rank = np.empty(count, dtype=np.int64)
+    rank[np.argsort(east, kind='stable')] = np.arange(1, count + 1)
+    return rank[labels]
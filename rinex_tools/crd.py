@@ -0,0 +1,135 @@
+import datetime
+import os
+import sys
+
+from .header import INPUT_DIR, get_station_id
+
+FORMAT_VERSION = 1
+DEFAULT_EPOCH = datetime.datetime(2025, 3, 1)
+SECONDS_PER_YEAR = 365.25 * 86400
+
+def parse_xyz_coordinates(xyz_line):
+    """Parse X, Y, Z coordinates from APPROX POSITION XYZ line"""
+    if xyz_line == '-':
+        return '0.00000', '0.00000', '0.00000'
+    
+    x = xyz_line[2:15].strip()
+    y = xyz_line[16:29].strip()
+    z = xyz_line[30:43].strip()
+    
+    try:
+        x = f"{float(x):.5f}"
+        y = f"{float(y):.5f}"
+        z = f"{float(z):.5f}"
+    except ValueError:
+        x = y = z = '0.00000'
+    
+    return x, y, z
+
+def format_crd_line(num, station_id, x, y, z):
+    """Format a line for the CRD file according to the template"""
+    station_name = station_id[:4]
+    station_number = station_id[4:]
+    
+    # Format the station number to be left-aligned in 9 characters
+    formatted_number = station_number.ljust(9)
+    
+    return (
+        f"{num:3d}  "
+        f"{station_name} {formatted_number}   "
+        f"{x:>14} "
+        f"{y:>14} "
+        f"{z:>14}   "
+        f"{'I':>2}"
+    )
+
+def get_file_time(station):
+    """Modification time of the station's file (0 if unknown)"""
+    if station.mtime is not None:
+        return station.mtime
+    try:
+        return os.path.getctime(os.path.join(INPUT_DIR, station.filename))
+    except Exception:
+        return 0
+
+def propagate_coordinates(stations, epoch, plate_name='', plates=None):
+    """Coordinates of the stations moved from their observation epoch to ``epoch``.
+
+    One NumPy operation for all stations: X(epoch) = X(t_obs) + V * (epoch - t_obs),
+    with the same velocities as the VEL file. Missing or implausible positions,
+    and stations without a known NUVEL-1A plate (from ``plates`` or
+    ``plate_name``), are returned unchanged. Returns the (N, 3) array and
+    the boolean mask of the moved stations.
+    """
+    import numpy as np  # Heavy import, only needed for propagation
+    from .geodesy import on_surface, parse_xyz
+    from .gpstime import from_datetime
+    from .plates import NNR_NUVEL1A
+    from .sta import station_epochs
+    from .vel import station_velocities
+
+    xyz = parse_xyz([st.xyz for st in stations])
+    station_ids = [get_station_id(st) for st in stations]
+    velocities, names = station_velocities(xyz, station_ids, plate_name, plates)
+    moved = on_surface(xyz) & np.array([name in NNR_NUVEL1A for name in names], dtype=bool)
+    years = (from_datetime(epoch) - station_epochs(stations)[0]) / SECONDS_PER_YEAR
+    return xyz + np.where(moved, years, 0.0)[:, None] * velocities, moved
+
+def save_crd_file(stations, output_path, epoch=None, plate_name='', plates=None):
+    """Save the CRD file with the formatted station information.
+
+    With ``epoch`` the coordinates are propagated to it (see
+    ``propagate_coordinates``) and it is written in the header; without it the
+    header positions are written as they are. Stations that could not be
+    moved are reported, and if none was moved the epoch is not written.
+    """
+    # Create a dictionary to track unique stations with their creation times
+    station_dict = {}
+    
+    for station in stations:
+        station_id = get_station_id(station)
+        creation_time = get_file_time(station)
+
+        # If station not in dict or current file is newer, update the entry
+        if station_id not in station_dict or creation_time > station_dict[station_id]['time']:
+            station_dict[station_id] = {
+                'station': station,
+                'time': creation_time
+            }
+
+    # Sort stations by name and number
+    sorted_stations = sorted(station_dict.values(), 
+                           key=lambda x: (x['station'].marker_name, x['station'].marker_number))
+    
+    if epoch is not None:
+        selected = [station_data['station'] for station_data in sorted_stations]
+        propagated, moved = propagate_coordinates(selected, epoch, plate_name, plates)
+        from .geodesy import on_surface, parse_xyz
+        located = on_surface(parse_xyz([st.xyz for st in selected]))
+        unmoved = [get_station_id(st) for st, m, ok in zip(selected, moved, located) if ok and not m]
+        if located.any() and not moved.any():
+            print(f"Внимание: нет станций с известной плитой NUVEL-1A, координаты CRD не приведены "
+                  f"к эпохе {epoch:%Y-%m-%d}", file=sys.stderr)
+            epoch = None
+        elif unmoved:
+            print(f"Внимание: координаты {len(unmoved)} станций без плиты NUVEL-1A не приведены к эпохе "
+                  f"{epoch:%Y-%m-%d}: {', '.join(unmoved)}", file=sys.stderr)
+
+    header_epoch = (epoch or DEFAULT_EPOCH).strftime('%Y-%m-%d %H:%M:%S')
+    header = (
+        "PPP_210940: Collecting results                                   06-MAY-25 12:25\n"
+        "--------------------------------------------------------------------------------\n"
+        f"LOCAL GEODETIC DATUM: IGS20             EPOCH: {header_epoch}\n\n"
+        "NUM  STATION NAME           X (M)          Y (M)          Z (M)     FLAG\n\n"
+    )
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(header)
+        for i, station_data in enumerate(sorted_stations, 1):
+            station = station_data['station']
+            station_id = get_station_id(station)
+            x, y, z = parse_xyz_coordinates(station.xyz)
+            if epoch is not None:
+                x, y, z = (f"{c:.5f}" for c in propagated[i - 1])
+            line = format_crd_line(i, station_id, x, y, z)
+            f.write(line + '\n')
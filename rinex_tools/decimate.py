@@ -0,0 +1,80 @@
+"""Decimated and reduced copies of RINEX 2 observation files.
+
+Each file is read once and written epoch by epoch: epochs off the target
+interval are dropped, unwanted observation types and satellite systems are
+removed, and INTERVAL, # / TYPES OF OBSERV and TIME OF FIRST/LAST OBS are
+updated. Loss of lock flags of dropped epochs are carried to the next written
+epoch of the satellite, so slips are not lost with the epochs. The per-file
+# OF SATELLITES and PRN / # OF OBS lines are removed, since the counts no
+longer hold. All other header lines are copied unchanged, so the header
+scanner reports the same station metadata for the copy.
+"""
+from .obsstream import (FIELD, ObsWriter, check_version, format_obs_types, header_label, header_line,
+                        iter_epochs, obs_types, read_header, remove_header, select_fields, set_header)
+
+# Epochs within this distance of the interval grid are kept [s]
+TOLERANCE = 0.05
+SYSTEM_NAMES = {'G': 'G (GPS)', 'R': 'R (GLONASS)', 'E': 'E (GALILEO)', 'S': 'S (GEO)', 'T': 'T (TRANSIT)'}
+
+def on_grid(epoch, interval):
+    sod = epoch.second_of_day()
+    return abs(sod - round(sod / interval) * interval) <= TOLERANCE
+
+def set_lost_lock(record, indices):
+    """Set LLI bit 0 of the observations at the given indices (where a value is present)"""
+    chars = list(record)
+    for k in indices:
+        if record[FIELD * k:FIELD * k + 14].strip():
+            lli = chars[FIELD * k + 14]
+            chars[FIELD * k + 14] = str((int(lli) if lli.isdigit() else 0) | 1)
+    return ''.join(chars)
+
+def lost_lock(record, n_types):
+    """Indices of the observations with LLI bit 0 set"""
+    return {k for k in range(n_types)
+            if record[FIELD * k + 14:FIELD * k + 15].isdigit() and int(record[FIELD * k + 14]) & 1}
+
+def decimate_file(path, output_path, interval=None, types=None, systems=None):
+    """Write a decimated copy of a file; returns (epochs read, epochs written)"""
+    with open(path, 'r', encoding='ascii', errors='replace') as f:
+        header = read_header(f)
+        check_version(header)
+        all_types = obs_types(header)
+        keep = [k for k, t in enumerate(all_types) if not types or t in types]
+        header = set_header(header, '# / TYPES OF OBSERV', format_obs_types([all_types[k] for k in keep]))
+        if interval:
+            header = set_header(header, 'INTERVAL', [header_line(f'{interval:10.3f}', 'INTERVAL')])
+        header = remove_header(header, '# OF SATELLITES', 'PRN / # OF OBS')
+        if systems and len(systems) == 1:
+            system = SYSTEM_NAMES.get(systems[0], systems[0])
+            header = [f'{line[:40]}{system:<20}{line[60:]}' if header_label(line) == 'RINEX VERSION / TYPE'
+                      else line for line in header]
+
+        read = written = 0
+        pending = {}  # satellite -> observation indices with a slip in dropped epochs
+        with ObsWriter(output_path, header) as writer:
+            for epoch in iter_epochs(f, len(all_types)):
+                if epoch.flag not in (0, 1, 6):
+                    writer.write(epoch)
+                    continue
+                if epoch.flag == 6:  # slip records refer to dropped types and epochs
+                    continue
+                read += 1
+                sats = [(s, r) for s, r in zip(epoch.satellites, epoch.records)
+                        if not systems or (s[0] if s[0] != ' ' else 'G') in systems]
+                if interval and not on_grid(epoch, interval):
+                    for sat, record in sats:
+                        slipped = lost_lock(record, len(all_types))
+                        if slipped:
+                            pending.setdefault(sat, set()).update(slipped)
+                    continue
+                records = []
+                for sat, record in sats:
+                    if sat in pending:
+                        record = set_lost_lock(record, pending.pop(sat))
+                    records.append(select_fields(record, keep))
+                epoch.satellites = [s for s, _ in sats]
+                epoch.records = records
+                writer.write(epoch)
+                written += 1
+    return read, written
@@ -0,0 +1,113 @@
+"""Duplicate RINEX files: identical content and repeated station-day sessions.
+
+Files are compared in three steps, each only for the files the previous step
+could not tell apart: size, then a fingerprint of the header plus a few
+sampled body blocks, then a full content hash.
+"""
+import hashlib
+import os
+from collections import defaultdict
+
+from .header import STATION_DAY_RE
+
+HEAD_BYTES = 64 * 1024  # header and the first epochs
+SAMPLE_BYTES = 16 * 1024
+SAMPLE_COUNT = 4
+BLOCK_BYTES = 1024 * 1024
+
+def fingerprint(path, size):
+    """Fast hash of the head of the file and a few evenly spaced blocks"""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        h.update(f.read(HEAD_BYTES))
+        if size > HEAD_BYTES:
+            step = (size - HEAD_BYTES) // (SAMPLE_COUNT + 1)
+            for k in range(1, SAMPLE_COUNT + 1):
+                f.seek(HEAD_BYTES + k * step)
+                h.update(f.read(SAMPLE_BYTES))
+            f.seek(max(size - SAMPLE_BYTES, HEAD_BYTES))
+            h.update(f.read(SAMPLE_BYTES))
+    return h.hexdigest()
+
+def full_hash(path):
+    """Hash of the whole file"""
+    h = hashlib.blake2b(digest_size=32)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(BLOCK_BYTES), b''):
+            h.update(block)
+    return h.hexdigest()
+
+def station_day(path):
+    """(station, year, day of year, session) from a standard RINEX file name, or None.
+
+    The session character ('0' for daily files, 'a'-'x' for hourly ones) is
+    part of the key: files of different sessions of a day are not duplicates.
+    """
+    m = STATION_DAY_RE.match(os.path.basename(path))
+    if not m:
+        return None
+    year = int(m.group(4))
+    year = 2000 + year if year < 80 else 1900 + year
+    return m.group(1).upper(), year, int(m.group(2)), m.group(3).upper()
+
+def _group_by(paths, key):
+    groups = defaultdict(list)
+    for path in paths:
+        groups[key(path)].append(path)
+    return [group for group in groups.values() if len(group) > 1]
+
+def find_content_duplicates(paths, sizes):
+    """Groups of files with identical content"""
+    groups = []
+    for same_size in _group_by(paths, sizes.__getitem__):
+        for same_fp in _group_by(same_size, lambda p: fingerprint(p, sizes[p])):
+            groups.extend(_group_by(same_fp, full_hash))
+    return groups
+
+def deduplicate(paths):
+    """Keep one canonical file per content and per station-day.
+
+    Returns ``(kept, duplicates)``; ``kept`` preserves the input order and
+    ``duplicates`` is a list of ``(path, canonical_path, reason)``. Among
+    identical files the first path in sorted order is kept, among different
+    files of the same station, day and session the largest one.
+    """
+    sizes = {}
+    for path in paths:
+        try:
+            sizes[path] = os.path.getsize(path)
+        except OSError as e:
+            print(f"Error reading file {path}: {e}")
+    candidates = [p for p in paths if p in sizes]
+
+    duplicates = []
+    dropped = set()
+    for group in find_content_duplicates(candidates, sizes):
+        canonical, *rest = sorted(group)
+        for path in rest:
+            duplicates.append((path, canonical, 'content'))
+            dropped.add(path)
+
+    remaining = [p for p in candidates if p not in dropped]
+    by_day = defaultdict(list)
+    for path in remaining:
+        key = station_day(path)
+        if key is not None:
+            by_day[key].append(path)
+    for group in by_day.values():
+        if len(group) < 2:
+            continue
+        canonical, *rest = sorted(group, key=lambda p: (-sizes[p], p))
+        for path in rest:
+            duplicates.append((path, canonical, 'station-day'))
+            dropped.add(path)
+
+    kept = [p for p in candidates if p not in dropped]
+    return kept, duplicates
+
+def print_duplicates(duplicates):
+    """Report of the removed duplicates"""
+    reasons = {'content': 'то же содержимое', 'station-day': 'та же станция, день и сессия'}
+    for path, canonical, reason in duplicates:
+        print(f'Дубликат ({reasons[reason]}): {path} -> {canonical}')
+    print(f'Найдено дубликатов: {len(duplicates)}')
@@ -0,0 +1,111 @@
+"""Coordinate conversions for station positions (GRS80/WGS84 ellipsoid).
+
+All functions take whole (N, 3) arrays, so tens of thousands of stations are
+converted in one NumPy call. Distance matrices are built one coordinate at a
+time from differences, which keeps them exact for nearby stations.
+"""
+import numpy as np
+
+A = 6378137.0
+F = 1 / 298.257222101
+E2 = F * (2 - F)
+MEAN_RADIUS = 6371008.8  # IUGG mean Earth radius [m]
+
+def parse_xyz(lines):
+    """(N, 3) positions of APPROX POSITION XYZ lines (zeros for missing or unreadable lines)"""
+    lines = ['' if line == '-' else line for line in lines]
+    raw = np.frombuffer(b''.join(line[:43].ljust(43).encode('ascii', 'replace') for line in lines),
+                        dtype=np.uint8).reshape(len(lines), 43)
+    text = np.stack([np.ascontiguousarray(raw[:, i:i + 13]).view('S13')[:, 0] for i in (2, 16, 30)], axis=1)
+    blank = (np.char.strip(text) == b'').any(axis=1)
+    try:
+        xyz = np.where(blank[:, None], b'0', text).astype(float)
+    except ValueError:  # something else than a number somewhere: parse line by line
+        xyz = np.zeros((len(lines), 3))
+        for i, row in enumerate(text):
+            try:
+                xyz[i] = [float(v) for v in row]
+            except ValueError:
+                blank[i] = True
+    xyz[blank] = 0.0
+    return xyz
+
+def on_surface(xyz):
+    """Mask of positions plausibly on the Earth's surface (not missing or zero)"""
+    radius = np.linalg.norm(np.atleast_2d(xyz), axis=1)
+    return (radius > 6.3e6) & (radius < 6.4e6)
+
+def ecef_to_geodetic(xyz):
+    """(N, 3) ECEF XYZ [m] -> latitude, longitude [deg] and height [m] arrays (Bowring)"""
+    xyz = np.atleast_2d(np.asarray(xyz, dtype=float))
+    x, y, z = xyz[:, 0], xyz[:, 1], xyz[:, 2]
+    b = A * (1 - F)
+    ep2 = (A ** 2 - b ** 2) / b ** 2
+    p = np.hypot(x, y)
+    theta = np.arctan2(z * A, p * b)
+    lat = np.arctan2(z + ep2 * b * np.sin(theta) ** 3, p - E2 * A * np.cos(theta) ** 3)
+    lon = np.arctan2(y, x)
+    n = A / np.sqrt(1 - E2 * np.sin(lat) ** 2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        h = np.where(np.abs(np.cos(lat)) > 1e-12, p / np.cos(lat) - n, np.abs(z) - b)
+    return np.degrees(lat), np.degrees(lon), h
+
+def geodetic_to_ecef(lat, lon, h=0.0):
+    """Latitude, longitude [deg] and height [m] arrays -> (N, 3) ECEF XYZ [m]"""
+    lat, lon = np.radians(np.atleast_1d(lat)), np.radians(np.atleast_1d(lon))
+    h = np.broadcast_to(np.asarray(h, dtype=float), lat.shape)
+    n = A / np.sqrt(1 - E2 * np.sin(lat) ** 2)
+    return np.stack([(n + h) * np.cos(lat) * np.cos(lon),
+                     (n + h) * np.cos(lat) * np.sin(lon),
+                     (n * (1 - E2) + h) * np.sin(lat)], axis=1)
+
+def enu_rotation(lat, lon):
+    """(N, 3, 3) rotations from ECEF differences to local east, north, up"""
+    lat, lon = np.radians(np.atleast_1d(lat)), np.radians(np.atleast_1d(lon))
+    sin_lat, cos_lat, sin_lon, cos_lon = np.sin(lat), np.cos(lat), np.sin(lon), np.cos(lon)
+    zero = np.zeros_like(lat)
+    return np.stack([
+        np.stack([-sin_lon, cos_lon, zero], axis=1),
+        np.stack([-sin_lat * cos_lon, -sin_lat * sin_lon, cos_lat], axis=1),
+        np.stack([cos_lat * cos_lon, cos_lat * sin_lon, sin_lat], axis=1),
+    ], axis=1)
+
+def ecef_to_enu(xyz, origin):
+    """(N, 3) local east, north, up [m] of ECEF positions relative to origins (one, or one per row)"""
+    xyz = np.atleast_2d(np.asarray(xyz, dtype=float))
+    origin = np.atleast_2d(np.asarray(origin, dtype=float))
+    lat, lon, _ = ecef_to_geodetic(origin)
+    return np.einsum('nij,nj->ni', np.broadcast_to(enu_rotation(lat, lon), (len(xyz), 3, 3)), xyz - origin)
+
+def enu_to_ecef(enu, origin):
+    """(N, 3) ECEF positions of local east, north, up offsets [m] from origins (one, or one per row)"""
+    enu = np.atleast_2d(np.asarray(enu, dtype=float))
+    origin = np.atleast_2d(np.asarray(origin, dtype=float))
+    lat, lon, _ = ecef_to_geodetic(origin)
+    return origin + np.einsum('nji,nj->ni', np.broadcast_to(enu_rotation(lat, lon), (len(enu), 3, 3)), enu)
+
+def chord_distances(a, b=None):
+    """(N, M) straight-line distances [m] between ECEF positions (``b`` defaults to ``a``)"""
+    a = np.atleast_2d(np.asarray(a, dtype=float))
+    b = a if b is None else np.atleast_2d(np.asarray(b, dtype=float))
+    squared = np.zeros((len(a), len(b)))
+    for k in range(3):
+        d = np.subtract.outer(a[:, k], b[:, k])
+        d *= d
+        squared += d
+    return np.sqrt(squared, out=squared)
+
+def unit_vectors(xyz):
+    """(N, 3) ellipsoid normals (n-vectors) of ECEF positions"""
+    lat, lon, _ = ecef_to_geodetic(xyz)
+    lat, lon = np.radians(lat), np.radians(lon)
+    return np.stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)], axis=1)
+
+def great_circle_distances(a, b=None, radius=MEAN_RADIUS):
+    """(N, M) great-circle distances [m] between ECEF positions on a sphere of ``radius``"""
+    chords = chord_distances(unit_vectors(a), None if b is None else unit_vectors(b))
+    chords *= 0.5
+    np.minimum(chords, 1.0, out=chords)
+    np.arcsin(chords, out=chords)
+    chords *= 2.0 * radius
+    return chords
@@ -0,0 +1,90 @@
+"""Observation epochs as int64 GPS seconds (seconds since 1980-01-06 00:00:00 GPS).
+
+All conversions take and return whole arrays; Bernese 'YYYY MM DD HH MM SS'
+strings are produced only by ``format_bernese`` at write time. Missing or
+invalid times are ``NO_TIME``.
+"""
+import datetime
+import os
+
+import numpy as np
+
+from .header import STATION_DAY_RE
+
+GPS_EPOCH = np.datetime64('1980-01-06T00:00:00', 's')
+NO_TIME = np.iinfo(np.int64).min
+SECONDS_PER_DAY = 86400
+
+def to_gps_seconds(year, month, day, hour=0, minute=0, second=0):
+    """GPS seconds of calendar dates and times (array-like arguments)"""
+    year = np.asarray(year, dtype=np.int64)
+    months = (year - 1970) * 12 + np.asarray(month, dtype=np.int64) - 1
+    days = months.astype('datetime64[M]').astype('datetime64[D]') + np.asarray(day, dtype=np.int64) - 1
+    seconds = (days.astype('datetime64[s]') - GPS_EPOCH).astype(np.int64)
+    return (seconds + np.asarray(hour, dtype=np.int64) * 3600
+            + np.asarray(minute, dtype=np.int64) * 60 + np.asarray(second, dtype=np.int64))
+
+def from_year_doy(year, doy):
+    """GPS seconds of 00:00:00 of a day of year"""
+    year = np.asarray(year, dtype=np.int64)
+    days = (year - 1970).astype('datetime64[Y]').astype('datetime64[D]') + np.asarray(doy, dtype=np.int64) - 1
+    return (days.astype('datetime64[s]') - GPS_EPOCH).astype(np.int64)
+
+def parse_obs_times(lines):
+    """GPS seconds of TIME OF FIRST/LAST OBS header lines (5I6,F13.7), whole seconds"""
+    fields = np.zeros((len(lines), 6), dtype=np.int64)
+    valid = np.zeros(len(lines), dtype=bool)
+    for i, line in enumerate(lines):
+        values = line[:43].split()
+        try:
+            fields[i, :5] = [int(v) for v in values[:5]]
+            fields[i, 5] = int(float(values[5]))
+            valid[i] = fields[i, 0] > 0 and 1 <= fields[i, 1] <= 12 and 1 <= fields[i, 2] <= 31
+        except (ValueError, IndexError):
+            continue
+    fields[~valid] = (1980, 1, 6, 0, 0, 0)
+    seconds = to_gps_seconds(*fields.T)
+    return np.where(valid, seconds, NO_TIME)
+
+def parse_filename_days(filenames):
+    """GPS seconds of the start of the day encoded in RINEX file names (SSSSDDDF.YYO)"""
+    years = np.zeros(len(filenames), dtype=np.int64)
+    doys = np.ones(len(filenames), dtype=np.int64)
+    valid = np.zeros(len(filenames), dtype=bool)
+    for i, filename in enumerate(filenames):
+        m = STATION_DAY_RE.match(os.path.basename(filename))
+        if m:
+            doy, year = int(m.group(2)), int(m.group(4))
+            if year < 100:
+                year = 2000 + year if year < 80 else 1900 + year
+            years[i], doys[i] = year, doy
+            valid[i] = 1 <= doy <= 366
+    seconds = from_year_doy(np.where(valid, years, 1980), np.where(valid, doys, 6))
+    return np.where(valid, seconds, NO_TIME)
+
+def to_datetime64(seconds):
+    """datetime64[s] of GPS seconds (NaT for NO_TIME)"""
+    seconds = np.asarray(seconds, dtype=np.int64)
+    result = GPS_EPOCH + seconds.astype('timedelta64[s]')
+    return np.where(seconds == NO_TIME, np.datetime64('NaT'), result)
+
+def to_datetime(seconds):
+    """datetime.datetime of one GPS second value"""
+    return datetime.datetime(1980, 1, 6) + datetime.timedelta(seconds=int(seconds))
+
+def from_datetime(dt):
+    """GPS seconds of a datetime.datetime"""
+    return int((dt - datetime.datetime(1980, 1, 6)).total_seconds())
+
+def format_bernese(seconds):
+    """'YYYY MM DD HH MM SS' strings of GPS seconds ('0000 00 00 00 00 00' for NO_TIME)"""
+    seconds = np.atleast_1d(np.asarray(seconds, dtype=np.int64))
+    text = np.datetime_as_string(to_datetime64(seconds), unit='s')
+    return ['0000 00 00 00 00 00' if s == NO_TIME else
+            f'{t[0:4]} {t[5:7]} {t[8:10]} {t[11:13]} {t[14:16]} {t[17:19]}'
+            for s, t in zip(seconds.tolist(), text.tolist())]
+
+def format_date(seconds):
+    """'YYYY-MM-DD' strings of GPS seconds"""
+    seconds = np.atleast_1d(np.asarray(seconds, dtype=np.int64))
+    return np.datetime_as_string(to_datetime64(seconds), unit='D').tolist()
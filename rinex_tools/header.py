@@ -0,0 +1,140 @@
+import os
+import re
+
+# Constants
+INPUT_DIR = '2025_05_22-Задание на практику/Образец/input'
+OUTPUT_DIR = '2025_05_22-Задание на практику'
+RINEX_EXTENSIONS = ('O', 'o')
+
+# SSSSDDDF.YYO: station, day of year, session, year
+STATION_DAY_RE = re.compile(r'^(\w{4})(\d{3})(\w)\.(\d{2})[Oo]$')
+
+# Header fields to search for
+HEADER_FIELDS = [
+    'MARKER NAME',
+    'MARKER NUMBER',
+    'REC # / TYPE / VERS',
+    'ANT # / TYPE',
+    'APPROX POSITION XYZ',
+    'ANTENNA: DELTA H/E/N',
+]
+
+class StationInfo:
+    def __init__(self, marker_name, marker_number, receiver, antenna, xyz, delta_hen, filename, header):
+        self.marker_name = marker_name
+        self.marker_number = marker_number
+        self.receiver = receiver
+        self.antenna = antenna
+        self.xyz = xyz
+        self.delta_hen = delta_hen
+        self.filename = filename
+        self.header = header
+        self.mtime = None  # modification time of the file, when known
+        self.path = None   # full path of the file, when known
+
+def iter_rinex_files(input_dir):
+    """Yield the RINEX files of the input directory in sorted path order, without listing them all.
+
+    Each directory is read once; its files and subdirectories are visited in
+    the order their full paths sort in (a subdirectory 'c' sorts as 'c/').
+    """
+    try:
+        entries = sorted(os.scandir(input_dir), key=lambda e: e.name + ('/' if e.is_dir() else ''))
+    except OSError:
+        return
+    for entry in entries:
+        if entry.is_dir():
+            if not entry.is_symlink():  # like os.walk
+                yield from iter_rinex_files(entry.path)
+        elif entry.name.endswith(RINEX_EXTENSIONS):
+            yield entry.path
+
+def find_rinex_files(input_dir):
+    """Find all RINEX files in the input directory, in sorted path order"""
+    return list(iter_rinex_files(input_dir))
+
+def parse_rinex_header(filepath):
+    """Parse RINEX header"""
+    header = {}
+    try:
+        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+            for line in f:
+                if 'END OF HEADER' in line:
+                    break
+                for field in HEADER_FIELDS:
+                    if field in line:
+                        header[field] = line.rstrip('\n')
+                        break
+                if 'TIME OF FIRST OBS' in line:
+                    header['TIME OF FIRST OBS'] = line.rstrip('\n')
+                if 'TIME OF LAST OBS' in line:
+                    header['TIME OF LAST OBS'] = line.rstrip('\n')
+    except Exception as e:
+        print(f"Error reading file {filepath}: {e}")
+    return header
+
+def extract_obs_time(line):
+    """Extract time from TIME OF FIRST/LAST OBS line"""
+    if not line:
+        return '0000 00 00 00 00 00'
+    try:
+        # 5I6,F13.7: year, month, day, hour, minute, seconds
+        year, month, day, hour, minute = (int(line[i:i + 6]) for i in range(0, 30, 6))
+        second = int(float(line[30:43]))
+        return f"{year:04d} {month:02d} {day:02d} {hour:02d} {minute:02d} {second:02d}"
+    except Exception:
+        return '0000 00 00 00 00 00'
+
+def extract_station_info(header, filename):
+    """Extract station information from header"""
+    marker_name = header.get('MARKER NAME', '-')
+    marker_number = header.get('MARKER NUMBER', '-')
+    receiver = header.get('REC # / TYPE / VERS', '-')
+    antenna = header.get('ANT # / TYPE', '-')
+    xyz = header.get('APPROX POSITION XYZ', '-')
+    delta_hen = header.get('ANTENNA: DELTA H/E/N', '-')
+
+    # Ensure marker number is exactly 9 characters
+    if marker_number != '-':
+        marker_number = marker_number[:9].ljust(9)
+
+    # Special handling for AAC4 station (rinex-tools normalize writes it into the file)
+    if marker_name.strip() == 'AAC4':
+        marker_number = 'AACH'.ljust(9)
+
+    return StationInfo(marker_name, marker_number, receiver, antenna, xyz, delta_hen, filename, header)
+
+def get_station_id(station):
+    """Station ID in format: NAME + NUMBER (first 4 chars of name + first 9 chars of number)"""
+    return f"{station.marker_name[:4].strip()}{station.marker_number[:9].strip()}"
+
+def unique_stations(stations):
+    """Keep the first record of every station ID, preserving order"""
+    seen_stations = set()
+    result = []
+    for station in stations:
+        station_id = get_station_id(station)
+        if station_id not in seen_stations:
+            seen_stations.add(station_id)
+            result.append(station)
+    return result
+
+def iter_stations(files):
+    """Parse the header of each RINEX file, yielding one StationInfo at a time"""
+    for file in files:
+        try:
+            header = parse_rinex_header(file)
+            station = extract_station_info(header, os.path.basename(file))
+            station.mtime = os.path.getmtime(file)
+            station.path = file
+            yield station
+        except Exception as e:
+            print(f'Ошибка при обработке файла {file}: {str(e)}')
+
+def parse_stations(files):
+    """Parse the header of each RINEX file"""
+    return list(iter_stations(files))
+
+def load_stations(input_dir=INPUT_DIR):
+    """Find RINEX files and parse the header of each one"""
+    return parse_stations(find_rinex_files(input_dir))
@@ -0,0 +1,65 @@
+"""Bucketed k-d tree for nearest-neighbour queries on station positions.
+
+Points are split at the median of their widest axis until at most
+``LEAF_SIZE`` remain in a leaf. All k nearest neighbours are found leaf by
+leaf: the distances from the points of a leaf are computed in one NumPy call
+to the points of the leaves whose boxes can hold a closer neighbour, so work
+grows with N * (points of nearby leaves) instead of N * N.
+"""
+import numpy as np
+
+from .geodesy import chord_distances
+
+LEAF_SIZE = 32
+
+class KDTree:
+    """k-d tree over (N, 3) points"""
+    def __init__(self, points, leaf_size=LEAF_SIZE):
+        self.points = np.asarray(points, dtype=float).reshape(-1, 3)
+        self.leaves = []  # index arrays
+        self._split(np.arange(len(self.points)), leaf_size)
+        boxes = [(self.points[idx].min(axis=0), self.points[idx].max(axis=0)) for idx in self.leaves]
+        self.lo = np.array([lo for lo, _ in boxes]).reshape(-1, 3)
+        self.hi = np.array([hi for _, hi in boxes]).reshape(-1, 3)
+
+    def _split(self, indices, leaf_size):
+        stack = [indices] if len(indices) else []
+        while stack:
+            idx = stack.pop()
+            if len(idx) <= leaf_size:
+                self.leaves.append(idx)
+                continue
+            values = self.points[idx]
+            axis = int(np.argmax(values.max(axis=0) - values.min(axis=0)))
+            half = len(idx) // 2
+            order = np.argpartition(values[:, axis], half)
+            stack.extend((idx[order[half:]], idx[order[:half]]))
+
+    def box_distances(self, leaf):
+        """Smallest possible distance from the box of a leaf to the box of every leaf"""
+        gap = np.maximum(0.0, np.maximum(self.lo - self.hi[leaf], self.lo[leaf] - self.hi))
+        return np.linalg.norm(gap, axis=1)
+
+    def query(self, k):
+        """(distances, indices) (N, k) of the k nearest other points of every point, nearest first"""
+        n = len(self.points)
+        k = min(k, n - 1)
+        distances = np.full((n, max(k, 0)), np.inf)
+        indices = np.full((n, max(k, 0)), -1, dtype=np.int64)
+        if k <= 0:
+            return distances, indices
+        sizes = np.array([len(idx) for idx in self.leaves])
+        for leaf, own in enumerate(self.leaves):
+            box = self.box_distances(leaf)
+            order = np.argsort(box, kind='stable')
+            # The nearest leaves holding k + 1 points bound the k-th neighbour distance
+            enough = int(np.searchsorted(np.cumsum(sizes[order]), k + 1)) + 1
+            first = np.concatenate([self.leaves[j] for j in order[:enough]])
+            bound = np.sort(chord_distances(self.points[own], self.points[first]), axis=1)[:, k].max()
+            candidates = np.concatenate([self.leaves[j] for j in order[box[order] <= bound]])
+            d = chord_distances(self.points[own], self.points[candidates])
+            d[candidates[None, :] == own[:, None]] = np.inf  # not the point itself
+            nearest = np.argsort(d, axis=1, kind='stable')[:, :k]
+            distances[own] = np.take_along_axis(d, nearest, axis=1)
+            indices[own] = candidates[nearest]
+        return distances, indices
@@ -0,0 +1,131 @@
+"""Station metadata fixes written into the RINEX headers themselves.
+
+A rules table (CSV) gives the corrected header values of a station::
+
+    station,start,end,marker_name,marker_number,receiver_serial,receiver_type,receiver_version,antenna_serial,antenna_type,radome
+
+Empty cells keep the value of the file; ``start``/``end`` limit a rule to the
+files observed in that interval. The MARKER NAME, MARKER NUMBER,
+REC # / TYPE / VERS and ANT # / TYPE lines are rewritten in their standard
+columns. When the new header has the same length in bytes as the old one, it
+is written over the old one in place and the body is not touched; otherwise
+the body is copied in blocks behind the new header into a temporary file that
+replaces the original.
+"""
+import csv
+import datetime
+import os
+import shutil
+
+from .catalog import OPEN_END, parse_catalog_date, split_antenna
+from .obsstream import header_label, header_line
+
+RULE_FIELDS = ('marker_name', 'marker_number', 'receiver_serial', 'receiver_type', 'receiver_version',
+               'antenna_serial', 'antenna_type', 'radome')
+BLOCK_SIZE = 1 << 20
+
+# Fixes that used to be applied only when reading the headers
+DEFAULT_RULES = [
+    {'station': 'AAC4', 'start': datetime.datetime.min, 'end': OPEN_END, 'marker_number': 'AACH'},
+]
+
+def load_rules(path=None):
+    """Rules of the CSV table, after the default rules: list of dicts with the non-empty fields"""
+    rules = [dict(rule) for rule in DEFAULT_RULES]
+    if path is None:
+        return rules
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            rule = {'station': row['station'].strip()[:4].upper(),
+                    'start': parse_catalog_date(row.get('start') or '') or datetime.datetime.min,
+                    'end': parse_catalog_date(row.get('end') or '') or OPEN_END}
+            rule.update((k, row[k].strip()) for k in RULE_FIELDS if (row.get(k) or '').strip())
+            rules.append(rule)
+    return rules
+
+def matching_rules(rules, station, epoch):
+    """Rules of a station valid at ``epoch``, in table order (later rules win)"""
+    return [rule for rule in rules if rule['station'] == station and rule['start'] <= epoch < rule['end']]
+
+def read_raw_header(f):
+    """Header lines of a binary file (latin-1, line endings kept) up to and including END OF HEADER"""
+    lines = []
+    for raw in f:
+        lines.append(raw.decode('latin-1'))
+        if header_label(raw.decode('latin-1').rstrip('\r\n')) == 'END OF HEADER':
+            return lines
+    raise ValueError('нет строки END OF HEADER')
+
+def apply_rules(lines, rules):
+    """Header lines with the rule values written into the metadata lines"""
+    values = {}
+    for rule in rules:
+        values.update((k, v) for k, v in rule.items() if k in RULE_FIELDS)
+    if not values:
+        return lines
+    newline = '\r\n' if lines[0].endswith('\r\n') else '\n'
+    result = []
+    for raw in lines:
+        line = raw.rstrip('\r\n').ljust(80)
+        label = header_label(line)
+        if label == 'MARKER NAME' and 'marker_name' in values:
+            line = header_line(values['marker_name'].ljust(60), label)
+        elif label == 'MARKER NUMBER' and 'marker_number' in values:
+            line = header_line(values['marker_number'].ljust(20), label)
+        elif label == 'REC # / TYPE / VERS' and values.keys() & {'receiver_serial', 'receiver_type',
+                                                                  'receiver_version'}:
+            fields = [values.get(k, line[i:i + 20].strip()) for k, i in
+                      (('receiver_serial', 0), ('receiver_type', 20), ('receiver_version', 40))]
+            line = header_line(''.join(f'{v[:20]:<20}' for v in fields), label)
+        elif label == 'ANT # / TYPE' and values.keys() & {'antenna_serial', 'antenna_type', 'radome'}:
+            ant_type, radome = split_antenna(line[20:40])
+            ant_type = values.get('antenna_type', ant_type)
+            radome = values.get('radome', radome)
+            serial = values.get('antenna_serial', line[0:20].strip())
+            line = header_line(f'{serial[:20]:<20}{ant_type[:16]:<16}{radome[:4]:<4}', label)
+        else:
+            result.append(raw)
+            continue
+        result.append(line + newline)
+    if 'marker_number' in values and not any(header_label(l.rstrip('\r\n')) == 'MARKER NUMBER' for l in result):
+        i = next((i + 1 for i, l in enumerate(result) if header_label(l.rstrip('\r\n')) == 'MARKER NAME'),
+                 len(result) - 1)
+        result.insert(i, header_line(values['marker_number'].ljust(20), 'MARKER NUMBER') + newline)
+    return result
+
+def file_station(lines, path):
+    """Station (marker name, else file name) and observation start of a header"""
+    from .header import extract_station_info
+    from .sta import file_epoch
+    header = {header_label(l.rstrip('\r\n')): l.rstrip('\r\n') for l in lines}
+    station = extract_station_info(header, os.path.basename(path))
+    name = station.marker_name[:4].strip() if station.marker_name != '-' else ''
+    return (name or os.path.basename(path)[:4]).upper(), file_epoch(station)
+
+def normalize_file(path, rules, dry_run=False):
+    """Apply the rules to one file; returns None (unchanged), 'in place' or 'copied'"""
+    with open(path, 'rb') as f:
+        lines = read_raw_header(f)
+        station, epoch = file_station(lines, path)
+        new_lines = apply_rules(lines, matching_rules(rules, station, epoch))
+        if new_lines == lines:
+            return None
+        old = ''.join(lines).encode('latin-1')
+        new = ''.join(new_lines).encode('latin-1', 'replace')
+        if len(new) == len(old):
+            if not dry_run:
+                with open(path, 'r+b') as out:
+                    out.write(new)
+            return 'in place'
+        if not dry_run:
+            tmp_path = path + '.tmp'
+            try:
+                with open(tmp_path, 'wb') as out:
+                    out.write(new)
+                    shutil.copyfileobj(f, out, BLOCK_SIZE)
+                shutil.copymode(path, tmp_path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+            os.replace(tmp_path, path)
+        return 'copied'
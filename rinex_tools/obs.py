@@ -0,0 +1,269 @@
+"""RINEX 2 and 3 observation bodies as NumPy arrays.
+
+Observation records are copied into one fixed-width byte buffer (80
+characters per record line, 16 per observation) and all F14.3 values, loss
+of lock and signal strength flags are converted by NumPy in one pass.
+Python only walks the epoch lines.
+
+RINEX 3 files list observation codes per satellite system (``SYS / # / OBS
+TYPES``) and have one line per satellite. The body is read line by line; the
+records of each system go to a buffer of that system's width and are
+converted per system in one pass. The arrays of both versions have the same
+layout: the types of a RINEX 3 file are the union of the codes of all systems
+(NaN for satellites of a system without the code), and RINEX 2 names such as
+``P2`` or ``L1`` select the best code of each system, so QC and positioning
+read both versions the same way.
+"""
+import numpy as np
+
+from .gpstime import to_gps_seconds
+
+FIELD = 16
+PER_LINE = 5
+
+# Tracking attributes tried for a RINEX 2 name, best first ('P1' is C1P/C1W/C1Y)
+CODE_ATTRIBUTES = {'C': 'CSLXIQBDZAE', 'P': 'PWY'}
+OTHER_ATTRIBUTES = 'CPWYSLXIQBDZAEMN'
+
+class Observations:
+    """Observations of one file: ``values[epoch, satellite, type]`` (NaN when missing)"""
+    def __init__(self, epochs, satellites, obs_types, values, lli, ssi, interval=None, filename='',
+                 system_types=None):
+        self.epochs = epochs            # int64 GPS seconds
+        self.satellites = satellites    # ['G05', 'R12', ...]
+        self.obs_types = obs_types      # ['L1', 'L2', 'C1', ...] or RINEX 3 codes ['C1C', 'L1C', ...]
+        self.values = values
+        self.lli = lli
+        self.ssi = ssi
+        self.interval = interval
+        self.filename = filename
+        self.system_types = system_types  # RINEX 3: {'G': ['C1C', ...], ...}, None for RINEX 2
+
+    def type_index(self, obs_type):
+        """Type index of an observable for each satellite (-1 where missing), None if there is none"""
+        if obs_type in self.obs_types:
+            return np.full(len(self.satellites), self.obs_types.index(obs_type))
+        if self.system_types is None or len(obs_type) != 2:
+            return None
+        attributes = CODE_ATTRIBUTES.get(obs_type[0], OTHER_ATTRIBUTES)
+        kind = 'C' if obs_type[0] == 'P' else obs_type[0]
+        best = {}
+        for system, types in self.system_types.items():
+            codes = [f'{kind}{obs_type[1]}{a}' for a in attributes if f'{kind}{obs_type[1]}{a}' in types]
+            if codes:
+                best[system] = self.obs_types.index(codes[0])
+        if not best:
+            return None
+        return np.array([best.get(sat[0], -1) for sat in self.satellites], dtype=np.int64)
+
+    def _select(self, array, obs_type, missing):
+        index = self.type_index(obs_type)
+        if index is None:
+            return None
+        if len(index) and index[0] >= 0 and (index == index[0]).all():
+            return array[:, :, index[0]]
+        selected = array[:, np.arange(len(index)), np.maximum(index, 0)]
+        selected[:, index < 0] = missing
+        return selected
+
+    def get(self, obs_type):
+        """(epochs, satellites) array of one observable, None if the file has none"""
+        return self._select(self.values, obs_type, np.nan)
+
+    def get_lli(self, obs_type):
+        return self._select(self.lli, obs_type, 0)
+
+    def system(self, system):
+        """Observations of one satellite system ('G', 'R', ...)"""
+        keep = [i for i, sat in enumerate(self.satellites) if sat[0] == system]
+        system_types = None
+        if self.system_types is not None:
+            system_types = {system: self.system_types[system]} if system in self.system_types else {}
+        return Observations(self.epochs, [self.satellites[i] for i in keep], self.obs_types,
+                            self.values[:, keep], self.lli[:, keep], self.ssi[:, keep],
+                            self.interval, self.filename, system_types)
+
+def satellite_id(text):
+    """'G 5' / ' 5' / 'G05' -> 'G05' (blank system is GPS)"""
+    system = text[0] if text[0] != ' ' else 'G'
+    return f'{system}{int(text[1:3]):02d}'
+
+def read_header(f):
+    """RINEX version, observation types, interval and RINEX 3 types per system of an open file.
+
+    Reads up to END OF HEADER. The types of a RINEX 3 file are the union of
+    the codes of all systems, in header order.
+    """
+    version, obs_types, interval, system_types = 2.0, [], None, {}
+    system = None
+    for line in f:
+        label = line[60:80].strip()
+        if label == 'RINEX VERSION / TYPE':
+            try:
+                version = float(line[:9])
+            except ValueError:
+                pass
+        elif label == '# / TYPES OF OBSERV':
+            obs_types.extend(line[6:60].split())
+        elif label == 'SYS / # / OBS TYPES':
+            if line[0] != ' ':
+                system = line[0]
+            if system is not None:
+                codes = system_types.setdefault(system, [])
+                codes.extend(line[7:60].split())
+                obs_types.extend(code for code in line[7:60].split() if code not in obs_types)
+        elif label == 'INTERVAL':
+            interval = float(line[:10])
+        elif label == 'END OF HEADER':
+            break
+    return version, obs_types, interval, (system_types if version >= 3 else None)
+
+def parse_fields(buffer, n_records, n_types, width):
+    """Values, LLI and SSI arrays of records stored ``width`` bytes apart"""
+    raw = np.frombuffer(buffer, dtype=np.uint8).reshape(n_records, width // FIELD, FIELD)[:, :n_types]
+    text = np.ascontiguousarray(raw[:, :, :14])
+    blank = (text == 32).all(axis=2)
+    text[blank] = np.frombuffer(b'           nan', dtype=np.uint8)
+    values = text.view('S14').reshape(n_records, n_types).astype(np.float64)
+    flags = raw[:, :, 14:16]
+    flags = np.where((flags >= 48) & (flags <= 57), flags - 48, 0).astype(np.int8)
+    return values, flags[:, :, 0], flags[:, :, 1]
+
+def satellite_columns(sat_index):
+    """Sorted satellite IDs and the column of each satellite in the order of ``sat_index``"""
+    satellites = sorted(sat_index)
+    order = np.argsort(list(sat_index))
+    column = np.empty(len(sat_index), dtype=np.int64)
+    column[order] = np.arange(len(order))
+    return satellites, column
+
+def epoch_seconds(epoch_fields):
+    """GPS seconds of [year, month, day, hour, minute, second] rows (2- or 4-digit years)"""
+    if not epoch_fields:
+        return np.zeros(0, dtype=np.int64)
+    t = np.array(epoch_fields)
+    year = t[:, 0].astype(np.int64)
+    year = np.where(year < 80, year + 2000, np.where(year < 100, year + 1900, year))
+    seconds = np.round(t[:, 5]).astype(np.int64)
+    return to_gps_seconds(year, t[:, 1], t[:, 2], t[:, 3], t[:, 4], seconds)
+
+def read_observations(path):
+    """Observations of a RINEX 2 or 3 observation file"""
+    with open(path, 'r', encoding='ascii', errors='replace') as f:
+        version, obs_types, interval, system_types = read_header(f)
+        if version >= 3:
+            return read_body3(f, obs_types, interval, system_types, path)
+        lines = f.read().splitlines()
+    return read_body2(lines, obs_types, interval, path)
+
+def read_body2(lines, obs_types, interval, path):
+    """Observations of the body lines of a RINEX 2 file"""
+    n_types = len(obs_types)
+    lines_per_record = max(1, -(-n_types // PER_LINE))
+    width = lines_per_record * PER_LINE * FIELD
+    epoch_fields, record_epoch, record_sat, chunks = [], [], [], []
+    sat_index = {}
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        i += 1
+        if len(line) < 32 or not line[28:29].isdigit():
+            continue
+        flag = int(line[28])
+        n_sat = int(line[29:32])
+        if flag > 1 and flag != 6:
+            i += n_sat  # event records (header lines)
+            continue
+        sats = line[32:68].ljust(36)
+        while len(sats) < 3 * n_sat and i < len(lines):  # 12 satellites per line
+            sats += lines[i][32:68].ljust(36)
+            i += 1
+        if flag == 6:  # cycle slip records, same layout
+            i += n_sat * lines_per_record
+            continue
+        try:
+            fields = [int(line[0:3]), int(line[3:6]), int(line[6:9]), int(line[9:12]),
+                      int(line[12:15]), float(line[15:26])]
+        except ValueError:
+            continue
+        epoch = len(epoch_fields)
+        epoch_fields.append(fields)
+        for k in range(n_sat):
+            sat = satellite_id(sats[3 * k:3 * k + 3])
+            record_epoch.append(epoch)
+            record_sat.append(sat_index.setdefault(sat, len(sat_index)))
+            for j in range(lines_per_record):
+                chunks.append(lines[i + j][:80].ljust(80) if i + j < len(lines) else ' ' * 80)
+            i += lines_per_record
+
+    satellites, column = satellite_columns(sat_index)
+    n_epochs = len(epoch_fields)
+    values = np.full((n_epochs, len(satellites), n_types), np.nan)
+    lli = np.zeros((n_epochs, len(satellites), n_types), dtype=np.int8)
+    ssi = np.zeros((n_epochs, len(satellites), n_types), dtype=np.int8)
+    if chunks:
+        record_values, record_lli, record_ssi = parse_fields(
+            ''.join(chunks).encode('ascii', 'replace'), len(record_epoch), n_types, width)
+        rows = np.array(record_epoch)
+        cols = column[np.array(record_sat)]
+        values[rows, cols] = record_values
+        lli[rows, cols] = record_lli
+        ssi[rows, cols] = record_ssi
+
+    return Observations(epoch_seconds(epoch_fields), satellites, obs_types, values, lli, ssi, interval, path)
+
+def read_body3(f, obs_types, interval, system_types, path):
+    """Observations of the body of a RINEX 3 file, read line by line from ``f``"""
+    widths = {system: len(types) * FIELD for system, types in system_types.items() if types}
+    chunks = {system: [] for system in widths}
+    record_epoch = {system: [] for system in widths}
+    record_sat = {system: [] for system in widths}
+    epoch_fields, sat_index = [], {}
+    for line in f:
+        if line[:1] != '>':
+            continue
+        flag = int(line[31]) if line[31:32].isdigit() else 0
+        try:
+            n_sat = int(line[32:35])
+        except ValueError:
+            continue
+        if flag > 1:  # events (header lines) and cycle slip records
+            for _ in range(n_sat):
+                next(f, '')
+            continue
+        try:
+            fields = [int(line[2:6]), int(line[7:9]), int(line[10:12]), int(line[13:15]),
+                      int(line[16:18]), float(line[18:29])]
+        except ValueError:
+            continue
+        epoch = len(epoch_fields)
+        epoch_fields.append(fields)
+        for _ in range(n_sat):
+            record = next(f, '')
+            system = record[:1]
+            if system not in widths:
+                continue
+            width = widths[system]
+            chunks[system].append(record[3:3 + width].rstrip('\r\n').ljust(width))
+            record_epoch[system].append(epoch)
+            record_sat[system].append(sat_index.setdefault(satellite_id(record[:3]), len(sat_index)))
+
+    satellites, column = satellite_columns(sat_index)
+    shape = (len(epoch_fields), len(satellites), len(obs_types))
+    values = np.full(shape, np.nan)
+    lli = np.zeros(shape, dtype=np.int8)
+    ssi = np.zeros(shape, dtype=np.int8)
+    for system, width in widths.items():
+        if not chunks[system]:
+            continue
+        types = system_types[system]
+        record_values, record_lli, record_ssi = parse_fields(
+            ''.join(chunks[system]).encode('ascii', 'replace'), len(chunks[system]), len(types), width)
+        rows = np.array(record_epoch[system])[:, None]
+        cols = column[np.array(record_sat[system])][:, None]
+        type_cols = np.array([obs_types.index(code) for code in types])[None, :]
+        values[rows, cols, type_cols] = record_values
+        lli[rows, cols, type_cols] = record_lli
+        ssi[rows, cols, type_cols] = record_ssi
+    return Observations(epoch_seconds(epoch_fields), satellites, obs_types, values, lli, ssi, interval, path,
+                        system_types)
@@ -0,0 +1,200 @@
+"""Line-level streaming of RINEX 2 observation files.
+
+Epochs are read and written one at a time, so rewriting tools use constant
+memory whatever the file size. Each satellite record is kept as one string of
+80-character lines (16 characters per observation), so observables can be
+selected by slicing without converting any values.
+"""
+import os
+
+FIELD = 16
+LINE = 80
+PER_LINE = LINE // FIELD
+
+class Epoch:
+    """One epoch: epoch line fields and the records that follow it"""
+    __slots__ = ('time_text', 'flag', 'satellites', 'clock', 'records', 'lines')
+
+    def __init__(self, time_text, flag, satellites=(), clock='', records=(), lines=()):
+        self.time_text = time_text          # ' yy mm dd hh mm ss.sssssss'
+        self.flag = flag
+        self.satellites = list(satellites)  # 3-character IDs as in the file ('G 5', 'R12')
+        self.clock = clock                  # receiver clock offset field, may be blank
+        self.records = list(records)        # one record string per satellite (flags 0, 1, 6)
+        self.lines = list(lines)            # header lines of event epochs (flags 2-5)
+
+    def time_fields(self):
+        """(year, month, day, hour, minute, second) with a 4-digit year"""
+        t = self.time_text
+        year = int(t[0:3])
+        year += 2000 if year < 80 else 1900 if year < 100 else 0
+        return year, int(t[3:6]), int(t[6:9]), int(t[9:12]), int(t[12:15]), float(t[15:26])
+
+    def second_of_day(self):
+        _, _, _, hour, minute, second = self.time_fields()
+        return hour * 3600 + minute * 60 + second
+
+    def day(self):
+        """(year, day of year) of the epoch"""
+        import datetime
+        year, month, day = self.time_fields()[:3]
+        return year, datetime.date(year, month, day).timetuple().tm_yday
+
+    def has_time(self):
+        return bool(self.time_text.strip())
+
+def header_label(line):
+    return line[60:80].strip()
+
+def header_line(content, label):
+    """Header line with the content in columns 1-60 and the label in 61-80"""
+    return f'{content[:60]:<60}{label}'
+
+def read_header(f):
+    """Header lines of an open file up to and including END OF HEADER (without newlines)"""
+    lines = []
+    for line in f:
+        lines.append(line.rstrip('\r\n'))
+        if header_label(line) == 'END OF HEADER':
+            break
+    return lines
+
+def check_version(header):
+    """ValueError unless the header is of a RINEX 2 file (the only layout streamed here)"""
+    version = next((line[:9].strip() for line in header if header_label(line) == 'RINEX VERSION / TYPE'), '')
+    try:
+        major = int(float(version))
+    except ValueError:
+        raise ValueError('нет версии RINEX в заголовке') from None
+    if major != 2:
+        raise ValueError(f'RINEX {version} не поддерживается, только RINEX 2')
+
+def obs_types(header):
+    """Observation types of the header lines"""
+    types = []
+    for line in header:
+        if header_label(line) == '# / TYPES OF OBSERV':
+            types.extend(line[6:60].split())
+    return types
+
+def format_obs_types(types):
+    """'# / TYPES OF OBSERV' lines, 9 types per line"""
+    lines = []
+    for i in range(0, max(len(types), 1), 9):
+        count = f'{len(types):6d}' if i == 0 else ' ' * 6
+        lines.append(header_line(count + ''.join(f'{t:>6}' for t in types[i:i + 9]), '# / TYPES OF OBSERV'))
+    return lines
+
+def format_time_line(fields, label, system='GPS'):
+    """TIME OF FIRST/LAST OBS line"""
+    year, month, day, hour, minute, second = fields
+    return header_line(f'{year:6d}{month:6d}{day:6d}{hour:6d}{minute:6d}{second:13.7f}     {system:<3}', label)
+
+def time_system(header):
+    """Time system of the TIME OF FIRST OBS line ('GPS' when blank)"""
+    for line in header:
+        if header_label(line) == 'TIME OF FIRST OBS':
+            return line[48:51].strip() or 'GPS'
+    return 'GPS'
+
+def set_header(header, label, new_lines):
+    """Replace the lines of a label (inserted before END OF HEADER if missing)"""
+    result, done = [], False
+    for line in header:
+        if header_label(line) == label:
+            if not done:
+                result.extend(new_lines)
+                done = True
+            continue
+        if header_label(line) == 'END OF HEADER' and not done:
+            result.extend(new_lines)
+            done = True
+        result.append(line)
+    return result
+
+def remove_header(header, *labels):
+    return [line for line in header if header_label(line) not in labels]
+
+def lines_per_record(n_types):
+    return max(1, -(-n_types // PER_LINE))
+
+def iter_epochs(f, n_types):
+    """Yield the epochs of an open file positioned after the header"""
+    per_record = lines_per_record(n_types)
+    for line in f:
+        line = line.rstrip('\r\n')
+        if len(line) < 32 or not line[28:29].isdigit():
+            continue
+        flag = int(line[28])
+        count = int(line[29:32])
+        if 2 <= flag <= 5:
+            yield Epoch(line[:26], flag, lines=[next(f, '').rstrip('\r\n') for _ in range(count)])
+            continue
+        sats = line[32:68].ljust(36)
+        while len(sats) < 3 * count:
+            sats += next(f, '').rstrip('\r\n')[32:68].ljust(36)
+        records = []
+        for _ in range(count):
+            records.append(''.join(next(f, '').rstrip('\r\n')[:LINE].ljust(LINE) for _ in range(per_record)))
+        yield Epoch(line[:26], flag, [sats[3 * k:3 * k + 3] for k in range(count)], line[68:80], records)
+
+def select_fields(record, keep):
+    """Record with only the observations at the given indices (blank where an index is None)"""
+    fields = ''.join(record[FIELD * k:FIELD * k + FIELD] if k is not None else ' ' * FIELD for k in keep)
+    return fields.ljust(lines_per_record(len(keep)) * LINE)
+
+def format_epoch(epoch):
+    """Lines of an epoch"""
+    if 2 <= epoch.flag <= 5:
+        return [f'{epoch.time_text:<26}{epoch.flag:3d}{len(epoch.lines):3d}'.rstrip()] + epoch.lines
+    sats = ''.join(epoch.satellites)
+    lines = [f'{epoch.time_text}{epoch.flag:3d}{len(epoch.satellites):3d}{sats[:36]:<36}{epoch.clock}'.rstrip()]
+    lines.extend((' ' * 32 + sats[i:i + 36]).rstrip() for i in range(36, len(sats), 36))
+    for record in epoch.records:
+        lines.extend(record[i:i + LINE].rstrip() for i in range(0, len(record), LINE))
+    return lines
+
+class ObsWriter:
+    """Write a RINEX 2 file through a temporary name; TIME OF FIRST/LAST OBS are patched at close"""
+    def __init__(self, path, header):
+        self.path = path
+        self.tmp_path = path + '.tmp'
+        self.system = time_system(header)
+        self.first = self.last = None
+        self.offsets = {}
+        header = set_header(header, 'TIME OF FIRST OBS', [format_time_line((0, 0, 0, 0, 0, 0.0), 'TIME OF FIRST OBS')])
+        header = set_header(header, 'TIME OF LAST OBS', [format_time_line((0, 0, 0, 0, 0, 0.0), 'TIME OF LAST OBS')])
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.f = open(self.tmp_path, 'wb')
+        for line in header:
+            if header_label(line) in ('TIME OF FIRST OBS', 'TIME OF LAST OBS'):
+                self.offsets[header_label(line)] = self.f.tell()
+            self.f.write(line.encode('ascii', 'replace') + b'\n')
+
+    def write(self, epoch):
+        if epoch.flag in (0, 1) and epoch.has_time():
+            if self.first is None:
+                self.first = epoch.time_fields()
+            self.last = epoch.time_fields()
+        self.f.write(('\n'.join(format_epoch(epoch)) + '\n').encode('ascii', 'replace'))
+
+    def close(self):
+        for label, fields in (('TIME OF FIRST OBS', self.first), ('TIME OF LAST OBS', self.last)):
+            if fields is not None:
+                self.f.seek(self.offsets[label])
+                self.f.write(format_time_line(fields, label, self.system).encode('ascii'))
+        self.f.close()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        self.f.close()
+        os.remove(self.tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
@@ -0,0 +1,178 @@
+"""Automatic tectonic plate assignment of stations.
+
+Plate outlines are read from Bird's PB2002 model (``PB2002_plates.dig``, the
+file of the original distribution, not shipped with the package; its path is
+given with ``--plates``). PB2002 plates are reported under
+the NUVEL-1A plate names used by Bernese (``EURA``, ``AUST``, ...); microplates
+map to the major plate around them, whose NNR-NUVEL-1A pole gives the VEL
+velocities.
+
+Polygons are registered in a grid of ``CELL_DEG`` cells by bounding box, so
+each station is tested only against the few plates of its cell, and the
+point-in-polygon test runs in NumPy over all stations of a plate at once.
+"""
+import math
+import os
+from collections import defaultdict
+
+import numpy as np
+
+CELL_DEG = 5
+NLON = 360 // CELL_DEG
+NLAT = 180 // CELL_DEG
+
+# NNR-NUVEL-1A rotation poles (DeMets et al., 1994), Cartesian, rad/Myr
+NNR_NUVEL1A = {
+    'AFRC': (0.000891, -0.003099, 0.003922),
+    'ANTA': (-0.000821, -0.001701, 0.003706),
+    'ARAB': (0.006685, -0.000521, 0.006760),
+    'AUST': (0.007839, 0.005124, 0.006282),
+    'CARB': (-0.000178, -0.003385, 0.001581),
+    'COCO': (-0.010425, -0.021605, 0.010925),
+    'EURA': (-0.000981, -0.002395, 0.003153),
+    'INDI': (0.006670, 0.000040, 0.006790),
+    'JUFU': (0.005200, 0.008610, -0.005820),
+    'NAZC': (-0.001532, -0.008577, 0.009609),
+    'NOAM': (0.000258, -0.003599, -0.000153),
+    'PCFC': (-0.001510, 0.004840, -0.009970),
+    'PHIL': (0.010090, -0.007160, -0.009670),
+    'RIVR': (-0.009390, -0.030960, 0.012050),
+    'SCOT': (-0.000410, -0.002660, -0.001270),
+    'SOAM': (-0.001038, -0.001515, -0.000870),
+}
+
+# PB2002 plate codes -> NUVEL-1A plate (microplates -> surrounding major plate)
+PB2002_TO_NUVEL1A = {
+    'AF': 'AFRC', 'AM': 'EURA', 'AN': 'ANTA', 'AP': 'SOAM', 'AR': 'ARAB', 'AS': 'EURA',
+    'AT': 'EURA', 'AU': 'AUST', 'BH': 'AUST', 'BR': 'PCFC', 'BS': 'AUST', 'BU': 'EURA',
+    'CA': 'CARB', 'CL': 'PCFC', 'CO': 'COCO', 'CR': 'AUST', 'EA': 'PCFC', 'EU': 'EURA',
+    'FT': 'PCFC', 'GP': 'COCO', 'IN': 'INDI', 'JF': 'JUFU', 'JZ': 'NAZC', 'KE': 'AUST',
+    'MA': 'PHIL', 'MN': 'PCFC', 'MO': 'AUST', 'MS': 'EURA', 'NA': 'NOAM', 'NB': 'PCFC',
+    'ND': 'SOAM', 'NH': 'AUST', 'NI': 'AUST', 'NZ': 'NAZC', 'OK': 'NOAM', 'ON': 'EURA',
+    'PA': 'PCFC', 'PM': 'CARB', 'PS': 'PHIL', 'RI': 'RIVR', 'SA': 'SOAM', 'SB': 'PCFC',
+    'SC': 'SCOT', 'SL': 'ANTA', 'SO': 'AFRC', 'SS': 'AUST', 'SU': 'EURA', 'SW': 'SCOT',
+    'TI': 'AUST', 'TO': 'PCFC', 'WL': 'AUST', 'YA': 'EURA',
+}
+
+def read_pb2002(path):
+    """Plate outlines of a PB2002_plates.dig file: list of (code, [(lon, lat), ...])"""
+    polygons = []
+    code, points = None, []
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith('***'):
+                if code is not None and len(points) > 2:
+                    polygons.append((code, points))
+                code, points = None, []
+            elif code is None:
+                code = line.split()[0]
+            else:
+                lon, lat = line.split(',')[:2]
+                points.append((float(lon), float(lat)))
+    return polygons
+
+def close_ring(points):
+    """Closed (M, 2) lon/lat ring with continuous longitudes.
+
+    A ring whose longitudes wind once around the globe encloses a pole; it is
+    closed along that pole (the one on the side of its mean latitude).
+    """
+    ring = np.asarray(points, dtype=float)
+    lon = ring[:, 0].copy()
+    steps = (np.diff(lon) + 180.0) % 360.0 - 180.0
+    lon[1:] = lon[0] + np.cumsum(steps)
+    closing = (ring[0, 0] - lon[-1] + 180.0) % 360.0 - 180.0
+    winding = lon[-1] + closing - lon[0]
+    ring = np.column_stack([lon, ring[:, 1]])
+    if abs(winding) > 180.0:
+        pole = 90.0 if ring[:, 1].mean() > 0 else -90.0
+        end = lon[0] + winding
+        ring = np.vstack([ring, [[end, ring[0, 1]], [end, pole], [lon[0], pole]]])
+    return np.vstack([ring, ring[:1]])
+
+def points_in_ring(lon, lat, ring, chunk=512):
+    """Even-odd test of points against a ring (tried at lon-360, lon, lon+360)"""
+    x0, y0 = ring[:-1, 0], ring[:-1, 1]
+    x1, y1 = ring[1:, 0], ring[1:, 1]
+    dy = np.where(y1 == y0, 1.0, y1 - y0)
+    inside = np.zeros(len(lon), dtype=bool)
+    for shift in (0.0, -360.0, 360.0):
+        for start in range(0, len(lon), chunk):
+            px = lon[start:start + chunk, None] + shift
+            py = lat[start:start + chunk, None]
+            crosses = (y0 > py) != (y1 > py)
+            x_cross = x0 + (py - y0) * (x1 - x0) / dy
+            inside[start:start + chunk] |= np.count_nonzero(crosses & (px < x_cross), axis=1) % 2 == 1
+    return inside
+
+class PlateModel:
+    """Plate polygons with a grid index"""
+    def __init__(self, polygons):
+        self.codes = [code for code, _ in polygons]
+        self.rings = [close_ring(points) for _, points in polygons]
+        self.cells = defaultdict(list)
+        for k, ring in enumerate(self.rings):
+            lon0, lat0 = ring.min(axis=0)
+            lon1, lat1 = ring.max(axis=0)
+            for ilat in range(self._lat_cell(lat0), self._lat_cell(lat1) + 1):
+                for ilon in range(math.floor(lon0 / CELL_DEG), math.floor(lon1 / CELL_DEG) + 1):
+                    cell = (ilat, ilon % NLON)
+                    if k not in self.cells[cell]:
+                        self.cells[cell].append(k)
+
+    @staticmethod
+    def _lat_cell(lat):
+        return min(max(math.floor((lat + 90.0) / CELL_DEG), 0), NLAT - 1)
+
+    def assign(self, lat, lon):
+        """Plate code of each point (None outside every polygon)"""
+        lat = np.asarray(lat, dtype=float)
+        lon = np.asarray(lon, dtype=float)
+        ilat = np.clip(np.floor((lat + 90.0) / CELL_DEG).astype(int), 0, NLAT - 1)
+        ilon = np.floor(lon / CELL_DEG).astype(int) % NLON
+        by_polygon = defaultdict(list)
+        for i, cell in enumerate(zip(ilat.tolist(), ilon.tolist())):
+            for k in self.cells.get(cell, ()):
+                by_polygon[k].append(i)
+
+        result = [None] * len(lat)
+        for k, idx in sorted(by_polygon.items()):
+            idx = np.array([i for i in idx if result[i] is None], dtype=int)
+            if len(idx) == 0:
+                continue
+            for i in idx[points_in_ring(lon[idx], lat[idx], self.rings[k])]:
+                result[i] = self.codes[k]
+        return result
+
+def load_plate_model(path):
+    """Plate model from a PB2002 file"""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Plate model not found: {path} (PB2002_plates.dig, see --plates)")
+    return PlateModel(read_pb2002(path))
+
+def assign_plates(xyz, model):
+    """NUVEL-1A plate name for each (N, 3) XYZ position; None for missing or implausible positions"""
+    from .geodesy import ecef_to_geodetic, on_surface
+    xyz = np.atleast_2d(np.asarray(xyz, dtype=float))
+    lat, lon, _ = ecef_to_geodetic(xyz)
+    codes = model.assign(lat, lon)
+    valid = on_surface(xyz)
+    return [PB2002_TO_NUVEL1A.get(c, c) if c is not None and ok else None
+            for c, ok in zip(codes, valid)]
+
+def plate_velocity(xyz, plate):
+    """NNR-NUVEL-1A velocity [m/year] of (N, 3) positions on a plate"""
+    omega = np.array(NNR_NUVEL1A[plate]) * 1e-6  # rad/Myr -> rad/year
+    return np.cross(omega, np.atleast_2d(xyz))
+
+def station_plates(stations, model):
+    """Plate of each unique station: {station ID: NUVEL-1A plate}"""
+    from .header import get_station_id, unique_stations
+    from .geodesy import parse_xyz
+    stations = unique_stations(stations)
+    xyz = parse_xyz([st.xyz for st in stations])
+    plates = assign_plates(xyz, model) if stations else []
+    return {get_station_id(st): plate for st, plate in zip(stations, plates) if plate}
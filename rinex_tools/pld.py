@@ -0,0 +1,43 @@
+from .header import get_station_id, unique_stations
+
+FORMAT_VERSION = 1
+
+def format_pld_line(num, station_id, plate_name):
+    """Format a line for the PLD file according to the template"""
+    station_name = station_id[:4]
+    station_number = station_id[4:]
+    
+    line = (
+        f"{num:3d}  "
+        f"{station_name} {station_number:<9}"
+        f"{' ' * 13}"
+        f"{' ' * 13}"
+        f"{' ' * 13}"
+        f"{' ' * 4}"
+    )
+    
+    line = line.ljust(75)
+    line += plate_name
+    
+    return line
+
+def save_pld_file(stations, output_path, plate_name, plates=None):
+    """Save the PLD file with the formatted station information.
+
+    ``plates`` maps station IDs to automatically assigned plates; stations
+    missing from it get ``plate_name``.
+    """
+    header = (
+        "Example plate assignement\n"
+        "--------------------------------------------------------------------------------\n"
+        "LOCAL GEODETIC DATUM: IGS14           \n\n"
+        "NUM  STATION NAME           VX (M/Y)       VY (M/Y)       VZ (M/Y)  FLAG   PLATE\n\n"
+    )
+    
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(header)
+        for i, station in enumerate(unique_stations(stations), 1):
+            station_id = get_station_id(station)
+            plate = (plates or {}).get(station_id) or plate_name
+            line = format_pld_line(i, station_id, plate)
+            f.write(line + '\n')
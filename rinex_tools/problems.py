@@ -0,0 +1,122 @@
+"""Station problem intervals (STA TYPE 003) detected in the observation data.
+
+Three kinds of problems are found per file, all on (epoch, satellite) arrays:
+
+* outages - gaps between epochs longer than ``OUTAGE``;
+* clock jumps - the median change of the GPS code ranges between epochs is
+  larger than half a millisecond of light time plus what satellite motion
+  explains (receiver clock resets);
+* poor tracking - at least ``MIN_DURATION`` of epochs with fewer than
+  ``MIN_SATELLITES`` dual-frequency GPS satellites, or with cycle slips (as
+  found by ``qc``) on more than ``SLIP_FRACTION`` of them.
+
+Intervals of a station are merged by sort and sweep over all stations at once:
+sorted by station and start, an interval starts a new group unless it begins
+within ``MERGE_GAP`` of the running maximum end of its station. The kinds of a
+group are ORed as bit flags and named in the remark.
+"""
+import sys
+import warnings
+
+import numpy as np
+
+OUTAGE = 600          # longer gaps between epochs [s]
+MIN_SATELLITES = 4
+SLIP_FRACTION = 0.5
+MIN_DURATION = 600    # shorter poor-tracking runs are ignored [s]
+MAX_RANGE_RATE = 1000.0  # GPS range rate bound [m/s]
+MAX_JUMP_GAP = 300    # clock jumps are only looked for between epochs this close [s]
+MERGE_GAP = 300       # intervals closer than this are merged [s]
+OUTAGE_FLAG, CLOCK_FLAG, TRACKING_FLAG = 1, 2, 4
+KIND_NAMES = ((OUTAGE_FLAG, 'data gap'), (CLOCK_FLAG, 'clock jump'), (TRACKING_FLAG, 'poor tracking'))
+
+def runs(mask):
+    """(first, last) indices of the runs of True in a 1-D mask"""
+    edges = np.diff(np.concatenate([[0], mask.astype(np.int8), [0]]))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1) - 1
+
+def file_problems(obs):
+    """Problems of one file: (starts, ends, flags) arrays of GPS seconds"""
+    from .qc import C, code, find_slips, multipath
+    epochs = np.asarray(obs.epochs, dtype=np.int64)
+    starts, ends, flags = [], [], []
+    if len(epochs) < 2:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    dt = np.diff(epochs)
+
+    gap = np.flatnonzero(dt > OUTAGE)
+    starts.append(epochs[gap])
+    ends.append(epochs[gap + 1])
+    flags.append(np.full(len(gap), OUTAGE_FLAG))
+
+    gps = obs.system('G')
+    p1 = code(gps, 1) if gps.satellites else None
+    if p1 is not None:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # epochs without common satellites
+            change = np.nanmedian(np.diff(p1, axis=0), axis=1)
+        jump = np.flatnonzero((np.abs(change) > 0.5e-3 * C + MAX_RANGE_RATE * dt) & (dt <= MAX_JUMP_GAP))
+        starts.append(epochs[jump])
+        ends.append(epochs[jump + 1])
+        flags.append(np.full(len(jump), CLOCK_FLAG))
+
+    if gps.satellites and gps.get('L1') is not None and gps.get('L2') is not None:
+        mp1, mp2 = multipath(gps)
+        slips, _, valid = find_slips(gps, mp1, mp2)
+        tracked = valid.sum(axis=1)
+        poor = (tracked < MIN_SATELLITES) | (slips.sum(axis=1) > SLIP_FRACTION * tracked)
+        first, last = runs(poor)
+        long_enough = epochs[last] - epochs[first] >= MIN_DURATION
+        starts.append(epochs[first[long_enough]])
+        ends.append(epochs[last[long_enough]])
+        flags.append(np.full(np.count_nonzero(long_enough), TRACKING_FLAG))
+    return (np.concatenate(starts).astype(np.int64), np.concatenate(ends).astype(np.int64),
+            np.concatenate(flags).astype(np.int64))
+
+def path_problems(path, cache_dir=None):
+    """Problems of one file, None if it cannot be read"""
+    from .obscache import cached_observations
+    try:
+        return file_problems(cached_observations(path, cache_dir))
+    except (OSError, ValueError) as e:
+        print(f'Ошибка при обработке файла {path}: {e}', file=sys.stderr)
+        return None
+
+def merge_intervals(codes, starts, ends, flags, gap=MERGE_GAP):
+    """Merge the intervals of each station code: (codes, starts, ends, flags) of the merged intervals"""
+    if not len(codes):
+        return codes, starts, ends, flags
+    order = np.lexsort((starts, codes))
+    codes, starts, ends, flags = codes[order], starts[order], ends[order], flags[order]
+    # Running maximum end within each station: offset the codes so they dominate
+    offset = int(ends.max() - min(starts.min(), 0) + 2 * gap + 1)
+    reach = np.maximum.accumulate(codes * offset + ends) - codes * offset
+    new = np.ones(len(codes), dtype=bool)
+    new[1:] = (codes[1:] != codes[:-1]) | (starts[1:] > reach[:-1] + gap)
+    bounds = np.flatnonzero(new)
+    return (codes[bounds], starts[bounds], np.maximum.reduceat(ends, bounds),
+            np.bitwise_or.reduceat(flags, bounds))
+
+def problem_remark(flags):
+    return 'Auto: ' + ', '.join(name for flag, name in KIND_NAMES if flags & flag)
+
+def station_problems(files, cache_dir=None, jobs=1):
+    """TYPE 003 intervals of (station, path) pairs: sorted [(station, from, to, remark)]"""
+    stations = sorted({station for station, _ in files})
+    code_of = {station: i for i, station in enumerate(stations)}
+    paths = [path for _, path in files]
+    if jobs > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        from functools import partial
+        with ProcessPoolExecutor(jobs) as pool:
+            results = list(pool.map(partial(path_problems, cache_dir=cache_dir), paths, chunksize=4))
+    else:
+        results = [path_problems(path, cache_dir) for path in paths]
+    parts = [(np.full(len(r[0]), code_of[station]), *r) for (station, _), r in zip(files, results)
+             if r is not None]
+    if not parts:
+        return []
+    codes, starts, ends, flags = (np.concatenate(column) for column in zip(*parts))
+    codes, starts, ends, flags = merge_intervals(codes.astype(np.int64), starts, ends, flags)
+    return [(stations[c], s, e, problem_remark(f))
+            for c, s, e, f in zip(codes.tolist(), starts.tolist(), ends.tolist(), flags.tolist())]
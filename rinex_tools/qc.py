@@ -0,0 +1,196 @@
+"""Observation quality of RINEX files: multipath, cycle slips and SNR (teqc-style).
+
+All metrics are computed on (epoch, satellite) arrays of a whole file:
+
+* MP1/MP2 - code multipath combinations with the mean of each phase arc
+  removed, RMS per satellite and per file;
+* cycle slips - loss of lock flags, ionospheric rate (IOD), jumps of the
+  geometry-free phase against its linear prediction and jumps of MP1/MP2;
+  a slip or a gap longer than ``MAX_GAP`` starts a new arc;
+* SNR - mean and minimum S1/S2 per satellite, mean per file.
+
+Only GPS satellites are used, since the combinations need the L1/L2
+frequencies. No elevation mask is applied, because no orbits are available.
+"""
+import csv
+import sys
+import warnings
+
+import numpy as np
+
+C = 299792458.0
+F1 = 1575.42e6
+F2 = 1227.60e6
+WL1 = C / F1
+WL2 = C / F2
+ALPHA = (F1 / F2) ** 2
+
+MAX_GAP = 300.0        # longer gaps start a new arc [s]
+IOD_SLIP = 4.0         # ionospheric rate threshold [m/min] (teqc: 400 cm/min)
+GF_SLIP = 0.10         # geometry-free jump against linear prediction [m]
+MP_SLIP = 10.0         # MP1/MP2 jump between epochs [m]
+MIN_ARC = 10           # shorter arcs are left out of the multipath RMS [epochs]
+
+def code(obs, band):
+    """P-code of a band, C1 for band 1 where P1 is missing"""
+    p = obs.get(f'P{band}')
+    if band == 1 and obs.get('C1') is not None:
+        p = obs.get('C1') if p is None else np.where(np.isnan(p), obs.get('C1'), p)
+    return p
+
+def multipath(obs):
+    """MP1 and MP2 [m] (NaN where an observable is missing)"""
+    l1 = obs.get('L1') * WL1
+    l2 = obs.get('L2') * WL2
+    p1, p2 = code(obs, 1), code(obs, 2)
+    k = 2.0 / (ALPHA - 1.0)
+    mp1 = p1 - (1.0 + k) * l1 + k * l2 if p1 is not None else np.full_like(l1, np.nan)
+    mp2 = p2 - ALPHA * k * l1 + (ALPHA * k - 1.0) * l2 if p2 is not None else np.full_like(l1, np.nan)
+    return mp1, mp2
+
+def previous_index(valid):
+    """Epoch index of the previous valid sample of each satellite (-1 if none)"""
+    idx = np.where(valid, np.arange(valid.shape[0])[:, None], -1)
+    last = np.maximum.accumulate(idx, axis=0)
+    prev = np.full_like(last, -1)
+    prev[1:] = last[:-1]
+    return prev
+
+def take(values, rows):
+    """values[rows[e, s], s], NaN where rows is -1"""
+    cols = np.broadcast_to(np.arange(values.shape[1]), rows.shape)
+    return np.where(rows >= 0, values[np.maximum(rows, 0), cols], np.nan)
+
+def find_slips(obs, mp1, mp2):
+    """Slip and arc start masks (epoch, satellite) of the L1/L2 phase"""
+    l1, l2 = obs.get('L1'), obs.get('L2')
+    valid = ~np.isnan(l1) & ~np.isnan(l2)
+    gf = np.where(valid, l1 * WL1 - l2 * WL2, np.nan)
+    t = obs.epochs.astype(float)[:, None]
+
+    prev = previous_index(valid)
+    prev2 = take(prev.astype(float), prev)
+    prev2 = np.where(np.isnan(prev2), -1, prev2).astype(np.int64)
+    t_prev = take(np.broadcast_to(t, gf.shape), prev)
+    t_prev2 = take(np.broadcast_to(t, gf.shape), prev2)
+    gf_prev, gf_prev2 = take(gf, prev), take(gf, prev2)
+    dt = t - t_prev
+    connected = valid & (prev >= 0) & (dt <= MAX_GAP)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        iod = (gf - gf_prev) / (ALPHA - 1.0) / (dt / 60.0)
+        predicted = gf_prev + (gf_prev - gf_prev2) * dt / (t_prev - t_prev2)
+        predicted = np.where(np.isnan(predicted) | (t_prev - t_prev2 > MAX_GAP), gf_prev, predicted)
+        jump = np.abs(gf - predicted)
+        mp_jump = np.fmax(np.abs(mp1 - take(mp1, prev)), np.abs(mp2 - take(mp2, prev)))
+    lost_lock = ((obs.get_lli('L1') | obs.get_lli('L2')) & 1).astype(bool)
+    other = (np.abs(iod) > IOD_SLIP) | (mp_jump > MP_SLIP) | lost_lock
+    slips = connected & (other | (jump > GF_SLIP))
+    # Right after a slip the linear prediction spans it: predict the previous value instead
+    after_slip = take(slips.astype(float), prev) == 1
+    jump = np.where(after_slip, np.abs(gf - gf_prev), jump)
+    slips = connected & (other | (jump > GF_SLIP))
+    arc_start = valid & (~connected | slips)
+    return slips, arc_start, valid
+
+def arc_rms(values, arc_start, valid):
+    """RMS of each satellite's values about their arc means: (rms per satellite, samples per satellite)"""
+    n_sat = values.shape[1]
+    labels = np.cumsum(arc_start.T.ravel()) - 1
+    flat = values.T.ravel()
+    ok = valid.T.ravel() & ~np.isnan(flat) & (labels >= 0)
+    counts = np.bincount(labels[ok], minlength=labels.max() + 1 if len(labels) else 0)
+    sums = np.bincount(labels[ok], weights=flat[ok], minlength=len(counts))
+    ok &= counts[np.maximum(labels, 0)] >= MIN_ARC
+    residual = flat[ok] - sums[labels[ok]] / counts[labels[ok]]
+    sat = np.repeat(np.arange(n_sat), values.shape[0])[ok]
+    n = np.bincount(sat, minlength=n_sat)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rms = np.sqrt(np.bincount(sat, weights=residual ** 2, minlength=n_sat) / n)
+    return rms, n
+
+def total_rms(rms, n):
+    """RMS over all satellites of per-satellite RMS values and sample counts"""
+    return float(np.sqrt(np.sum(np.where(n > 0, rms ** 2 * n, 0.0)) / n.sum())) if n.sum() else float('nan')
+
+def file_qc(obs):
+    """Quality of one file: summary dict with a 'satellites' dict of per-satellite values"""
+    obs = obs.system('G')
+    summary = {'file': obs.filename, 'epochs': len(obs.epochs), 'satellites': {}}
+    if obs.get('L1') is None or obs.get('L2') is None or not obs.satellites:
+        summary.update(observations=0, slips=0, obs_per_slip=float('nan'),
+                       mp1=float('nan'), mp2=float('nan'), s1=float('nan'), s2=float('nan'))
+        return summary
+
+    mp1, mp2 = multipath(obs)
+    slips, arc_start, valid = find_slips(obs, mp1, mp2)
+    mp1_rms, mp1_n = arc_rms(mp1, arc_start, valid)
+    mp2_rms, mp2_n = arc_rms(mp2, arc_start, valid)
+    s1, s2 = obs.get('S1'), obs.get('S2')
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # all-NaN satellites
+        s1_mean = np.nanmean(s1, axis=0) if s1 is not None else np.full(len(obs.satellites), np.nan)
+        s2_mean = np.nanmean(s2, axis=0) if s2 is not None else np.full(len(obs.satellites), np.nan)
+        s1_min = np.nanmin(s1, axis=0) if s1 is not None else np.full(len(obs.satellites), np.nan)
+
+    n_obs = valid.sum(axis=0)
+    n_slips = slips.sum(axis=0)
+    for j, sat in enumerate(obs.satellites):
+        summary['satellites'][sat] = {
+            'observations': int(n_obs[j]), 'slips': int(n_slips[j]),
+            'mp1': float(mp1_rms[j]), 'mp2': float(mp2_rms[j]),
+            's1': float(s1_mean[j]), 's1_min': float(s1_min[j]), 's2': float(s2_mean[j]),
+        }
+    total_slips = int(n_slips.sum())
+    summary.update(
+        observations=int(n_obs.sum()), slips=total_slips,
+        obs_per_slip=float(n_obs.sum() / total_slips) if total_slips else float('inf'),
+        mp1=total_rms(mp1_rms, mp1_n), mp2=total_rms(mp2_rms, mp2_n),
+        s1=float(np.nanmean(s1)) if s1 is not None and np.isfinite(s1).any() else float('nan'),
+        s2=float(np.nanmean(s2)) if s2 is not None and np.isfinite(s2).any() else float('nan'),
+    )
+    return summary
+
+def qc_file(path, cache_dir=None):
+    """Quality of a RINEX 2 observation file, None if it cannot be read"""
+    from .obscache import cached_observations
+    try:
+        return file_qc(cached_observations(path, cache_dir))
+    except (OSError, ValueError) as e:
+        print(f'Ошибка при обработке файла {path}: {e}', file=sys.stderr)
+        return None
+
+def qc_files(paths, jobs=1, cache_dir=None):
+    """Yield the quality of each file, in order; ``jobs`` > 1 uses worker processes"""
+    if jobs > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        from functools import partial
+        with ProcessPoolExecutor(jobs) as pool:
+            yield from pool.map(partial(qc_file, cache_dir=cache_dir), paths, chunksize=4)
+    else:
+        for path in paths:
+            yield qc_file(path, cache_dir)
+
+QC_HEADER = 'FILE           EPOCHS     OBS  SLIPS  OBS/SLIP     MP1     MP2     S1     S2'
+SUMMARY_FIELDS = ('file', 'epochs', 'observations', 'slips', 'obs_per_slip', 'mp1', 'mp2', 's1', 's2')
+
+def format_summary(summary):
+    """One line of the QC table"""
+    name = summary['file'].replace('\\', '/').rsplit('/', 1)[-1]
+    return (f"{name:<14}{summary['epochs']:>7}{summary['observations']:>8}{summary['slips']:>7}"
+            f"{summary['obs_per_slip']:>10.0f}{summary['mp1']:>8.3f}{summary['mp2']:>8.3f}"
+            f"{summary['s1']:>7.1f}{summary['s2']:>7.1f}")
+
+def print_satellites(summary):
+    """Per-satellite lines of one file"""
+    for sat, values in summary['satellites'].items():
+        print(f"  {sat}{values['observations']:>8}{values['slips']:>6}{values['mp1']:>8.3f}"
+              f"{values['mp2']:>8.3f}{values['s1']:>7.1f}{values['s1_min']:>7.1f}{values['s2']:>7.1f}")
+
+def write_csv(summaries, path):
+    """Write file summaries as CSV"""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(SUMMARY_FIELDS)
+        for summary in summaries:
+            writer.writerow([summary[k] for k in SUMMARY_FIELDS])
@@ -0,0 +1,96 @@
+"""Partial registries for sharded runs.
+
+A shard runs discovery and header parsing for its slice of the archive
+(``rinex-tools shard``) and writes the parsed headers as a JSON registry.
+``rinex-tools merge`` combines any number of partial registries; products can
+then be written from the merged registry with ``--registry``.
+
+Records are keyed by the file path relative to the input directory. When two
+registries contain the same file, the record with the larger
+``(mtime, size, header)`` wins, so merging is associative, commutative and
+idempotent: shards can be re-run and re-merged in any order.
+"""
+import gzip
+import json
+import os
+import zlib
+
+from .dedup import station_day
+from .header import extract_station_info, parse_rinex_header
+
+REGISTRY_VERSION = 1
+SHARD_KEYS = ('station', 'year')
+
+def shard_key(path, by):
+    """Shard key of a file: 4-char station name or year of observation"""
+    name = os.path.basename(path)
+    if by == 'station':
+        return name[:4].upper()
+    day = station_day(path)
+    return str(day[1]) if day else 'unknown'
+
+def select_shard(paths, by, count, index):
+    """Files belonging to shard ``index`` of ``count``"""
+    if not 0 <= index < count:
+        raise ValueError(f"Shard index {index} out of range 0..{count - 1}")
+    return [p for p in paths if zlib.crc32(shard_key(p, by).encode()) % count == index]
+
+def make_record(path):
+    """Registry record of one file: parsed header plus size and mtime"""
+    st = os.stat(path)
+    return {'size': st.st_size, 'mtime': st.st_mtime, 'header': parse_rinex_header(path)}
+
+def build_registry(paths, input_dir):
+    """Registry of the given files, keyed by path relative to ``input_dir``"""
+    records = {}
+    for path in paths:
+        try:
+            records[os.path.relpath(path, input_dir)] = make_record(path)
+        except OSError as e:
+            print(f"Error reading file {path}: {e}")
+    return records
+
+def _open(path, mode, compressed):
+    if compressed:
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+def write_registry(records, path):
+    """Write a registry as compact JSON (gzip-compressed if the name ends with .gz)"""
+    tmp_path = path + '.tmp'
+    with _open(tmp_path, 'w', path.endswith('.gz')) as f:
+        json.dump({'version': REGISTRY_VERSION, 'records': records}, f,
+                  separators=(',', ':'), sort_keys=True, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def read_registry(path):
+    """Read the records of a registry file"""
+    with _open(path, 'r', path.endswith('.gz')) as f:
+        data = json.load(f)
+    if data.get('version') != REGISTRY_VERSION:
+        raise ValueError(f"Unsupported registry version in {path}: {data.get('version')}")
+    return data['records']
+
+def _rank(record):
+    return record['mtime'], record['size'], json.dumps(record['header'], sort_keys=True)
+
+def merge_registries(registries):
+    """Merge registries; on conflicts the record with the larger rank wins"""
+    merged = {}
+    for records in registries:
+        for key, record in records.items():
+            if key not in merged or _rank(record) > _rank(merged[key]):
+                merged[key] = record
+    return merged
+
+def registry_stations(records, input_dir):
+    """Yield the StationInfo objects of a registry, in path order.
+
+    Keys are paths relative to the scanned directory, so the files are found
+    under ``input_dir`` (the same directory given to ``shard``).
+    """
+    for key in sorted(records):
+        station = extract_station_info(records[key]['header'], os.path.basename(key))
+        station.mtime = records[key]['mtime']
+        station.path = os.path.join(input_dir, key)
+        yield station
@@ -0,0 +1,284 @@
+"""Local query service over the station registry (``rinex-tools serve``).
+
+The registry (``--registry``) and/or the headers of the input directory are
+loaded once into in-memory indexes:
+
+* per station - the files sorted by start of observations, with a running
+  maximum of their ends, so the file valid at a time is found by bisection;
+* over all files - start, end and station arrays for time-interval queries;
+* over all stations - mean ECEF positions for distance queries.
+
+``POST /refresh`` (or ``--refresh`` seconds) rescans the input directory and
+re-parses only the files whose size or modification time changed; only the
+stations of changed files are re-indexed, and the new indexes replace the old
+ones in a single assignment, so queries never wait for a refresh.
+
+Requests (GET, JSON responses; times 'YYYY-MM-DD' or 'YYYY-MM-DDTHH:MM'):
+
+* ``/stations[?start=&end=][&near=CHUM&radius=500]`` - stations with data in the
+  interval and/or within ``radius`` km of a station;
+* ``/station/ULAB`` - files of a station;
+* ``/station/ULAB/at?time=2004-08-26`` - receiver, antenna and position at a time.
+
+Served over HTTP on 127.0.0.1 or on a Unix socket.
+"""
+import json
+import os
+import stat
+import threading
+from bisect import bisect_right
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import ThreadingUnixStreamServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import numpy as np
+
+from .catalog import header_values, parse_catalog_date
+from .geodesy import chord_distances, parse_xyz
+from .gpstime import format_bernese, from_datetime
+from .header import extract_station_info, iter_rinex_files
+from .registry import make_record
+from .sta import station_epochs
+from .vel import parse_xyz_coordinates_float
+
+def station_name(station):
+    """4-character station name: marker name, else file name"""
+    name = station.marker_name[:4].strip() if station.marker_name != '-' else ''
+    return (name or station.filename[:4]).upper()
+
+def parse_time(value):
+    """GPS seconds of a query time"""
+    dt = parse_catalog_date(value) or parse_catalog_date(value.replace('T', ' '))
+    if dt is None:
+        raise ValueError(f'неверное время: {value}')
+    return from_datetime(dt)
+
+class StationHistory:
+    """Files of one station sorted by start of observations"""
+    def __init__(self, name, items):
+        items = sorted(items, key=lambda item: (item[1], item[0]))
+        self.name = name
+        self.keys = [key for key, _, _, _ in items]
+        self.starts = [start for _, start, _, _ in items]
+        self.ends = [end for _, _, end, _ in items]
+        self.max_ends = np.maximum.accumulate(self.ends).tolist() if items else []
+        self.stations = [station for _, _, _, station in items]
+        xyz = parse_xyz([st.xyz for st in self.stations])
+        valid = xyz.any(axis=1)
+        self.xyz = xyz[valid].mean(axis=0) if valid.any() else None
+
+    def at(self, t):
+        """Index of the file observing at ``t`` (the latest started), else of the last file before it"""
+        i = bisect_right(self.starts, t) - 1
+        j = i
+        while j >= 0 and self.max_ends[j] >= t:
+            if self.ends[j] >= t:
+                return j, True
+            j -= 1
+        return (i, False) if i >= 0 else (None, False)
+
+def file_info(history, i):
+    """JSON description of one file of a station"""
+    station = history.stations[i]
+    values = header_values(station)
+    start, end = format_bernese([history.starts[i], history.ends[i]])
+    return {
+        'file': history.keys[i], 'start': start, 'end': end,
+        'marker_number': station.marker_number.strip() if station.marker_number != '-' else '',
+        'receiver': values['receiver'], 'antenna': values['antenna'],
+        'xyz': list(parse_xyz_coordinates_float(station.xyz)),
+    }
+
+class RegistryIndex:
+    """In-memory indexes of registry records, updated incrementally"""
+    def __init__(self, records=None):
+        self.records = {}
+        self.histories = {}
+        self.names = {}  # record key -> station name
+        self._lock = threading.Lock()
+        self._build_arrays()
+        if records:
+            self.update(records)
+
+    def update(self, changed, removed=()):
+        """Add or replace records and remove keys; re-indexes only the affected stations"""
+        with self._lock:
+            affected = set()
+            for key in removed:
+                if key in self.records:
+                    del self.records[key]
+                    affected.add(self.names.pop(key))
+            for key, record in changed.items():
+                if key in self.names:
+                    affected.add(self.names[key])
+                self.records[key] = record
+                station = extract_station_info(record['header'], os.path.basename(key))
+                self.names[key] = station_name(station)
+                affected.add(self.names[key])
+            if not affected:
+                return
+            by_station = {name: [] for name in affected}
+            for key, name in self.names.items():
+                if name in by_station:
+                    by_station[name].append(key)
+            histories = dict(self.histories)
+            for name, keys in by_station.items():
+                stations = [extract_station_info(self.records[k]['header'], os.path.basename(k)) for k in keys]
+                if not stations:
+                    histories.pop(name, None)
+                    continue
+                starts, ends = station_epochs(stations)
+                histories[name] = StationHistory(name, zip(keys, starts.tolist(), ends.tolist(), stations))
+            self.histories = histories
+            self._build_arrays()
+
+    def _build_arrays(self):
+        histories = self.histories
+        names = sorted(histories)
+        counts = [len(histories[n].starts) for n in names]
+        positioned = [n for n in names if histories[n].xyz is not None]
+        # One tuple assignment, so a query sees either the old or the new indexes
+        self.arrays = (
+            names,
+            np.array([s for n in names for s in histories[n].starts], dtype=np.int64),
+            np.array([e for n in names for e in histories[n].ends], dtype=np.int64),
+            np.repeat(np.arange(len(names)), counts),
+            positioned,
+            np.array([histories[n].xyz for n in positioned], dtype=float).reshape(-1, 3),
+        )
+
+    def refresh(self, input_dir):
+        """Re-read the files of ``input_dir`` that changed; returns (changed, removed) counts"""
+        changed, seen = {}, set()
+        for path in iter_rinex_files(input_dir):
+            key = os.path.relpath(path, input_dir)
+            seen.add(key)
+            record = self.records.get(key)
+            try:
+                st = os.stat(path)
+                if record is None or (record['mtime'], record['size']) != (st.st_mtime, st.st_size):
+                    changed[key] = make_record(path)
+            except OSError:
+                continue
+        removed = [key for key in self.records if key not in seen]
+        self.update(changed, removed)
+        return len(changed), len(removed)
+
+    def stations(self, start=None, end=None, near=None, radius=None):
+        """Names of the stations with data in [start, end) and/or within ``radius`` km of ``near``"""
+        names, starts, ends, owner, positioned, xyz = self.arrays
+        result = set(names)
+        if start is not None or end is not None:
+            mask = np.ones(len(starts), dtype=bool)
+            if end is not None:
+                mask &= starts < end
+            if start is not None:
+                mask &= ends >= start
+            result = {names[i] for i in np.unique(owner[mask]).tolist()}
+        if near is not None:
+            history = self.histories.get(near.upper())
+            if history is None or history.xyz is None:
+                raise KeyError(near)
+            distance = chord_distances(xyz, history.xyz)[:, 0] / 1000.0
+            result &= {positioned[i] for i in np.flatnonzero(distance <= radius).tolist()}
+        return sorted(result)
+
+    def station(self, name):
+        history = self.histories.get(name.upper())
+        if history is None:
+            raise KeyError(name)
+        return {'station': history.name, 'files': [file_info(history, i) for i in range(len(history.keys))]}
+
+    def station_at(self, name, t):
+        history = self.histories.get(name.upper())
+        if history is None:
+            raise KeyError(name)
+        i, observing = history.at(t)
+        if i is None:
+            raise KeyError(f'{name}: нет данных до этого времени')
+        return dict(file_info(history, i), station=history.name, observing=observing)
+
+class QueryHandler(BaseHTTPRequestHandler):
+    """JSON answers to registry queries; ``server.index`` is the RegistryIndex"""
+    protocol_version = 'HTTP/1.1'  # keep-alive: no new connection per query
+    disable_nagle_algorithm = True
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        parts = [unquote(p) for p in url.path.strip('/').split('/') if p]
+        index = self.server.index
+        try:
+            if parts == ['stations']:
+                start = parse_time(params['start']) if 'start' in params else None
+                end = parse_time(params['end']) if 'end' in params else None
+                near = params.get('near')
+                radius = float(params.get('radius', 0)) if near else None
+                self.reply(200, {'stations': index.stations(start, end, near, radius)})
+            elif len(parts) == 2 and parts[0] == 'station':
+                self.reply(200, index.station(parts[1]))
+            elif len(parts) == 3 and parts[0] == 'station' and parts[2] == 'at':
+                if 'time' not in params:
+                    raise ValueError('нужен параметр time')
+                self.reply(200, index.station_at(parts[1], parse_time(params['time'])))
+            else:
+                self.reply(404, {'error': f'неизвестный запрос: {url.path}'})
+        except KeyError as e:
+            self.reply(404, {'error': f'нет станции {e.args[0]}'})
+        except ValueError as e:
+            self.reply(400, {'error': str(e)})
+
+    def do_POST(self):
+        if urlsplit(self.path).path.strip('/') != 'refresh' or not self.server.input_dir:
+            self.reply(404, {'error': 'обновление недоступно'})
+            return
+        changed, removed = self.server.index.refresh(self.server.input_dir)
+        self.reply(200, {'changed': changed, 'removed': removed})
+
+    def reply(self, status, data):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class UnixQueryHandler(QueryHandler):
+    disable_nagle_algorithm = False  # not a TCP socket
+
+class UnixHTTPServer(ThreadingUnixStreamServer):
+    """HTTP over a Unix socket"""
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = super().get_request()
+        return request, ('unix', 0)
+
+def make_server(index, input_dir=None, port=8765, socket_path=None):
+    """HTTP server on 127.0.0.1:port, or on a Unix socket when ``socket_path`` is given.
+
+    An old socket at ``socket_path`` is replaced; any other file there is an error.
+    """
+    if socket_path:
+        try:
+            mode = os.stat(socket_path).st_mode
+        except FileNotFoundError:
+            mode = None
+        if mode is not None:
+            if not stat.S_ISSOCK(mode):
+                raise FileExistsError(f'{socket_path} уже существует и не является сокетом')
+            os.remove(socket_path)  # left over from a previous run
+        server = UnixHTTPServer(socket_path, UnixQueryHandler)
+    else:
+        server = ThreadingHTTPServer(('127.0.0.1', port), QueryHandler)
+        server.daemon_threads = True
+    server.index = index
+    server.input_dir = input_dir
+    return server
+
+def refresh_loop(index, input_dir, interval, stop):
+    """Refresh the index every ``interval`` seconds until ``stop`` is set"""
+    while not stop.wait(interval):
+        index.refresh(input_dir)
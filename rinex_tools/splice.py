@@ -0,0 +1,156 @@
+"""Daily RINEX files from hourly, partial or multi-day observation files.
+
+The files of each station are ordered by their first epoch and read one after
+another. Every epoch goes to the daily file ``SSSSDDD0.YYO`` of its day, so
+short files are spliced together and long files are split at midnight in a
+single pass. Only one output file is open at a time.
+
+A daily file takes its header from the first file contributing to it, with
+TIME OF FIRST/LAST OBS set from the written epochs. Observations of later
+files are mapped to its observation types by name. If the station metadata
+(marker, receiver, antenna, position, eccentricities) changes within a day,
+the new header lines are written as an event (epoch flag 4). Epochs not later
+than the last written one (overlapping files) are dropped.
+"""
+import os
+
+from .obsstream import (Epoch, ObsWriter, check_version, header_label, iter_epochs, obs_types,
+                        read_header, remove_header, select_fields)
+
+METADATA_LABELS = (
+    'MARKER NAME',
+    'MARKER NUMBER',
+    'REC # / TYPE / VERS',
+    'ANT # / TYPE',
+    'APPROX POSITION XYZ',
+    'ANTENNA: DELTA H/E/N',
+)
+
+def metadata(header):
+    """Station metadata lines of a header"""
+    return [line for line in header if header_label(line) in METADATA_LABELS]
+
+def daily_name(station, year, doy):
+    return f'{station[:4].upper()}{doy:03d}0.{year % 100:02d}O'
+
+def first_epoch(header):
+    """Fields of TIME OF FIRST OBS, None if missing"""
+    for line in header:
+        if header_label(line) == 'TIME OF FIRST OBS':
+            try:
+                return tuple(int(v) for v in line[:30].split()) + (float(line[30:43]),)
+            except ValueError:
+                return None
+    return None
+
+def station_files(paths):
+    """Files of each station ordered by first epoch: {station: [path, ...]}.
+
+    All headers are read before anything is written, so a file that cannot be
+    streamed (not RINEX 2) stops the splice before any output exists.
+    """
+    stations = {}
+    for path in paths:
+        with open(path, 'r', encoding='ascii', errors='replace') as f:
+            header = read_header(f)
+        try:
+            check_version(header)
+        except ValueError as e:
+            raise ValueError(f'{path}: {e}') from None
+        names = [line[:4].strip() for line in header if header_label(line) == 'MARKER NAME']
+        station = (names[0] if names and names[0] else os.path.basename(path)[:4]).upper()
+        stations.setdefault(station, []).append((first_epoch(header) or (9999,), os.path.basename(path), path))
+    return {station: [path for _, _, path in sorted(files)] for station, files in sorted(stations.items())}
+
+class DailySplitter:
+    """Route the epochs of consecutive files of one station to daily files"""
+    def __init__(self, station, output_dir, protected=()):
+        self.station = station
+        self.output_dir = output_dir
+        self.protected = set(protected)  # input files that must not be overwritten
+        self.writer = None
+        self.day = None        # (year, day of year) of the open file
+        self.day_text = None   # 'yy mm dd' of the epochs of that day
+        self.header = None
+        self.types = None      # observation types of the file being read
+        self.day_types = None  # and of the open daily file
+        self.mapping = None
+        self.event = None      # metadata change to report in the open daily file
+        self.last = None
+        self.dropped = 0
+        self.written = []      # [path, epochs]
+
+    def _open_day(self, day):
+        self.close()
+        path = os.path.join(self.output_dir, daily_name(self.station, *day))
+        if os.path.abspath(path) in self.protected:
+            raise ValueError(f'выходной файл {path} совпадает с исходным')
+        self.writer = ObsWriter(path, remove_header(self.header, '# OF SATELLITES', 'PRN / # OF OBS'))
+        self.day = day
+        self.day_types = obs_types(self.header)
+        self.mapping = None
+        self.written.append([path, 0])
+
+    def _write(self, epoch):
+        if epoch.time_text[:9] != self.day_text:
+            day = epoch.day()
+            if day != self.day:
+                self._open_day(day)
+                self.event = None  # the new header has the new metadata
+            self.day_text = epoch.time_text[:9]
+        if self.event is not None:
+            self.writer.write(self.event)
+            self.event = None
+        if self.mapping is None:
+            self.mapping = [self.types.index(t) if t in self.types else None for t in self.day_types]
+        epoch.records = [select_fields(r, self.mapping) for r in epoch.records]
+        self.writer.write(epoch)
+
+    def add_file(self, path):
+        with open(path, 'r', encoding='ascii', errors='replace') as f:
+            header = read_header(f)
+            if self.writer is not None and metadata(header) != metadata(self.header):
+                changed = [line for line in metadata(header) if line not in metadata(self.header)]
+                self.event = Epoch(' ' * 26, 4, lines=changed)
+            self.header = header
+            self.types = obs_types(header)
+            self.mapping = None
+            for epoch in iter_epochs(f, len(self.types)):
+                if epoch.flag not in (0, 1, 6):
+                    if self.writer is not None:
+                        self.writer.write(epoch)
+                elif epoch.flag == 6:
+                    if self.writer is not None and epoch.time_fields() == self.last:
+                        self._write(epoch)
+                elif self.last is not None and epoch.time_fields() <= self.last:
+                    self.dropped += 1
+                else:
+                    self.last = epoch.time_fields()
+                    self._write(epoch)
+                    self.written[-1][1] += 1
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+    def abort(self):
+        if self.writer is not None:
+            self.writer.abort()
+            self.writer = None
+
+def splice_files(paths, output_dir):
+    """Write the daily files of the given files; returns {station: ([(path, epochs)], dropped)}"""
+    protected = {os.path.abspath(p) for p in paths}
+    result = {}
+    for station, files in station_files(paths).items():
+        splitter = DailySplitter(station, output_dir, protected)
+        try:
+            for path in files:
+                splitter.add_file(path)
+        except Exception:
+            splitter.abort()
+            raise
+        splitter.close()
+        result[station] = ([tuple(w) for w in splitter.written], splitter.dropped)
+    return result
@@ -0,0 +1,300 @@
+"""Single point positioning from pseudoranges and broadcast ephemerides.
+
+Used where APPROX POSITION XYZ is missing or not on the Earth's surface: the
+station's observation file and a GPS navigation file of the same day (next to
+it, ``....YYN``, or from ``--nav``) give a daily position, offline.
+
+Everything is computed on (epoch, satellite) arrays of the whole file:
+
+* the ephemeris of each satellite nearest in time (healthy, within
+  ``MAX_AGE``) is selected with one ``searchsorted`` per satellite;
+* satellite positions and clocks at transmission time follow IS-GPS-200
+  (Kepler's equation solved by fixed-point iteration for all samples at once),
+  rotated by the Earth's rotation during the signal travel time;
+* the ionosphere-free P1/P2 (or C1/P2) combination is used where both codes
+  are present, else C1 or P1 with the broadcast group delay and, when the
+  header has ION ALPHA/BETA, the Klobuchar ionosphere;
+* all epochs are solved together by iterated least squares with batched 4x4
+  normal equations (position and receiver clock per epoch), with a 10 degree
+  elevation mask and a simple troposphere once the position is near the
+  surface;
+* the daily position is the median of the epoch solutions with enough
+  satellites, low PDOP and small residuals.
+"""
+import os
+import re
+
+import numpy as np
+
+from .geodesy import ecef_to_enu, ecef_to_geodetic, on_surface
+from .gpstime import to_gps_seconds
+
+C = 299792458.0
+MU = 3.986005e14            # WGS84 gravitational constant [m^3/s^2]
+OMEGA_E = 7.2921151467e-5   # Earth rotation rate [rad/s]
+REL_F = -4.442807633e-10    # relativistic clock constant [s/m^1/2]
+SECONDS_PER_WEEK = 604800
+F1 = 1575.42e6
+F2 = 1227.60e6
+
+MAX_AGE = 7200.0            # ephemerides further from toe are not used [s]
+ELEVATION_MASK = 10.0       # [deg]
+ITERATIONS = 10
+MIN_SATELLITES = 5
+MAX_PDOP = 6.0
+MAX_RMS = 20.0              # residual RMS of a usable epoch [m]
+
+# Broadcast orbit fields in file order (after the PRN / epoch / clock line)
+ORBIT_FIELDS = ('iode', 'crs', 'delta_n', 'm0', 'cuc', 'e', 'cus', 'sqrt_a',
+                'toe', 'cic', 'omega0', 'cis', 'i0', 'crc', 'omega', 'omega_dot',
+                'idot', 'l2_codes', 'week', 'l2p_flag', 'accuracy', 'health', 'tgd', 'iodc')
+NAV_NAME_RE = re.compile(r'(\d{3})\w?\.(\d{2})[nN]$')
+
+def _float(text):
+    text = text.strip().replace('D', 'E').replace('d', 'E')
+    return float(text) if text else 0.0
+
+def klobuchar(alpha, beta, lat, lon, azimuth, elevation, t):
+    """Ionospheric L1 delay [m] of the broadcast model (angles in degrees, ``t`` GPS seconds)"""
+    el = elevation / 180.0
+    psi = 0.0137 / (el + 0.11) - 0.022
+    lat_i = np.clip(lat / 180.0 + psi * np.cos(np.radians(azimuth)), -0.416, 0.416)
+    lon_i = lon / 180.0 + psi * np.sin(np.radians(azimuth)) / np.cos(lat_i * np.pi)
+    lat_m = lat_i + 0.064 * np.cos((lon_i - 1.617) * np.pi)
+    local = np.mod(4.32e4 * lon_i + t, 86400.0)
+    amplitude = np.maximum(sum(a * lat_m ** n for n, a in enumerate(alpha)), 0.0)
+    period = np.maximum(sum(b * lat_m ** n for n, b in enumerate(beta)), 72000.0)
+    x = 2 * np.pi * (local - 50400.0) / period
+    slant = 1.0 + 16.0 * (0.53 - el) ** 3
+    day = np.where(np.abs(x) < 1.57, amplitude * (1 - x ** 2 / 2 + x ** 4 / 24), 0.0)
+    return C * slant * (5e-9 + day)
+
+class Ephemerides:
+    """GPS broadcast ephemerides as arrays, one element per record"""
+    def __init__(self, records, ion=None):
+        self.ion = ion  # (ION ALPHA, ION BETA) of the header, None if missing
+        self.prn = np.array([r['prn'] for r in records], dtype=np.int64)
+        for name in ('toc', 'af0', 'af1', 'af2') + ORBIT_FIELDS:
+            setattr(self, name, np.array([r[name] for r in records], dtype=float))
+        # toe as GPS seconds (the week number of RINEX 2 is continuous)
+        self.toe_gps = self.week * SECONDS_PER_WEEK + self.toe
+
+    def __len__(self):
+        return len(self.prn)
+
+    def select(self, prns, times):
+        """Index of the nearest healthy ephemeris of each (time, satellite), -1 if none"""
+        index = np.full((len(times), len(prns)), -1, dtype=np.int64)
+        for j, prn in enumerate(prns):
+            candidates = np.flatnonzero((self.prn == prn) & (self.health == 0))
+            if not len(candidates):
+                continue
+            candidates = candidates[np.argsort(self.toe_gps[candidates], kind='stable')]
+            toe = self.toe_gps[candidates]
+            k = np.clip(np.searchsorted(toe, times), 1, len(toe)) - 1
+            later = np.minimum(k + 1, len(toe) - 1)
+            k = np.where(np.abs(toe[later] - times) < np.abs(toe[k] - times), later, k)
+            index[:, j] = np.where(np.abs(toe[k] - times) <= MAX_AGE, candidates[k], -1)
+        return index
+
+    def satellites(self, index, t):
+        """ECEF positions [m] and clock offsets [s] (without group delay) at GPS times ``t``"""
+        a = self.sqrt_a[index] ** 2
+        tk = t - self.toe_gps[index]
+        n = np.sqrt(MU / a ** 3) + self.delta_n[index]
+        m = self.m0[index] + n * tk
+        e = self.e[index]
+        big_e = m
+        for _ in range(10):
+            big_e = m + e * np.sin(big_e)
+        v = np.arctan2(np.sqrt(1 - e ** 2) * np.sin(big_e), np.cos(big_e) - e)
+        phi = v + self.omega[index]
+        sin2, cos2 = np.sin(2 * phi), np.cos(2 * phi)
+        u = phi + self.cus[index] * sin2 + self.cuc[index] * cos2
+        r = a * (1 - e * np.cos(big_e)) + self.crs[index] * sin2 + self.crc[index] * cos2
+        inc = self.i0[index] + self.cis[index] * sin2 + self.cic[index] * cos2 + self.idot[index] * tk
+        node = self.omega0[index] + (self.omega_dot[index] - OMEGA_E) * tk - OMEGA_E * self.toe[index]
+        x, y = r * np.cos(u), r * np.sin(u)
+        xyz = np.stack([x * np.cos(node) - y * np.cos(inc) * np.sin(node),
+                        x * np.sin(node) + y * np.cos(inc) * np.cos(node),
+                        y * np.sin(inc)], axis=-1)
+        dt = t - self.toc[index]
+        clock = (self.af0[index] + self.af1[index] * dt + self.af2[index] * dt ** 2
+                 + REL_F * e * self.sqrt_a[index] * np.sin(big_e))
+        return xyz, clock
+
+def read_navigation(path):
+    """Ephemerides of a RINEX 2 GPS navigation file"""
+    ion = {}
+    with open(path, 'r', encoding='ascii', errors='replace') as f:
+        for line in f:
+            label = line[60:80].strip()
+            if label in ('ION ALPHA', 'ION BETA'):
+                try:
+                    ion[label] = [_float(line[i:i + 12]) for i in (2, 14, 26, 38)]
+                except ValueError:
+                    pass
+            elif label == 'END OF HEADER':
+                break
+        lines = [line.rstrip('\r\n') for line in f if line.strip()]
+    records = []
+    for k in range(0, len(lines) - 7, 8):
+        head = lines[k].ljust(79)
+        try:
+            year = int(head[2:5])
+            year += 2000 if year < 80 else 1900
+            second = float(head[17:22])
+            toc = int(to_gps_seconds(year, int(head[5:8]), int(head[8:11]), int(head[11:14]),
+                                     int(head[14:17]))) + second
+            record = {'prn': int(head[0:2]), 'toc': toc,
+                      'af0': _float(head[22:41]), 'af1': _float(head[41:60]), 'af2': _float(head[60:79])}
+            values = [_float(line.ljust(79)[i:i + 19]) for line in lines[k + 1:k + 7] for i in (3, 22, 41, 60)]
+        except ValueError:
+            continue
+        record.update(zip(ORBIT_FIELDS, values))
+        records.append(record)
+    return Ephemerides(records, (ion['ION ALPHA'], ion['ION BETA']) if len(ion) == 2 else None)
+
+def pseudoranges(obs, eph_index, eph):
+    """Pseudoranges [m] (NaN where missing) and whether each is ionosphere-free"""
+    p1 = obs.get('P1')
+    c1 = obs.get('C1')
+    p2 = obs.get('P2')
+    code1 = p1 if p1 is not None else c1
+    if p1 is not None and c1 is not None:
+        code1 = np.where(np.isnan(p1), c1, p1)
+    if code1 is None:
+        raise ValueError('нет кодовых измерений C1/P1')
+    shape = code1.shape
+    if p2 is None:
+        p2 = np.full(shape, np.nan)
+    gamma = (F1 / F2) ** 2
+    free = (gamma * code1 - p2) / (gamma - 1)
+    tgd = np.where(eph_index >= 0, eph.tgd[np.maximum(eph_index, 0)], 0.0)
+    iono_free = ~np.isnan(free)
+    return np.where(iono_free, free, code1 - C * tgd), iono_free
+
+def solve_epochs(obs, eph):
+    """Position (E, 3), receiver clock [m], PDOP, residual RMS and satellite count of every epoch"""
+    obs = obs.system('G')
+    prns = [int(s[1:]) for s in obs.satellites]
+    t_rx = obs.epochs.astype(float)
+    index = eph.select(prns, t_rx)
+    pr, iono_free = pseudoranges(obs, index, eph)
+    valid = (index >= 0) & ~np.isnan(pr)
+    safe = np.maximum(index, 0)
+
+    t_tx = t_rx[:, None] - np.where(valid, pr, 0.0) / C
+    _, clock = eph.satellites(safe, t_tx)
+    t_tx = t_tx - clock
+    sat, clock = eph.satellites(safe, t_tx)
+
+    n_epochs, n_sat = pr.shape
+    x = np.zeros((n_epochs, 3))
+    b = np.zeros(n_epochs)
+    use = valid.copy()
+    near_surface = np.zeros(n_epochs, dtype=bool)
+    for iteration in range(ITERATIONS):
+        diff = sat - x[:, None, :]
+        tau = np.linalg.norm(diff, axis=2) / C
+        theta = OMEGA_E * tau
+        rotated = np.stack([sat[..., 0] * np.cos(theta) + sat[..., 1] * np.sin(theta),
+                            -sat[..., 0] * np.sin(theta) + sat[..., 1] * np.cos(theta),
+                            sat[..., 2]], axis=-1)
+        diff = rotated - x[:, None, :]
+        rho = np.linalg.norm(diff, axis=2)
+        tropo = np.zeros_like(rho)
+        if near_surface.any():
+            enu = ecef_to_enu(rotated.reshape(-1, 3), np.repeat(x, n_sat, axis=0)).reshape(n_epochs, n_sat, 3)
+            sin_el = enu[..., 2] / np.maximum(np.linalg.norm(enu, axis=2), 1.0)
+            high = sin_el > np.sin(np.radians(ELEVATION_MASK))
+            use = valid & np.where(near_surface[:, None], high, True)
+            tropo = np.where(near_surface[:, None], 2.3 / np.maximum(sin_el, 0.1), 0.0)
+            if eph.ion is not None and not iono_free.all():
+                lat, lon, _ = ecef_to_geodetic(x)
+                azimuth = np.degrees(np.arctan2(enu[..., 0], enu[..., 1]))
+                elevation = np.degrees(np.arcsin(np.clip(sin_el, 0.0, 1.0)))
+                iono = klobuchar(*eph.ion, lat[:, None], lon[:, None], azimuth, elevation, t_rx[:, None])
+                tropo = tropo + np.where(near_surface[:, None] & ~iono_free, iono, 0.0)
+        residual = np.where(use, pr - (rho + b[:, None] - C * clock + tropo), 0.0)
+        h = np.concatenate([-diff / np.maximum(rho, 1.0)[..., None], np.ones((n_epochs, n_sat, 1))], axis=2)
+        h = h * use[..., None]
+        normal = np.einsum('esi,esj->eij', h, h) + 1e-9 * np.eye(4)
+        step = np.linalg.solve(normal, np.einsum('esi,es->ei', h, residual)[..., None])[..., 0]
+        step[use.sum(axis=1) < 4] = 0.0  # too few satellites: leave the epoch alone
+        x += step[:, :3]
+        b += step[:, 3]
+        near_surface = on_surface(x)
+
+    count = use.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cofactor = np.linalg.inv(normal)
+        pdop = np.sqrt(np.trace(cofactor[:, :3, :3], axis1=1, axis2=2))
+        rms = np.sqrt((residual ** 2).sum(axis=1) / np.maximum(count - 4, 1))
+    return x, b, pdop, rms, count
+
+def daily_position(obs, eph):
+    """Robust position of a file: (XYZ, number of epochs used, 3D scatter [m]); None if unusable"""
+    x, _, pdop, rms, count = solve_epochs(obs, eph)
+    good = (count >= MIN_SATELLITES) & (pdop < MAX_PDOP) & (rms < MAX_RMS) & on_surface(x)
+    if not good.any():
+        return None
+    xyz = np.median(x[good], axis=0)
+    scatter = 1.4826 * np.median(np.linalg.norm(x[good] - xyz, axis=1))
+    return xyz, int(good.sum()), float(scatter)
+
+def navigation_file(obs_path, nav=None):
+    """GPS navigation file for an observation file: next to it (.YYN), else of the same day in ``nav``"""
+    base = obs_path[:-1]
+    for candidate in (base + 'n', base + 'N'):
+        if os.path.exists(candidate):
+            return candidate
+    if nav and os.path.isfile(nav):
+        return nav
+    if nav and os.path.isdir(nav):
+        name = os.path.basename(obs_path)
+        day = name[4:7], name[-3:-1]
+        for entry in sorted(os.listdir(nav)):
+            m = NAV_NAME_RE.search(entry)
+            if m and (m.group(1), m.group(2)) == day:
+                return os.path.join(nav, entry)
+    return None
+
+def spp_position(obs_path, nav=None, cache_dir=None):
+    """Daily SPP position of an observation file, None without navigation data or a solution"""
+    from .obscache import cached_observations
+    nav_path = navigation_file(obs_path, nav)
+    if nav_path is None:
+        return None
+    eph = read_navigation(nav_path)
+    if not len(eph):
+        return None
+    return daily_position(cached_observations(obs_path, cache_dir), eph)
+
+def fill_positions(stations, nav=None, cache_dir=None):
+    """Replace missing or implausible APPROX POSITION XYZ lines by SPP positions of the station's files.
+
+    One solution per station ID, from the first of its files that gives one;
+    returns {station ID: (XYZ, epochs, scatter) or None}.
+    """
+    from .geodesy import parse_xyz
+    from .header import get_station_id
+    bad = {}
+    for st, ok in zip(stations, on_surface(parse_xyz([st.xyz for st in stations]))):
+        if not ok:
+            bad.setdefault(get_station_id(st), []).append(st)
+    results = {}
+    for station_id, records in bad.items():
+        results[station_id] = None
+        for st in records:
+            try:
+                results[station_id] = spp_position(st.path, nav, cache_dir)
+            except (OSError, ValueError):
+                continue
+            if results[station_id] is not None:
+                break
+        if results[station_id] is not None:
+            x, y, z = results[station_id][0]
+            for st in records:
+                st.xyz = f'  {x:13.4f} {y:13.4f} {z:13.4f}'.ljust(60) + 'APPROX POSITION XYZ'
+    return results
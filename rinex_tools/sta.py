@@ -0,0 +1,245 @@
+FORMAT_VERSION = 1
+DEFAULT_DATE = '2005-01-01'
+
+def extract_date_from_filename(filename):
+    """Extract date from RINEX filename"""
+    from .gpstime import NO_TIME, format_date, parse_filename_days
+    day = parse_filename_days([filename])[0]
+    return DEFAULT_DATE if day == NO_TIME else format_date(day)[0]
+
+def station_epochs(stations):
+    """Observation span of each file as int64 GPS seconds arrays (start, end).
+
+    TIME OF FIRST/LAST OBS where present, else the day in the file name
+    (00:00:00 to 23:59:59), else DEFAULT_DATE.
+    """
+    import numpy as np
+    from .gpstime import (NO_TIME, SECONDS_PER_DAY, parse_filename_days, parse_obs_times,
+                          to_gps_seconds)
+    days = parse_filename_days([st.filename for st in stations])
+    year, month, day = (int(v) for v in DEFAULT_DATE.split('-'))
+    days = np.where(days == NO_TIME, to_gps_seconds(year, month, day), days)
+    first = parse_obs_times([st.header.get('TIME OF FIRST OBS', '') for st in stations])
+    last = parse_obs_times([st.header.get('TIME OF LAST OBS', '') for st in stations])
+    start = np.where(first == NO_TIME, days, first)
+    end = np.where(last == NO_TIME, days + SECONDS_PER_DAY - 1, last)
+    return start, end
+
+def file_epoch(station):
+    """Start of observations of a file: TIME OF FIRST OBS, else the date in its name"""
+    from .gpstime import to_datetime
+    return to_datetime(station_epochs([station])[0][0])
+
+def date_to_bernese_format(date_str):
+    """Convert date to Bernese format"""
+    try:
+        year, month, day = (int(v) for v in date_str.split('-'))
+        return f'{year:04d} {month:02d} {day:02d} 00 00 00'
+    except Exception:
+        return '0000 00 00 00 00 00'
+
+def parse_rec_fields(rec_line):
+    """Parse receiver fields"""
+    rec_serial = rec_line[0:6].strip()
+    rec_type = rec_line[20:40].strip()
+    return rec_serial, rec_type
+
+def parse_ant_fields(ant_line):
+    """Parse antenna fields"""
+    ant_serial = ant_line[0:6].strip()
+    ant_type = ant_line[20:40].strip()
+    return ant_serial, ant_type
+
+def parse_delta_hen(delta_line):
+    """Parse delta H/E/N values"""
+    up = delta_line[8:15].strip()
+    east = delta_line[22:29].strip()
+    north = delta_line[36:43].strip()
+    return up, east, north
+
+def group_periods(stations, keys):
+    """Span of each group of files: list of (first station, from, to) in key order.
+
+    Files are ordered by (key, start) with one lexsort; the first file of each
+    group gives its start and representative, the group end is the maximum end.
+    """
+    import numpy as np
+    if not stations:
+        return []
+    start, end = station_epochs(stations)
+    codes = {}
+    for key in sorted(set(keys)):
+        codes[key] = len(codes)
+    key_codes = np.array([codes[key] for key in keys])
+    order = np.lexsort((start, key_codes))
+    bounds = np.flatnonzero(np.diff(key_codes[order], prepend=-1))
+    to_dates = np.maximum.reduceat(end[order], bounds)
+    return [(stations[i], int(start[i]), int(t)) for i, t in zip(order[bounds].tolist(), to_dates.tolist())]
+
+def get_combined_periods(stations):
+    """Combine station periods"""
+    keys = [(st.marker_name[:4].strip(), st.marker_number[:9].strip()) for st in stations]
+    combined_periods = [{
+        'station_info': st,
+        'from_epoch': from_epoch,
+        'to_epoch': to_epoch,
+        'remark_filename': st.filename
+    } for st, from_epoch, to_epoch in group_periods(stations, keys)]
+    combined_periods.sort(key=lambda x: (x['station_info'].marker_name, x['station_info'].marker_number))
+    return combined_periods
+
+def format_sta_type_001(station_data, from_date, to_date):
+    """Format STA type 001 line"""
+    st = station_data['station_info']
+    remark_filename = station_data['remark_filename']
+    
+    name = st.marker_name[:4].strip()
+    number = st.marker_number[:9]  # Already padded to 9 chars in extract_station_info
+    station_id = f'{name} {number}'
+    flg = '001'
+    old_station_name = f'{name}*'
+    remark = f'From {remark_filename}'
+    
+    # Format with exact spacing
+    return (
+        f'{station_id:<20}' + '  ' # Station name (20 chars)
+        f'{flg:<3}' + '  ' +  # Flag (3 chars) + 2 spaces
+        f'{from_date:<17}' + '  ' +  # From date (17 chars) + 2 spaces
+        f'{to_date:<17}' + '  ' +  # To date (17 chars) + 2 spaces
+        f'{old_station_name:<20}' + '  ' +  # Old station name (20 chars) + 2 spaces
+        f'{remark:<24}'  # Remark (24 chars)
+    )
+
+def format_sta_type_002(station_data, from_date, to_date):
+    """Format STA type 002 line"""
+    st = station_data['station_info']
+    remark_filename = station_data['remark_filename']
+    
+    name = st.marker_name[:4].strip()
+    number = st.marker_number[:9]  # Already padded to 9 chars in extract_station_info
+    station_id = f'{name} {number}'
+    flg = '001'
+    rec_serial, rec_type = parse_rec_fields(st.receiver)
+    ant_serial, ant_type = parse_ant_fields(st.antenna)
+    up, east, north = parse_delta_hen(st.delta_hen)
+    description = f'{name} {number}'
+    remark = f'From {remark_filename}'
+    
+    # Format with exact spacing
+    return (
+        f'{station_id:<20}' + '  ' +  # Station name (20 chars) + 2 spaces
+        f'{flg:<3}' + '  ' +  # Flag (3 chars) + 2 spaces
+        f'{from_date:<17}' + '  ' +  # From date (17 chars) + 2 spaces
+        f'{to_date:<17}' + '  ' +  # To date (17 chars) + 2 spaces
+        f'{rec_type:<22}' +  # Receiver type (22 chars)
+        f'{rec_serial:<22}' +  # Receiver serial (22 chars)
+        f'{rec_serial:<8}' +  # REC # (8 chars)
+        f'{ant_type:<22}' +  # Antenna type (22 chars)
+        f'{ant_serial:<22}' +  # Antenna serial (22 chars)
+        f'{ant_serial:<6}' + ' ' +  # ANT # (6 chars) + 2 spaces
+        f'{north:>8}' + '   ' +  # North (8 chars) + 2 spaces
+        f'{east:>8}' + '  ' +  # East (8 chars) + 2 spaces
+        f'{up:>8}' + '  ' +  # Up (8 chars) + 2 spaces
+        f'{description:<24}' +  # Description (24 chars)
+        f'{remark:<24}'  # Remark (24 chars)
+    )
+
+def format_sta_type_003(station, from_date, to_date, remark):
+    """Format STA type 003 line; ``station`` is (4-char name, 9-char number)"""
+    name, number = station
+    station_id = f'{name} {number}'
+    flg = '001'
+    return (
+        f'{station_id:<20}' + '  ' +  # Station name (20 chars) + 2 spaces
+        f'{flg:<3}' + '  ' +  # Flag (3 chars) + 2 spaces
+        f'{from_date:<17}' + '  ' +  # From date (17 chars) + 2 spaces
+        f'{to_date:<17}' + '  ' +  # To date (17 chars) + 2 spaces
+        f'{remark[:60]}'  # Remark (60 chars)
+    )
+
+def format_problems(problems):
+    """TYPE 003 lines of (station, from, to, remark) intervals"""
+    from .gpstime import format_bernese
+    from_dates = format_bernese([p[1] for p in problems]) if problems else []
+    to_dates = format_bernese([p[2] for p in problems]) if problems else []
+    return [format_sta_type_003(p[0], f, t, p[3]) for p, f, t in zip(problems, from_dates, to_dates)]
+
+def get_type002_periods(stations):
+    """
+    Для каждой станции разбить периоды по уникальным комбинациям (RECEIVER TYPE, ANTENNA TYPE).
+    Период: от TIME OF FIRST OBS первого файла до TIME OF LAST OBS последнего
+    (по дню из имени файла, если времени в заголовке нет).
+    """
+    keys = [(st.marker_name[:4].strip(), parse_rec_fields(st.receiver)[1], parse_ant_fields(st.antenna)[1])
+            for st in stations]
+    type002_periods = [{
+        'station_info': st,
+        'from_epoch': from_epoch,
+        'to_epoch': to_epoch,
+        'remark_filename': st.filename
+    } for st, from_epoch, to_epoch in group_periods(stations, keys)]
+    # Сортируем итоговый список по STATION NAME для последовательности в файле
+    type002_periods.sort(key=lambda x: (x['station_info'].marker_name, x['station_info'].marker_number, x['from_epoch']))
+    return type002_periods
+
+def format_periods(periods, formatter):
+    """Format period lines; epochs are converted to Bernese strings in one pass"""
+    from .gpstime import format_bernese
+    from_dates = format_bernese([p['from_epoch'] for p in periods]) if periods else []
+    to_dates = format_bernese([p['to_epoch'] for p in periods]) if periods else []
+    return [formatter(p, f, t) for p, f, t in zip(periods, from_dates, to_dates)]
+
+def save_sta_file(combined_periods, output_path, stations=None, problems=None):
+    """Save the STA file with the formatted station information.
+
+    ``problems``: TYPE 003 intervals (station, from, to, remark), see problems.station_problems.
+    """
+    header = (
+        'STATION INFORMATION FILE                                         03-JAN-24 22:57\n'
+        '--------------------------------------------------------------------------------\n\n'
+        'FORMAT VERSION: 1.01\n'
+        'TECHNIQUE:      GNSS\n\n'
+        'TYPE 001: RENAMING OF STATIONS\n'
+        '------------------------------\n\n'
+        'STATION NAME          FLG          FROM                   TO         OLD STATION NAME      REMARK\n'
+        '****************      ***  YYYY MM DD HH MM SS  YYYY MM DD HH MM SS  ********************  ************************\n'
+    )
+    type2_header = (
+        '\n\nTYPE 002: STATION INFORMATION\n'
+        '--------------------------------------\n\n'
+        'STATION NAME          FLG          FROM                   TO         RECEIVER TYPE         RECEIVER SERIAL NBR   REC #   ANTENNA TYPE          ANTENNA SERIAL NBR    ANT #    NORTH      EAST      UP      DESCRIPTION             REMARK\n'
+        '****************      ***  YYYY MM DD HH MM SS  YYYY MM DD HH MM SS  ********************  ********************  ******  ********************  ********************  ******  ***.****  ***.****  ***.****  **********************  ************************\n'
+    )
+    type3 = (
+        '\n\nTYPE 003: HANDLING OF STATION PROBLEMS\n'
+        '--------------------------------------\n\n'
+        'STATION NAME          FLG          FROM                   TO         REMARK\n'
+        '****************      ***  YYYY MM DD HH MM SS  YYYY MM DD HH MM SS  ************************************************************\n'
+    )
+    type4 = (
+        '\n\nTYPE 004: STATION COORDINATES AND VELOCITIES (ADDNEQ)\n'
+        '--------------------------------------\n'
+        '                                            RELATIVE CONSTR. POSITION     RELATIVE CONSTR. VELOCITY\n'
+        'STATION NAME 1        STATION NAME 2        NORTH     EAST      UP        NORTH     EAST      UP\n'
+        '****************      ****************      **.*****  **.*****  **.*****  **.*****  **.*****  **.*****\n'
+    )
+    type5 = (
+        '\n\nTYPE 005: HANDLING STATION TYPES\n'
+        '--------------------------------------\n\n'
+        'STATION NAME          FLG  FROM                 TO                   MARKER TYPE           REMARK\n'
+        '****************      ***  YYYY MM DD HH MM SS  YYYY MM DD HH MM SS  ********************  ************************\n'
+    )
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(header)
+        for line in format_periods(combined_periods, format_sta_type_001):
+            f.write(line + '\n')
+        f.write(type2_header)
+        # TYPE 002: используем periods по receiver/antenna
+        type002_periods = get_type002_periods(stations) if stations is not None else combined_periods
+        for line in format_periods(type002_periods, format_sta_type_002):
+            f.write(line + '\n')
+        f.write(type3)
+        for line in format_problems(problems or []):
+            f.write(line + '\n')
+        f.write(type4)
+        f.write(type5)
@@ -0,0 +1,54 @@
+"""Startup-time budget check: ``python -m rinex_tools.startup [--budget-ms 60]``.
+
+Measures how much ``python -m rinex_tools --version`` costs on top of a bare
+interpreter start and checks that importing the CLI does not pull in NumPy.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+# Overhead of the CLI over ``python -c pass``, in milliseconds
+DEFAULT_BUDGET_MS = 60.0
+
+def measure(cmd, runs):
+    """Median wall time of a command in milliseconds"""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        times.append((time.perf_counter() - start) * 1000.0)
+    return statistics.median(times)
+
+def heavy_modules_loaded():
+    """Heavy modules imported as a side effect of importing the CLI"""
+    code = (
+        'import sys, rinex_tools.cli, rinex_tools.sta, rinex_tools.crd, rinex_tools.abb, '
+        'rinex_tools.clu, rinex_tools.pld, rinex_tools.vel; '
+        'print(" ".join(m for m in ("numpy", "scipy") if m in sys.modules))'
+    )
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Проверка времени запуска rinex-tools')
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument('--runs', type=int, default=15)
+    args = parser.parse_args(argv)
+
+    bare = measure([sys.executable, '-c', 'pass'], args.runs)
+    cli = measure([sys.executable, '-m', 'rinex_tools', '--version'], args.runs)
+    overhead = cli - bare
+    print(f'python -c pass:            {bare:7.1f} ms')
+    print(f'python -m rinex_tools:     {cli:7.1f} ms')
+    print(f'overhead (budget {args.budget_ms:.0f} ms): {overhead:7.1f} ms')
+
+    heavy = heavy_modules_loaded()
+    if heavy:
+        print(f'Heavy modules imported at load time: {", ".join(heavy)}')
+        return 1
+    return 0 if overhead <= args.budget_ms else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
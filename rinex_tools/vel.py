@@ -0,0 +1,73 @@
+from .header import get_station_id, unique_stations
+
+FORMAT_VERSION = 1
+DEFAULT_OMEGA = (-4.128e-10, -2.516e-9, 3.648e-9)  # rad/year
+
+def parse_xyz_coordinates_float(xyz_line):
+    """Parse X, Y, Z coordinates from APPROX POSITION XYZ line as floats"""
+    if xyz_line == '-':
+        return 0.0, 0.0, 0.0
+    x = xyz_line[2:15].strip()
+    y = xyz_line[16:29].strip()
+    z = xyz_line[30:43].strip()
+    try:
+        x = float(x)
+        y = float(y)
+        z = float(z)
+    except ValueError:
+        x = y = z = 0.0
+    return x, y, z
+
+def format_vel_line(num, station_id, vx, vy, vz, plate_name):
+    """Format a line for the VEL file with velocities"""
+    station_name = station_id[:4]
+    station_number = station_id[4:]
+    if num < 10:
+        num_str = f"  {num}"
+    else:
+        num_str = f" {num}"
+    return (
+        f"{num_str}  "
+        f"{station_name} {station_number:<9}    "
+        f"{vx:13.5f}  "
+        f"{vy:13.5f}  "
+        f"{vz:13.5f}    "
+        f"{'V'}    "   # FLAG space
+        f"{plate_name}"
+    )
+
+def station_velocities(xyz, station_ids, plate_name, plates=None):
+    """Velocities [m/year] of (N, 3) positions and the plate name of each station.
+
+    Stations with a plate in ``plates`` (station ID -> NUVEL-1A plate) get the
+    NNR-NUVEL-1A velocity of that plate, the others ``plate_name`` and its
+    velocity; the default pole only when ``plate_name`` is not a NUVEL-1A plate.
+    """
+    import numpy as np  # Heavy import, only needed for velocities
+    from .plates import NNR_NUVEL1A
+
+    names = [(plates or {}).get(station_id) or plate_name for station_id in station_ids]
+    omegas = np.array([np.array(NNR_NUVEL1A[p]) * 1e-6 if p in NNR_NUVEL1A else DEFAULT_OMEGA
+                       for p in names], dtype=float).reshape(-1, 3)
+    velocities = np.cross(omegas, np.asarray(xyz, dtype=float).reshape(-1, 3))
+    return velocities, names
+
+def save_vel_file(stations, output_path, plate_name, plates=None):
+    """Save the VEL file with calculated velocities"""
+    header = (
+        "NUVEL1A-NNR VELOCITIES                                           14-DEC-23 19:25\n"
+        "--------------------------------------------------------------------------------\n"
+        "LOCAL GEODETIC DATUM: IGS14           \n\n"
+        "NUM  STATION NAME           VX (M/Y)       VY (M/Y)       VZ (M/Y)  FLAG   PLATE\n\n"
+    )
+    stations = unique_stations(stations)
+    station_ids = [get_station_id(station) for station in stations]
+    from .geodesy import parse_xyz
+    xyz = parse_xyz([station.xyz for station in stations])
+    velocities, plate_names = station_velocities(xyz, station_ids, plate_name, plates)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(header)
+        for i, (station_id, v, plate) in enumerate(zip(station_ids, velocities, plate_names), 1):
+            vx, vy, vz = v
+            line = format_vel_line(i, station_id, vx, vy, vz, plate)
+            f.write(line + '\n')
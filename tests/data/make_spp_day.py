@@ -0,0 +1,151 @@
+"""Generate SPPT0700.05O/.05N: four hours of C1/P2 codes of a station at a known position.
+
+Orbits are Keplerian ellipses of a 31-satellite constellation and the
+ionosphere is the Klobuchar model written out step by step from IS-GPS-200,
+both evaluated here independently of ``rinex_tools.spp``; the codes carry the
+satellite clocks, a receiver clock, the troposphere and ionosphere delays,
+0.5 m noise and a few 300 m outliers. The header position is bogus,
+so ``--spp`` has to replace it. Run with ``python tests/data/make_spp_day.py``.
+"""
+import datetime
+import math
+import os
+
+import numpy as np
+
+TRUE_XYZ = (933553.2352, 4537134.4414, 4370797.2936)
+C = 299792458.0
+F1 = 1575.42e6
+F2 = 1227.60e6
+MU = 3.986005e14
+REL_F = -4.442807633e-10
+OMEGA_E = 7.2921151467e-5
+ALPHA = (0.382e-7, 0.149e-7, -0.179e-6, 0.0)
+BETA = (0.143e6, 0.0, -0.328e6, 0.113e6)
+START = datetime.datetime(2005, 3, 11)
+HOURS = 4
+INTERVAL = 120
+OUT = os.path.dirname(os.path.abspath(__file__))
+
+def nav_number(value, width=19, digits=12):
+    return f'{value:{width}.{digits}E}'.replace('E', 'D')
+
+def ionosphere(lat, lon, azimuth, elevation, t):
+    """L1 delay [m] of the broadcast model, IS-GPS-200 20.3.3.5.2.5 (degrees, GPS seconds)"""
+    e = elevation / 180.0  # semicircles
+    psi = 0.0137 / (e + 0.11) - 0.022
+    phi_i = lat / 180.0 + psi * math.cos(math.radians(azimuth))
+    phi_i = min(max(phi_i, -0.416), 0.416)
+    lambda_i = lon / 180.0 + psi * math.sin(math.radians(azimuth)) / math.cos(phi_i * math.pi)
+    phi_m = phi_i + 0.064 * math.cos((lambda_i - 1.617) * math.pi)
+    local_time = (4.32e4 * lambda_i + t) % 86400.0
+    amp = max(ALPHA[0] + ALPHA[1] * phi_m + ALPHA[2] * phi_m ** 2 + ALPHA[3] * phi_m ** 3, 0.0)
+    per = max(BETA[0] + BETA[1] * phi_m + BETA[2] * phi_m ** 2 + BETA[3] * phi_m ** 3, 72000.0)
+    x = 2 * math.pi * (local_time - 50400.0) / per
+    f = 1.0 + 16.0 * (0.53 - e) ** 3
+    if abs(x) >= 1.57:
+        return C * f * 5e-9
+    return C * f * (5e-9 + amp * (1 - x ** 2 / 2 + x ** 4 / 24))
+
+def position(el, t):
+    """ECEF position and clock at ``t`` seconds after START of a Keplerian ephemeris"""
+    a = el['sqrt_a'] ** 2
+    m = el['m0'] + (np.sqrt(MU / a ** 3) + el['delta_n']) * (t - el['toe'])
+    big_e = m
+    for _ in range(30):
+        big_e = m + el['e'] * np.sin(big_e)
+    v = np.arctan2(np.sqrt(1 - el['e'] ** 2) * np.sin(big_e), np.cos(big_e) - el['e'])
+    u = v + el['omega']
+    r = a * (1 - el['e'] * np.cos(big_e))
+    node = el['omega0'] + (el['omega_dot'] - OMEGA_E) * (t - el['toe']) - OMEGA_E * el['toe_week']
+    x, y = r * np.cos(u), r * np.sin(u)
+    clock = el['af0'] + el['af1'] * (t - el['toe']) + REL_F * el['e'] * el['sqrt_a'] * np.sin(big_e)
+    return np.array([x * np.cos(node) - y * np.cos(el['i0']) * np.sin(node),
+                     x * np.sin(node) + y * np.cos(el['i0']) * np.cos(node),
+                     y * np.sin(el['i0'])]), clock
+
+def main():
+    rng = np.random.default_rng(7)
+    gps_start = (START - datetime.datetime(1980, 1, 6)).total_seconds()
+    week, start_of_week = divmod(gps_start, 604800)
+    nav = ['     2.10           N: GPS NAV DATA                         RINEX VERSION / TYPE',
+           '  ' + ''.join(nav_number(v, 12, 4) for v in ALPHA) + ' ' * 10 + 'ION ALPHA',
+           '  ' + ''.join(nav_number(v, 12, 4) for v in BETA) + ' ' * 10 + 'ION BETA',
+           ' ' * 60 + 'END OF HEADER']
+    ephemerides = {}
+    for prn in range(1, 32):
+        plane, slot = (prn - 1) % 6, (prn - 1) // 6
+        orbit = dict(sqrt_a=5153.6 + rng.normal(0, 2), e=rng.uniform(0.001, 0.02),
+                     i0=np.radians(55 + rng.normal(0, 1)), omega=rng.uniform(-3, 3),
+                     omega_dot=-8e-9, delta_n=4.5e-9, af0=rng.normal(0, 1e-4), af1=1e-12)
+        n = np.sqrt(MU / orbit['sqrt_a'] ** 6) + orbit['delta_n']
+        for hour in range(0, HOURS + 1, 2):
+            t = hour * 3600.0
+            el = dict(orbit, toe=t, toe_week=start_of_week + t, m0=slot * np.pi / 3 + plane * 0.3 + n * t,
+                      omega0=plane * np.pi / 3 + orbit['omega_dot'] * t)
+            ephemerides.setdefault(prn, []).append(el)
+            nav.append(f'{prn:2d} 05 03 11 {hour:2d}  0  0.0'
+                       + ''.join(nav_number(v) for v in (orbit['af0'], orbit['af1'], 0.0)))
+            values = [0, 0, el['delta_n'], el['m0'], 0, el['e'], 0, el['sqrt_a'],
+                      start_of_week + t, 0, el['omega0'], 0, el['i0'], 0, el['omega'], el['omega_dot'],
+                      0, 0, week, 0, 2, 0, 0, 0]
+            nav.extend('   ' + ''.join(nav_number(v) for v in values[k:k + 4]) for k in range(0, 24, 4))
+            nav.append('   ' + nav_number(0.0) + nav_number(4.0))
+    with open(os.path.join(OUT, 'SPPT0700.05N'), 'w', encoding='ascii') as f:
+        f.write('\n'.join(nav) + '\n')
+
+    true = np.array(TRUE_XYZ)
+    obs = ['     2.10           OBSERVATION DATA    G (GPS)             RINEX VERSION / TYPE',
+           'SPPT'.ljust(60) + 'MARKER NAME',
+           '99999M001'.ljust(60) + 'MARKER NUMBER',
+           '1                   TRIMBLE NETR9       4.85                REC # / TYPE / VERS',
+           '1                   TRM59800.00     NONE                    ANT # / TYPE',
+           '  1000000.0000  1000000.0000        0.0000'.ljust(60) + 'APPROX POSITION XYZ',
+           '        0.0000        0.0000        0.0000                  ANTENNA: DELTA H/E/N',
+           '     2    C1    P2                                          # / TYPES OF OBSERV',
+           f'{INTERVAL:10.3f}'.ljust(60) + 'INTERVAL',
+           '  2005     3    11     0     0    0.0000000     GPS         TIME OF FIRST OBS',
+           ' ' * 60 + 'END OF HEADER']
+    for k in range(HOURS * 3600 // INTERVAL):
+        t = k * INTERVAL
+        receiver_clock = 1e-4 * C * np.sin(k / 30)
+        sats, records = [], []
+        for prn, els in ephemerides.items():
+            el = min(els, key=lambda e: abs(e['toe'] - t))
+            tau = 0.075
+            sat_clock = 0.0
+            for _ in range(5):
+                _, sat_clock = position(el, t - tau)
+                p, sat_clock = position(el, t - tau - sat_clock)
+                theta = OMEGA_E * tau
+                p = np.array([p[0] * np.cos(theta) + p[1] * np.sin(theta),
+                              -p[0] * np.sin(theta) + p[1] * np.cos(theta), p[2]])
+                tau = np.linalg.norm(p - true) / C
+            lat, lon = np.radians(43.529), np.radians(78.373)
+            d = p - true
+            east = -np.sin(lon) * d[0] + np.cos(lon) * d[1]
+            north = -np.sin(lat) * np.cos(lon) * d[0] - np.sin(lat) * np.sin(lon) * d[1] + np.cos(lat) * d[2]
+            up = np.cos(lat) * np.cos(lon) * d[0] + np.cos(lat) * np.sin(lon) * d[1] + np.sin(lat) * d[2]
+            sin_el = up / np.linalg.norm(d)
+            if sin_el < np.sin(np.radians(5)):
+                continue
+            iono = ionosphere(43.529, 78.373, np.degrees(np.arctan2(east, north)),
+                              np.degrees(np.arcsin(sin_el)), gps_start + t)
+            base = np.linalg.norm(d) + receiver_clock - C * sat_clock + 2.3 / sin_el
+            c1 = base + iono + rng.normal(0, 0.5)
+            p2 = base + iono * (F1 / F2) ** 2 + rng.normal(0, 0.5)
+            if k % 25 == 7 and not records:
+                c1 += 300.0
+            sats.append(f'G{prn:2d}')
+            records.append(f'{c1:14.3f}  {p2:14.3f}')
+        hour, rest = divmod(t, 3600)
+        minute, second = divmod(rest, 60)
+        sat_text = ''.join(sats)
+        obs.append(f' 05  3 11 {hour:2d} {minute:2d} {second:10.7f}  0{len(sats):3d}{sat_text[:36]}')
+        obs.extend(' ' * 32 + sat_text[i:i + 36] for i in range(36, len(sat_text), 36))
+        obs.extend(records)
+    with open(os.path.join(OUT, 'SPPT0700.05O'), 'w', encoding='ascii') as f:
+        f.write('\n'.join(obs) + '\n')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+import pytest
+
+from rinex_tools.abb import SEQUENCE_IDS, AbbreviationAllocator, read_abb_file, save_abb_file
+from rinex_tools.header import StationInfo
+
+def station(name, number):
+    return StationInfo(name, number.ljust(9), '-', '-', '-', '-', f'{name}0010.24O', {})
+
+def assignments(path):
+    return dict(read_abb_file(str(path)).ids)
+
+def test_ids_are_stable_across_partial_runs(tmp_path):
+    abb = tmp_path / 'T.ABB'
+    everyone = [station('CHUM', '25601M001'), station('AAC4', 'AACH'), station('CHLK', 'CHLK'),
+                station('ULAB', '24201M001'), station('PERT', '50133M001'), station('WSRT', '13506M005')]
+    save_abb_file(everyone, str(abb))
+    first = assignments(abb)
+
+    save_abb_file(everyone[3:5], str(abb))               # part of the network
+    assert assignments(abb) == first                     # the others are kept in the file
+    save_abb_file([station('NEW1', '99999M001')], str(abb))
+    save_abb_file(everyone, str(abb))
+    final = assignments(abb)
+    assert {k: final[k] for k in first} == first
+    assert final['NEW199999M001'][1] not in {id2 for _, id2 in first.values()}
+
+def test_colliding_4ids_get_distinct_replacements():
+    allocator = AbbreviationAllocator()
+    ids = [allocator.allocate(f'ABCD{n}')[0] for n in range(5)]
+    assert ids[0] == 'ABCD'
+    assert len(set(ids)) == 5
+
+def test_2ids_are_never_shared():
+    allocator = AbbreviationAllocator()
+    id2s = [allocator.allocate(f'S{i:04d}')[1] for i in range(len(SEQUENCE_IDS))]
+    assert len(set(id2s)) == len(SEQUENCE_IDS)
+    with pytest.raises(ValueError):
+        allocator.allocate('LAST')
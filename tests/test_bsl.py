@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+
+from rinex_tools.availability import build_sessions
+from rinex_tools.bsl import minimum_network, save_bsl_file
+from rinex_tools.gpstime import from_year_doy
+from rinex_tools.header import StationInfo
+from rinex_tools.kdtree import KDTree
+
+def brute_force(points, k):
+    d = np.linalg.norm(points[:, None] - points[None], axis=2)
+    np.fill_diagonal(d, np.inf)
+    return np.sort(d, axis=1)[:, :k]
+
+def spherical(n, seed):
+    """Points near the Earth's surface, denser in a few regions like real networks"""
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(5, 3))
+    v = centres[rng.integers(0, 5, n)] + 0.3 * rng.normal(size=(n, 3))
+    return 6.371e6 * v / np.linalg.norm(v, axis=1)[:, None]
+
+@pytest.mark.parametrize('n, k, leaf_size', [(1, 3, 32), (5, 8, 32), (200, 1, 4), (500, 8, 32), (500, 20, 7)])
+def test_query_matches_brute_force(n, k, leaf_size):
+    points = spherical(n, n)
+    distances, indices = KDTree(points, leaf_size).query(k)
+    k = min(k, n - 1)
+    assert distances.shape == indices.shape == (n, k)
+    np.testing.assert_allclose(distances, brute_force(points, k), rtol=1e-12)
+    # The indices point at points at those distances, never at the point itself
+    assert (indices != np.arange(n)[:, None]).all()
+    np.testing.assert_allclose(np.linalg.norm(points[indices] - points[:, None], axis=2), distances, rtol=1e-12)
+
+def test_query_with_duplicate_points():
+    points = np.repeat(spherical(50, 1), 3, axis=0)
+    distances, _ = KDTree(points, 8).query(4)
+    np.testing.assert_allclose(distances, brute_force(points, 4), rtol=1e-12)
+    assert (distances[:, :2] == 0).all()
+
+def mst_length(points):
+    """Prim's algorithm on all pairs"""
+    d = np.linalg.norm(points[:, None] - points[None], axis=2)
+    n = len(points)
+    inside = np.zeros(n, dtype=bool)
+    inside[0] = True
+    best = d[0].copy()
+    total = 0.0
+    for _ in range(n - 1):
+        j = int(np.argmin(np.where(inside, np.inf, best)))
+        total += best[j]
+        inside[j] = True
+        best = np.minimum(best, d[j])
+    return total
+
+def is_spanning_tree(edges, n):
+    parent = list(range(n))
+    def root(i):
+        while parent[i] != i:
+            i = parent[i]
+        return i
+    for a, b in edges:
+        ra, rb = root(a), root(b)
+        if ra == rb:
+            return False
+        parent[ra] = rb
+    return len(edges) == n - 1
+
+def same_time(i, j):
+    return np.full(len(i), 86400.0)
+
+def test_minimum_network_is_the_minimum_spanning_tree():
+    points = spherical(300, 2)
+    edges = minimum_network(points, same_time)
+    assert is_spanning_tree(edges, len(points))
+    length = sum(np.linalg.norm(points[a] - points[b]) for a, b in edges)
+    assert length == pytest.approx(mst_length(points), rel=1e-9)
+
+def test_separate_regions_are_joined_by_their_shortest_baseline():
+    rng = np.random.default_rng(3)
+    west = np.array([6.371e6, 0, 0]) + rng.normal(0, 1e4, (20, 3))
+    east = np.array([0, 6.371e6, 0]) + rng.normal(0, 1e4, (20, 3))
+    points = np.vstack([west, east])
+    edges = minimum_network(points, same_time)
+    assert is_spanning_tree(edges, 40)
+    crossing = [(a, b) for a, b in edges if (a < 20) != (b < 20)]
+    assert len(crossing) == 1
+    d = np.linalg.norm(west[:, None] - east[None], axis=2)
+    a, b = crossing[0]
+    assert np.linalg.norm(points[a] - points[b]) == pytest.approx(d.min())
+
+def test_common_time_is_preferred_and_stations_without_it_stay_alone():
+    points = np.array([[6.371e6, 0, 0], [6.371e6, 1e4, 0], [6.371e6, 0, 1.2e4], [6.371e6, 3e4, 3e4]])
+    hours = np.array([24.0, 2.0, 24.0, 0.0]) * 3600
+    edges = minimum_network(points, lambda i, j: np.minimum(hours[i], hours[j]))
+    # 0-2 is longer than 0-1 but has twelve times the common data, 1 joins by its
+    # shorter baseline; station 3 has no common data and stays alone
+    assert edges == [(0, 1), (0, 2)]
+
+def station(name, xyz):
+    return StationInfo(name, '', '', '', ''.join(f'{c:14.4f}' for c in xyz), '', f'{name}0010.24O', {})
+
+def test_sessions_use_the_real_overlap_and_skip_days_without_baselines(tmp_path):
+    a = np.array([2.8e6, 1.5e6, 5.5e6])
+    stations = [station('AAAA', a), station('BBBB', a + [1e3, 0, 0]), station('CCCC', a + [0, 5e3, 0])]
+    day = from_year_doy(2024, 1)
+    half = np.arange(0, 43200, 30)
+    sessions = build_sessions([('AAAA', day + half), ('BBBB', day + 43200 + half),
+                               ('CCCC', day + np.arange(0, 86400, 30)), ('AAAA', day + 86400 + half)])
+    written = save_bsl_file(stations, str(tmp_path / 'NET.BSL'), sessions)
+    # A and B are closest, but never observed at the same time: both join C
+    assert written == [str(tmp_path / 'NET_2024001.BSL')]
+    assert (tmp_path / 'NET_2024001.BSL').read_text() == 'AAAA             CCCC\nBBBB             CCCC\n'
+    assert not (tmp_path / 'NET.BSL').exists()
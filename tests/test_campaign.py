@@ -0,0 +1,45 @@
+import os
+
+from rinex_tools.cli import main
+
+HEADER = """\
+     2.10           OBSERVATION DATA    G (GPS)             RINEX VERSION / TYPE
+{name:<60}MARKER NAME
+{number:<60}MARKER NUMBER
+1234                TRIMBLE NETR9       4.85                REC # / TYPE / VERS
+5678                TRM59800.00     NONE                    ANT # / TYPE
+{xyz:<60}APPROX POSITION XYZ
+        0.0000        0.0000        0.0000                  ANTENNA: DELTA H/E/N
+     2    L1    C1                                          # / TYPES OF OBSERV
+  2024     1     1     0     0    0.0000000     GPS         TIME OF FIRST OBS
+                                                            END OF HEADER
+"""
+
+def write_rinex(path, name, number, xyz):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='ascii') as f:
+        f.write(HEADER.format(name=name, number=number, xyz=xyz))
+
+def test_campaign_from_registry_with_nested_input(tmp_path):
+    input_dir = tmp_path / 'input'
+    write_rinex(str(input_dir / 'a' / 'ABCD0010.24O'), 'ABCD', '10001M001',
+                '  3800000.0000  2500000.0000  4500000.0000')
+    write_rinex(str(input_dir / 'b' / 'c' / 'EFGH001a.24O'), 'EFGH', '10002M001',
+                '  3810000.0000  2490000.0000  4495000.0000')
+    registry = str(tmp_path / 'registry.json')
+    assert main(['shard', '-i', str(input_dir), '--count', '1', '--index', '0', '-o', registry]) == 0
+
+    campaign = tmp_path / 'CAMP'
+    args = ['all', '--registry', registry, '-i', str(input_dir), '-n', 'T', '-p', 'EURA',
+            '--campaign', str(campaign)]
+    assert main(args) == 0
+    raw = campaign / 'RAW'
+    assert sorted(os.listdir(raw)) == ['ABCD0010.24O', 'EFGH001A.24O']
+    assert os.path.samefile(raw / 'ABCD0010.24O', input_dir / 'a' / 'ABCD0010.24O')
+    assert os.path.samefile(raw / 'EFGH001A.24O', input_dir / 'b' / 'c' / 'EFGH001a.24O')
+    assert (campaign / 'STA' / 'T.ABB').exists()
+
+    # A second run finds everything in place
+    mtime = os.stat(raw / 'ABCD0010.24O').st_mtime_ns
+    assert main(args) == 0
+    assert os.stat(raw / 'ABCD0010.24O').st_mtime_ns == mtime
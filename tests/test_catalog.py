@@ -0,0 +1,25 @@
+from rinex_tools.catalog import apply_catalog, check_stations, load_catalog
+from rinex_tools.header import StationInfo
+
+CATALOG = '''station,start,end,receiver_type,receiver_serial,antenna_type,radome,antenna_serial,up,north,east
+CHUM,2020-01-01,,TRIMBLE NETR9,,TRM59800.00,,,0.0100,,
+'''
+
+def station():
+    receiver = f"{'5035K69745':<20}{'TRIMBLE NETR8':<20}{'4.85':<20}REC # / TYPE / VERS"
+    antenna = f"{'1440911917':<20}{'TRM57971.00':<16}{'SCIS':<4}{'':<20}ANT # / TYPE"
+    delta = f"{0.0:14.4f}{0.0:14.4f}{0.0:14.4f}{'':<18}ANTENNA: DELTA H/E/N"
+    return StationInfo('CHUM', '25601M001', receiver, antenna, '', delta, 'CHUM0010.23O', {})
+
+def test_empty_catalog_fields_keep_the_header_values(tmp_path):
+    path = tmp_path / 'catalog.csv'
+    path.write_text(CATALOG)
+    catalog = load_catalog(str(path))
+    st = station()
+    assert apply_catalog([st], catalog) == 1
+    assert st.receiver == f"{'5035K69745':<20}{'TRIMBLE NETR9':<20}{'4.85':<20}REC # / TYPE / VERS"
+    assert st.antenna == f"{'1440911917':<20}{'TRM59800.00':<16}{'SCIS':<4}{'':<20}ANT # / TYPE"
+    assert st.delta_hen == f"{0.01:14.4f}{0.0:14.4f}{0.0:14.4f}{'':<18}ANTENNA: DELTA H/E/N"
+    assert st.header['ANT # / TYPE'] == st.antenna
+    # After the fix the file agrees with the catalog
+    assert not check_stations([st], catalog)
@@ -0,0 +1,7 @@
+from rinex_tools.gpstime import NO_TIME, format_date, parse_filename_days
+
+def test_filename_days_use_the_standard_name_only():
+    days = parse_filename_days(['BIK00450.05O', 'ZIM21000.13O', 'AAC41360.05O', 'data/chum0010.24o',
+                                'BIK00450.2005O', 'report.05O'])
+    assert list(format_date(days[:4])) == ['2005-02-14', '2013-04-10', '2005-05-16', '2024-01-01']
+    assert list(days[4:]) == [NO_TIME, NO_TIME]
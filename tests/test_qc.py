@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from rinex_tools.obs import Observations
+from rinex_tools.qc import ALPHA, MIN_ARC, WL1, WL2, file_qc, find_slips, multipath
+
+TYPES = ['L1', 'L2', 'P1', 'P2', 'S1', 'S2']
+EPOCHS = 240
+INTERVAL = 30
+
+def make_obs(mp1=0.0, mp2=0.0, l1_jump=None, lli_epoch=None, gap=None):
+    """One GPS satellite: smooth range and ionosphere, phases with ambiguities, codes with multipath"""
+    t = np.arange(EPOCHS) * INTERVAL
+    rho = 2.2e7 + 500.0 * t + 0.05 * t ** 2 / 60
+    iono = 5.0 + 2.0 * np.sin(t / 3000.0)
+    l1 = (rho - iono) / WL1 + 1234567
+    l2 = (rho - ALPHA * iono) / WL2 + 7654321
+    if l1_jump is not None:
+        l1[l1_jump:] += 1  # one cycle
+    values = np.stack([l1, l2, rho + iono + mp1, rho + ALPHA * iono + mp2,
+                       np.full(EPOCHS, 45.0), np.full(EPOCHS, 38.0)], axis=1)[:, None, :]
+    lli = np.zeros(values.shape, dtype=np.int8)
+    if lli_epoch is not None:
+        lli[lli_epoch, 0, 0] = 1
+    epochs = (7 * 86400 + t).astype(np.int64)
+    if gap is not None:
+        epochs[gap:] += 600
+    return Observations(epochs, ['G05'], TYPES, values, lli, np.zeros_like(lli), INTERVAL, 'TEST0010.24O')
+
+def test_multipath_is_the_code_error_plus_a_constant():
+    rng = np.random.default_rng(1)
+    noise1, noise2 = rng.normal(0, 0.3, EPOCHS), rng.normal(0, 0.5, EPOCHS)
+    mp1, mp2 = multipath(make_obs(noise1, noise2))
+    # Geometry and ionosphere cancel; only the ambiguities remain as an offset
+    np.testing.assert_allclose(mp1[:, 0] - mp1[0, 0], noise1 - noise1[0], atol=1e-3)
+    np.testing.assert_allclose(mp2[:, 0] - mp2[0, 0], noise2 - noise2[0], atol=1e-3)
+
+def test_multipath_rms_per_file():
+    rng = np.random.default_rng(2)
+    noise1, noise2 = rng.normal(0, 0.3, EPOCHS), rng.normal(0, 0.5, EPOCHS)
+    summary = file_qc(make_obs(noise1, noise2))
+    assert summary['slips'] == 0
+    assert summary['observations'] == EPOCHS
+    assert summary['mp1'] == pytest.approx(np.std(noise1), abs=1e-3)
+    assert summary['mp2'] == pytest.approx(np.std(noise2), abs=1e-3)
+    assert summary['s1'] == pytest.approx(45.0)
+    assert summary['s2'] == pytest.approx(38.0)
+
+def test_clean_data_has_no_slips():
+    obs = make_obs()
+    slips, arc_start, valid = find_slips(obs, *multipath(obs))
+    assert not slips.any()
+    assert np.flatnonzero(arc_start[:, 0]).tolist() == [0]
+    assert valid.all()
+
+def test_one_cycle_l1_slip_is_found_and_starts_an_arc():
+    rng = np.random.default_rng(3)
+    noise1 = rng.normal(0, 0.3, EPOCHS)
+    obs = make_obs(noise1, l1_jump=100)
+    slips, arc_start, _ = find_slips(obs, *multipath(obs))
+    assert np.flatnonzero(slips[:, 0]).tolist() == [100]
+    assert np.flatnonzero(arc_start[:, 0]).tolist() == [0, 100]
+    # Arc means are removed separately, so the ambiguity change does not leak into MP1
+    expected = np.sqrt((np.concatenate([noise1[:100] - noise1[:100].mean(),
+                                        noise1[100:] - noise1[100:].mean()]) ** 2).mean())
+    assert file_qc(obs)['mp1'] == pytest.approx(expected, abs=1e-3)
+
+def test_loss_of_lock_flag_is_a_slip():
+    obs = make_obs(lli_epoch=150)
+    slips, _, _ = find_slips(obs, *multipath(obs))
+    assert np.flatnonzero(slips[:, 0]).tolist() == [150]
+
+def test_long_gap_starts_an_arc_without_a_slip():
+    obs = make_obs(gap=120)
+    slips, arc_start, _ = find_slips(obs, *multipath(obs))
+    assert not slips.any()
+    assert np.flatnonzero(arc_start[:, 0]).tolist() == [0, 120]
+
+def test_short_arcs_are_left_out_of_the_rms():
+    rng = np.random.default_rng(4)
+    noise1 = rng.normal(0, 0.3, EPOCHS)
+    summary = file_qc(make_obs(noise1, l1_jump=EPOCHS - MIN_ARC + 1))
+    expected = np.std(noise1[:EPOCHS - MIN_ARC + 1])
+    assert summary['mp1'] == pytest.approx(expected, abs=1e-3)
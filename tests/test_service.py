@@ -0,0 +1,39 @@
+import json
+import os
+import threading
+import urllib.request
+
+import pytest
+
+from rinex_tools.service import RegistryIndex, make_server
+
+DATA = os.path.join(os.path.dirname(__file__), 'data')
+
+def get(port, path):
+    with urllib.request.urlopen(f'http://127.0.0.1:{port}{path}', timeout=5) as response:
+        return json.loads(response.read())
+
+def test_server_answers_queries():
+    index = RegistryIndex()
+    assert index.refresh(DATA) == (1, 0)
+    server = make_server(index, DATA, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        port = server.server_address[1]
+        assert get(port, '/stations') == {'stations': ['SPPT']}
+        assert get(port, '/stations?start=2005-03-12') == {'stations': []}
+        files = get(port, '/station/sppt')['files']
+        assert [f['file'] for f in files] == ['SPPT0700.05O']
+        at = get(port, '/station/SPPT/at?time=2005-03-11T02:00')
+        assert at['observing'] and at['file'] == 'SPPT0700.05O'
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_socket_path_that_is_not_a_socket_is_kept(tmp_path):
+    path = tmp_path / 'service.sock'
+    path.write_text('data')
+    with pytest.raises(FileExistsError):
+        make_server(RegistryIndex(), socket_path=str(path))
+    assert path.read_text() == 'data'
@@ -0,0 +1,54 @@
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from rinex_tools.cli import main
+from rinex_tools.decimate import decimate_file
+from rinex_tools.spp import read_navigation, spp_position
+
+DATA = os.path.join(os.path.dirname(__file__), 'data')
+OBS = os.path.join(DATA, 'SPPT0700.05O')
+NAV = os.path.join(DATA, 'SPPT0700.05N')
+# Position the data of make_spp_day.py were generated for
+TRUE_XYZ = np.array([933553.2352, 4537134.4414, 4370797.2936])
+
+def test_read_navigation():
+    eph = read_navigation(NAV)
+    assert len(eph) == 31 * 3
+    assert eph.ion is not None
+    assert sorted(set(eph.prn.tolist())) == list(range(1, 32))
+
+def test_iono_free_position():
+    xyz, epochs, _ = spp_position(OBS)
+    assert epochs > 100
+    assert np.linalg.norm(xyz - TRUE_XYZ) < 1.0
+
+def test_single_frequency_position_with_klobuchar(tmp_path):
+    c1_only = str(tmp_path / 'SPPT0700.05O')
+    decimate_file(OBS, c1_only, types=['C1'])
+    xyz, _, _ = spp_position(c1_only, NAV)
+    assert np.linalg.norm(xyz - TRUE_XYZ) < 1.0
+
+def test_no_navigation_data(tmp_path):
+    shutil.copy(OBS, tmp_path)
+    assert spp_position(str(tmp_path / 'SPPT0700.05O')) is None
+
+@pytest.mark.parametrize('registry', [False, True])
+def test_crd_spp_fills_missing_position(tmp_path, registry):
+    input_dir = tmp_path / 'input'
+    os.makedirs(input_dir / 'sub')
+    shutil.copy(OBS, input_dir / 'sub')
+    shutil.copy(NAV, input_dir / 'sub')
+    args = ['crd', '-i', str(input_dir), '-o', str(tmp_path), '-n', 'S', '--spp',
+            '--obs-cache', str(tmp_path / 'cache')]
+    if registry:
+        registry_path = str(tmp_path / 'registry.json')
+        assert main(['shard', '-i', str(input_dir), '--count', '1', '--index', '0', '-o', registry_path]) == 0
+        args += ['--registry', registry_path]
+    assert main(args) == 0
+    with open(tmp_path / 'S.CRD', encoding='utf-8') as f:
+        line = next(line for line in f if 'SPPT' in line)
+    xyz = np.array([float(v) for v in line[22:67].split()])
+    assert np.linalg.norm(xyz - TRUE_XYZ) < 1.0